@@ -28,6 +28,24 @@ class Settings:
     AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
     AZURE_OPENAI_TEMPERATURE = float(os.getenv("AZURE_OPENAI_TEMPERATURE", "0.7"))
     AZURE_OPENAI_MAX_TOKENS = int(os.getenv("AZURE_OPENAI_MAX_TOKENS", "3000"))
+    # Offline OpenAI-compatible stub (scripts/llm_stub_server.py) for load testing;
+    # when set, the risk pipeline sends LLM calls there instead of Azure OpenAI
+    AZURE_OPENAI_STUB_URL = os.getenv("AZURE_OPENAI_STUB_URL")
+    # json_object, json_schema (strict structured output; needs a deployment and
+    # API version that support it, otherwise calls fail with 400), or text
+    AZURE_OPENAI_RESPONSE_FORMAT = os.getenv("AZURE_OPENAI_RESPONSE_FORMAT", "json_object")
+    
+    # LLM Call Resilience
+    LLM_CALL_DEADLINE_SECONDS = float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "30"))
+    # Streamed completions: deadline for the whole response, not just the first chunk
+    LLM_STREAM_DEADLINE_SECONDS = float(os.getenv("LLM_STREAM_DEADLINE_SECONDS", "120"))
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1.0"))
+    LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
     
     # Azure AI Search Configuration
     AZURE_SEARCH_ENDPOINT = os.getenv("AZURE_SEARCH_ENDPOINT")
@@ -39,6 +57,153 @@ class Settings:
     AZURE_SEARCH_METADATA_NAME_FIELD = os.getenv("AZURE_SEARCH_METADATA_NAME_FIELD", "metadata_storage_name")
     AZURE_SEARCH_METADATA_PATH_FIELD = os.getenv("AZURE_SEARCH_METADATA_PATH_FIELD", "metadata_storage_path")
 
+    # Risk Analysis Pipeline
+    RISK_SEARCH_TIMEOUT_SECONDS = float(os.getenv("RISK_SEARCH_TIMEOUT_SECONDS", "8"))
+    RISK_PUBLIC_SOURCE_TIMEOUT_SECONDS = float(os.getenv("RISK_PUBLIC_SOURCE_TIMEOUT_SECONDS", "5"))
+    RISK_ATTORNEY_TIMEOUT_SECONDS = float(os.getenv("RISK_ATTORNEY_TIMEOUT_SECONDS", "5"))
+    
+    # Practice area -> public source risk areas
+    PRACTICE_AREA_RISK_AREAS = {
+        "Corporate M&A": ["Corporate Governance", "Securities Law"],
+        "Data Privacy": ["Data Protection"],
+        "Intellectual Property": ["Intellectual Property"],
+        "Tax": ["Tax"],
+        "Employment": ["Employment"],
+        "Compliance": ["Data Protection", "Corporate Governance", "Securities Law"],
+        "Securities Law": ["Securities Law"],
+        "Banking": ["Banking"],
+        "Real Estate": ["Real Estate"]
+    }
+    
+    # Alternative practice area names -> canonical name, used when building
+    # practice_area_keys (matching ignores case and punctuation)
+    PRACTICE_AREA_SYNONYMS = {
+        "M&A": "Corporate M&A",
+        "Mergers and Acquisitions": "Corporate M&A",
+        "Privacy": "Data Privacy",
+        "Data Protection": "Data Privacy",
+        "IP": "Intellectual Property",
+        "Taxation": "Tax",
+        "Employment Law": "Employment",
+        "Labor and Employment": "Employment",
+        "Regulatory Compliance": "Compliance",
+        "Securities": "Securities Law",
+        "Banking and Finance": "Banking"
+    }
+    
+    # Precomputed Practice Area Context
+    RISK_CONTEXT_STORE_ENABLED = os.getenv("RISK_CONTEXT_STORE_ENABLED", "true").lower() == "true"
+    RISK_CONTEXT_REFRESH_SECONDS = float(os.getenv("RISK_CONTEXT_REFRESH_SECONDS", "900"))
+    RISK_CONTEXT_MAX_AGE_SECONDS = float(os.getenv("RISK_CONTEXT_MAX_AGE_SECONDS", "3600"))
+    RISK_CONTEXT_CHANGE_POLL_SECONDS = float(os.getenv("RISK_CONTEXT_CHANGE_POLL_SECONDS", "10"))
+    RISK_CONTEXT_REFRESH_CONCURRENCY = int(os.getenv("RISK_CONTEXT_REFRESH_CONCURRENCY", "4"))
+    RISK_CONTEXT_SHARED_MAX_ENTRIES = int(os.getenv("RISK_CONTEXT_SHARED_MAX_ENTRIES", "256"))
+    # Practice areas outside PRACTICE_AREA_RISK_AREAS seen on the request path
+    # (kept until they expire, not refreshed in the background)
+    RISK_CONTEXT_DISCOVERED_MAX_ENTRIES = int(os.getenv("RISK_CONTEXT_DISCOVERED_MAX_ENTRIES", "128"))
+
+    # In-memory Attorney Roster Index
+    ATTORNEY_ROSTER_ENABLED = os.getenv("ATTORNEY_ROSTER_ENABLED", "true").lower() == "true"
+    ATTORNEY_ROSTER_REFRESH_SECONDS = float(os.getenv("ATTORNEY_ROSTER_REFRESH_SECONDS", "600"))
+    ATTORNEY_ROSTER_CHANGE_POLL_SECONDS = float(os.getenv("ATTORNEY_ROSTER_CHANGE_POLL_SECONDS", "5"))
+    # Lower bounds (years) of the experience bands: 0-4, 5-9, 10-19, 20+
+    ATTORNEY_EXPERIENCE_BANDS = [
+        int(years) for years in os.getenv("ATTORNEY_EXPERIENCE_BANDS", "0,5,10,20").split(",")
+    ]
+
+    # Duplicate-email check: the container's unique key on /email only
+    # rejects duplicates within one seniority partition. With a shared
+    # CACHE_BACKEND a Bloom filter of known emails skips the lookup query for
+    # new emails; otherwise every create checks with a query
+    ATTORNEY_EMAIL_BLOOM_CAPACITY = int(os.getenv("ATTORNEY_EMAIL_BLOOM_CAPACITY", "100000"))
+    ATTORNEY_EMAIL_BLOOM_ERROR_RATE = float(os.getenv("ATTORNEY_EMAIL_BLOOM_ERROR_RATE", "0.01"))
+    # Overlap when merging emails written by other workers (by _ts)
+    ATTORNEY_EMAIL_SYNC_SKEW_SECONDS = float(os.getenv("ATTORNEY_EMAIL_SYNC_SKEW_SECONDS", "60"))
+
+    # GET /api/v1/attorneys pagination
+    ATTORNEYS_DEFAULT_PAGE_SIZE = int(os.getenv("ATTORNEYS_DEFAULT_PAGE_SIZE", "100"))
+    ATTORNEYS_MAX_PAGE_SIZE = int(os.getenv("ATTORNEYS_MAX_PAGE_SIZE", "1000"))
+
+    # Bulk Ingestion (concurrent writes grouped by partition key)
+    BULK_INGEST_CONCURRENCY = int(os.getenv("BULK_INGEST_CONCURRENCY", "32"))
+    BULK_INGEST_PARTITION_CONCURRENCY = int(os.getenv("BULK_INGEST_PARTITION_CONCURRENCY", "16"))
+    BULK_INGEST_MAX_THROTTLE_RETRIES = int(os.getenv("BULK_INGEST_MAX_THROTTLE_RETRIES", "10"))
+    BULK_INGEST_DEFAULT_RETRY_AFTER_SECONDS = float(os.getenv("BULK_INGEST_DEFAULT_RETRY_AFTER_SECONDS", "1"))
+    # Emails per IN (...) query when checking a bulk import for existing emails
+    BULK_EMAIL_LOOKUP_CHUNK_SIZE = int(os.getenv("BULK_EMAIL_LOOKUP_CHUNK_SIZE", "1000"))
+
+    # Item id -> partition key map for point reads (SQLite file shared by the
+    # workers on a node; empty to keep it in memory only)
+    PARTITION_KEY_MAP_PATH = os.getenv("PARTITION_KEY_MAP_PATH", "partition_keys.db")
+    # Seconds between batched writes of new entries to that file
+    PARTITION_KEY_MAP_FLUSH_SECONDS = float(os.getenv("PARTITION_KEY_MAP_FLUSH_SECONDS", "1"))
+
+    # Historical Engagement Index (scripts/build_engagement_index.py)
+    ENGAGEMENT_MAX_LINKED_DOCUMENTS = int(os.getenv("ENGAGEMENT_MAX_LINKED_DOCUMENTS", "50"))
+    ENGAGEMENT_MAX_RECENT_MATTERS = int(os.getenv("ENGAGEMENT_MAX_RECENT_MATTERS", "10"))
+    ENGAGEMENT_MAX_BLOB_BYTES = int(os.getenv("ENGAGEMENT_MAX_BLOB_BYTES", str(5 * 1024 * 1024)))
+    # Matching bonus: the repeat-engagement part is full at this many
+    # engagements in the practice area (at least 2), and the whole bonus is
+    # halved for every half-life since the attorney's last engagement
+    ENGAGEMENT_BONUS_FULL_COUNT = int(os.getenv("ENGAGEMENT_BONUS_FULL_COUNT", "5"))
+    ENGAGEMENT_RECENCY_HALF_LIFE_DAYS = float(os.getenv("ENGAGEMENT_RECENCY_HALF_LIFE_DAYS", "730"))
+
+    # Prompt Packing
+    RISK_PROMPT_CONTEXT_TOKEN_BUDGET = int(os.getenv("RISK_PROMPT_CONTEXT_TOKEN_BUDGET", "3000"))
+    RISK_PROMPT_CHUNK_MAX_TOKENS = int(os.getenv("RISK_PROMPT_CHUNK_MAX_TOKENS", "200"))
+    RISK_PROMPT_CHUNK_POSITION_DECAY = float(os.getenv("RISK_PROMPT_CHUNK_POSITION_DECAY", "0.15"))
+    RISK_PROMPT_TOKEN_ENCODING = os.getenv("RISK_PROMPT_TOKEN_ENCODING", "o200k_base")
+    
+    # Cache Backend shared by the services: memory (per process), sqlite
+    # (one file shared by the workers on a node) or redis (needs the redis package)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "cache.db")
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_REDIS_TIMEOUT_SECONDS = float(os.getenv("CACHE_REDIS_TIMEOUT_SECONDS", "0.5"))
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "attorneymatching")
+    # SQLite: pending read times are written at most this often (evictions use them)
+    CACHE_SQLITE_TOUCH_FLUSH_SECONDS = float(os.getenv("CACHE_SQLITE_TOUCH_FLUSH_SECONDS", "5"))
+    # Shared data versions are re-read at most this often per process; a
+    # write by another worker can take this long to invalidate local stamps
+    DATA_VERSION_CACHE_SECONDS = float(os.getenv("DATA_VERSION_CACHE_SECONDS", "1"))
+    
+    # Risk Analysis Result Cache
+    RISK_CACHE_ENABLED = os.getenv("RISK_CACHE_ENABLED", "true").lower() == "true"
+    RISK_CACHE_TTL_SECONDS = float(os.getenv("RISK_CACHE_TTL_SECONDS", "3600"))
+    RISK_CACHE_MAX_ENTRIES = int(os.getenv("RISK_CACHE_MAX_ENTRIES", "1000"))
+
+    # Logging
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_STRUCTURED_ENABLED = os.getenv("LOG_STRUCTURED_ENABLED", "true").lower() == "true"
+    LOG_FILE = os.getenv("LOG_FILE")  # JSON log sink; stderr when unset
+    LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+    LOG_DEBUG_HEADER = os.getenv("LOG_DEBUG_HEADER", "X-Debug-Log")
+    
+    # Semantic LLM Response Cache
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "21600"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+    LLM_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("LLM_CACHE_SIMILARITY_THRESHOLD", "0.9"))
+    LLM_CACHE_SHINGLE_SIZE = int(os.getenv("LLM_CACHE_SHINGLE_SIZE", "5"))
+    LLM_CACHE_NUM_HASHES = int(os.getenv("LLM_CACHE_NUM_HASHES", "128"))
+    
+    # Batch Risk Analysis
+    RISK_BATCH_MAX_SIZE = int(os.getenv("RISK_BATCH_MAX_SIZE", "100"))
+    RISK_BATCH_LLM_CONCURRENCY = int(os.getenv("RISK_BATCH_LLM_CONCURRENCY", "5"))
+    
+    # Asynchronous Risk Analysis Jobs
+    RISK_JOB_STORE = os.getenv("RISK_JOB_STORE", "sqlite")  # sqlite or memory
+    RISK_JOB_DB_PATH = os.getenv("RISK_JOB_DB_PATH", "risk_jobs.db")
+    RISK_JOB_TTL_SECONDS = float(os.getenv("RISK_JOB_TTL_SECONDS", "86400"))
+    RISK_JOB_WORKERS = int(os.getenv("RISK_JOB_WORKERS", "4"))
+    RISK_JOB_QUEUE_MAX_SIZE = int(os.getenv("RISK_JOB_QUEUE_MAX_SIZE", "1000"))
+    RISK_JOB_PURGE_INTERVAL_SECONDS = float(os.getenv("RISK_JOB_PURGE_INTERVAL_SECONDS", "600"))
+    # How long a worker's claim on a job lasts without renewal; after that
+    # another worker may recover the job on start
+    RISK_JOB_LEASE_SECONDS = float(os.getenv("RISK_JOB_LEASE_SECONDS", "60"))
+    # Minimum interval between writes of partial stage results
+    RISK_JOB_STAGE_FLUSH_SECONDS = float(os.getenv("RISK_JOB_STAGE_FLUSH_SECONDS", "0.5"))
+
     # Validation Constants
     SENIORITY_LEVELS = ["Associate", "Senior Associate", "Partner", "Senior Partner"]
     PROFICIENCY_LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
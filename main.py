@@ -3,13 +3,14 @@ Legal Data Management API
 FastAPI application with Azure Cosmos DB backend
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, BackgroundTasks, Header, Response, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional
 from pathlib import Path
 import shutil
 from datetime import datetime
 import uuid 
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,14 @@ logging.basicConfig(
 
 # Import models
 from models import AttorneyCreate, PublicSourceCreate
-from risk_analysis_model import RiskAnalysisRequest, RiskAnalysisResponse
+from risk_analysis_model import (
+    RiskAnalysisRequest,
+    RiskAnalysisResponse,
+    BatchRiskAnalysisRequest,
+    BatchRiskAnalysisResponse,
+    RiskAnalysisJob,
+    RiskAnalysisJobSubmitted
+)
 from services.blob_storage_service import internal_container, attorney_history_container, generate_sas_url
 from models.blob_storage import UploadResponse, ListResponse, FileItem
 
@@ -33,9 +41,13 @@ from services import (
     EnrichmentService
 )
 from services.risk_analysis_service import RiskAnalysisService
+from services.risk_job_service import RiskJobService, JobQueueFullError
+from services.metrics_service import metrics
+from services.partition_key_map import close_partition_key_maps
 
 # Import utils
 from utils import ExcelValidator
+from utils.structured_logging import configure_structured_logging, begin_request_logging
 
 # Import config
 from config import settings
@@ -51,18 +63,63 @@ app = FastAPI(
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Risk pipeline loggers write JSON through a background queue listener
+log_listener = configure_structured_logging()
+
 # Initialize services
 attorney_service = AttorneyService()
 public_source_service = PublicSourceService()
 enrichment_service = EnrichmentService()
 risk_analysis_service = RiskAnalysisService()
+risk_job_service = RiskJobService(risk_analysis_service)
+
+
+@app.middleware("http")
+async def request_logging_context(request: Request, call_next):
+    """Tag log records with a request id and decide whether to log full payloads"""
+    request_id = begin_request_logging(debug=settings.LOG_DEBUG_HEADER in request.headers)
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.on_event("startup")
+async def start_background_refresh():
+    """Warm and periodically refresh the precomputed practice area context and attorney roster"""
+    risk_analysis_service.context_store.start()
+    risk_analysis_service.attorney_roster.start()
+    risk_job_service.start()
+
+
+@app.on_event("shutdown")
+async def close_async_clients():
+    """Close the async Azure clients and flush the partition key maps"""
+    await risk_job_service.stop()
+    await risk_analysis_service.context_store.stop()
+    await risk_analysis_service.attorney_roster.stop()
+    await risk_analysis_service.close_async()
+    close_partition_key_maps()
+    if log_listener is not None:
+        log_listener.stop()
 
 #===========================================
 # RISK ANALYSIS ENDPOINT (NEW)
 #===========================================
 
+def _allows_cached_results(cache_control: Optional[str]) -> bool:
+    """A request sent with Cache-Control: no-cache bypasses cached analyses"""
+    if not cache_control:
+        return True
+    directives = {d.strip().lower() for d in cache_control.split(",")}
+    return not directives & {"no-cache", "no-store"}
+
+
 @app.post("/api/v1/risk-analysis", response_model=RiskAnalysisResponse)
-async def analyze_company_risk(request: RiskAnalysisRequest):
+async def analyze_company_risk(
+    request: RiskAnalysisRequest,
+    response: Response,
+    cache_control: Optional[str] = Header(None)
+):
     """
     Analyze company legal risks using RAG-based approach
     
@@ -74,6 +131,11 @@ async def analyze_company_risk(request: RiskAnalysisRequest):
     5. Generates a professional email template
     6. Returns comprehensive risk analysis with references
     
+    Send "Cache-Control: no-cache" to force a fresh analysis instead of
+    reusing a cached result or cached LLM output.
+    
+    Per-stage durations are returned in the Server-Timing header.
+    
     Example Request:
     {
         "companyName": "Acme Manufacturing",
@@ -82,8 +144,14 @@ async def analyze_company_risk(request: RiskAnalysisRequest):
         "practicearea": "Compliance"
     }
     """
+    timings = metrics.start_request()
     try:
-        result = risk_analysis_service.analyze_company_risks(request)
+        with metrics.time_stage("total"):
+            result = await risk_analysis_service.analyze_company_risks_async(
+                request,
+                use_cache=_allows_cached_results(cache_control)
+            )
+        response.headers["Server-Timing"] = metrics.server_timing(timings)
         return result
     except Exception as e:
         logging.error(f"Risk analysis error: {str(e)}", exc_info=True)
@@ -93,6 +161,139 @@ async def analyze_company_risk(request: RiskAnalysisRequest):
         )
 
 
+@app.post("/api/v1/risk-analysis/batch", response_model=BatchRiskAnalysisResponse)
+async def analyze_company_risk_batch(
+    batch: BatchRiskAnalysisRequest,
+    response: Response,
+    cache_control: Optional[str] = Header(None)
+):
+    """
+    Analyze several companies in one call
+    
+    Requests sharing a practice area share one retrieval pass (AI Search,
+    public sources, attorney matching); LLM calls run with bounded
+    concurrency. Each result carries its own status and error.
+    """
+    timings = metrics.start_request()
+    try:
+        with metrics.time_stage("batch_total"):
+            result = await risk_analysis_service.analyze_batch_async(
+                batch.requests,
+                use_cache=_allows_cached_results(cache_control)
+            )
+        response.headers["Server-Timing"] = metrics.server_timing(timings)
+        return result
+    except Exception as e:
+        logging.error(f"Batch risk analysis error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error performing batch risk analysis: {str(e)}"
+        )
+
+
+@app.post("/api/v1/risk-analysis/stream")
+async def stream_company_risk(
+    request: RiskAnalysisRequest,
+    cache_control: Optional[str] = Header(None)
+):
+    """
+    Streaming variant of /api/v1/risk-analysis using Server-Sent Events
+    
+    Events are sent in this order:
+    - attorneys: recommended attorneys
+    - references: reference links from public sources
+    - risk: one event per risk, as the LLM produces it
+    - email_template: the generated email
+    - complete: the full RiskAnalysisResponse
+    
+    An "error" event is sent if the analysis fails part way through.
+    """
+    use_cache = _allows_cached_results(cache_control)
+    
+    async def event_stream():
+        try:
+            async for event, data in risk_analysis_service.stream_company_risks(request, use_cache=use_cache):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            logging.error(f"Risk analysis stream error: {str(e)}", exc_info=True)
+            error = {"detail": f"Error performing risk analysis: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/v1/risk-analysis/jobs", response_model=RiskAnalysisJobSubmitted, status_code=202)
+async def submit_risk_analysis_job(
+    request: RiskAnalysisRequest,
+    cache_control: Optional[str] = Header(None)
+):
+    """
+    Queue a risk analysis and return its job id immediately
+    
+    Poll GET /api/v1/risk-analysis/jobs/{job_id} for the status, partial
+    stage results and the final RiskAnalysisResponse. Returns 503 when the
+    job queue is full.
+    """
+    try:
+        job = await risk_job_service.submit(request, use_cache=_allows_cached_results(cache_control))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return RiskAnalysisJobSubmitted(
+        job_id=job['job_id'],
+        status=job['status'],
+        status_url=f"/api/v1/risk-analysis/jobs/{job['job_id']}"
+    )
+
+
+@app.get("/api/v1/risk-analysis/jobs/{job_id}", response_model=RiskAnalysisJob)
+async def get_risk_analysis_job(job_id: str):
+    """
+    Status of a risk analysis job
+    
+    While the job runs, stages holds the results produced so far
+    (attorneys, references, risks, email_template). result is set once
+    the job has completed; error is set if it failed. Jobs expire
+    RISK_JOB_TTL_SECONDS after their last update.
+    """
+    job = risk_job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.get("/api/v1/risk-analysis/cache/stats")
+async def get_risk_analysis_cache_stats():
+    """Hit/miss counters and size of the risk analysis caches"""
+    return {
+        **risk_analysis_service.result_cache.stats(),
+        "llm_cache": risk_analysis_service.llm_cache.stats(),
+        "context_store": risk_analysis_service.context_store.stats(),
+        "attorney_roster": risk_analysis_service.attorney_roster.stats()
+    }
+
+
+@app.get("/api/v1/metrics")
+async def get_metrics():
+    """
+    Pipeline counters (LLM calls, parse failures, repairs, fallbacks),
+    per-stage latency histograms in milliseconds with p50/p95/p99 estimates,
+    and the LLM circuit breaker state
+    """
+    return {
+        **metrics.snapshot(),
+        "llm_circuit": risk_analysis_service.llm_resilience.stats(),
+        "risk_jobs": risk_job_service.stats(),
+        "partition_key_maps": {
+            "attorneys": attorney_service.partition_keys.stats(),
+            "public_sources": public_source_service.partition_keys.stats()
+        }
+    }
+
+
 #===========================================
 #BLOB STORAGE ENDPOINTS
 #===========================================    
@@ -252,12 +453,14 @@ async def upload_attorneys_excel(file: UploadFile = File(...)):
             )
         
         # Bulk create attorneys
-        created_ids = attorney_service.bulk_create_attorneys(attorneys)
-        
+        result = await attorney_service.bulk_create_attorneys(attorneys)
+
         return {
-            "message": f"Successfully created {len(created_ids)} attorneys",
-            "created_ids": created_ids,
-            "skipped": len(attorneys) - len(created_ids)
+            "message": f"Successfully created {result.created} attorneys",
+            "created_ids": result.created_ids,
+            "duplicates": result.duplicates,
+            "failed": result.failed,
+            "rows": [row.model_dump() for row in result.rows if row.status != "created"]
         }
         
     except Exception as e:
@@ -271,27 +474,41 @@ async def upload_attorneys_excel(file: UploadFile = File(...)):
 async def get_attorneys(
     practice_area: Optional[str] = Query(None),
     seniority: Optional[str] = Query(None),
-    min_experience: Optional[int] = Query(None)
+    min_experience: Optional[int] = Query(None),
+    page_size: int = Query(settings.ATTORNEYS_DEFAULT_PAGE_SIZE, ge=1, le=settings.ATTORNEYS_MAX_PAGE_SIZE),
+    continuation: Optional[str] = Query(None)
 ):
-    """Get all attorneys with optional filters"""
+    """
+    Get attorneys with optional filters, one page at a time.
+    Pass the returned continuation to fetch the next page; it is null
+    after the last page.
+    """
     try:
-        attorneys = attorney_service.get_attorneys(
+        page = attorney_service.get_attorneys_page(
             practice_area=practice_area,
             seniority=seniority,
-            min_experience=min_experience
+            min_experience=min_experience,
+            page_size=page_size,
+            continuation=continuation
         )
-        return {"count": len(attorneys), "attorneys": attorneys}
+        return {
+            "count": len(page['attorneys']),
+            "attorneys": page['attorneys'],
+            "continuation": page['continuation']
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching attorneys: {str(e)}")
 
 
-'''@app.get("/api/v1/attorneys/{attorney_id}")
+@app.get("/api/v1/attorneys/{attorney_id}")
 async def get_attorney(attorney_id: str):
     """Get a specific attorney by ID"""
     attorney = attorney_service.get_attorney_by_id(attorney_id)
     if not attorney:
         raise HTTPException(status_code=404, detail="Attorney not found")
-    return attorney'''
+    return attorney
 
 
 @app.delete("/api/v1/attorneys/{attorney_id}")
@@ -386,13 +603,13 @@ async def get_public_sources(
         raise HTTPException(status_code=500, detail=f"Error fetching public sources: {str(e)}")
 
 
-'''@app.get("/api/v1/public-sources/{news_id}")
+@app.get("/api/v1/public-sources/{news_id}")
 async def get_public_source(news_id: str):
     """Get a specific public source by ID"""
     source = public_source_service.get_public_source_by_id(news_id)
     if not source:
         raise HTTPException(status_code=404, detail="Public source not found")
-    return source'''
+    return source
 
 
 '''@app.patch("/api/v1/public-sources/{news_id}/enrich")
@@ -2,7 +2,9 @@ from models.attorney import (
     PracticeAreaInput,
     PracticeAreaStored,
     AttorneyCreate,
-    AttorneyStored
+    AttorneyStored,
+    BulkAttorneyRowResult,
+    BulkAttorneyIngestionResult
 )
 from models.public_source import (
     PublicSourceCreate,
@@ -15,6 +17,8 @@ __all__ = [
     'PracticeAreaStored',
     'AttorneyCreate',
     'AttorneyStored',
+    'BulkAttorneyRowResult',
+    'BulkAttorneyIngestionResult',
     'PublicSourceCreate',
     'ReferenceData',
     'PublicSourceStored'
@@ -68,3 +68,25 @@ class AttorneyStored(BaseModel):
     created_at: datetime
     updated_at: datetime
     created_by: Optional[str] = None
+
+class BulkAttorneyRowResult(BaseModel):
+    row: int  # 1-based position in the input
+    name: Optional[str] = None
+    email: Optional[str] = None
+    status: str  # created, duplicate or failed
+    attorney_id: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+class BulkAttorneyIngestionResult(BaseModel):
+    total: int
+    created: int
+    duplicates: int
+    failed: int
+    throttle_retries: int = 0
+    duration_ms: float
+    rows: List[BulkAttorneyRowResult] = Field(default_factory=list)
+    
+    @property
+    def created_ids(self) -> List[str]:
+        return [row.attorney_id for row in self.rows if row.status == "created"]
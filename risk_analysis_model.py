@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from config import settings
 
 class RiskAnalysisRequest(BaseModel):
     companyName: str = Field(..., max_length=200)
@@ -26,4 +27,58 @@ class RiskAnalysisResponse(BaseModel):
     references: List[ReferenceItem]
     recommended_attorneys: List[RecommendedAttorney]  # Changed from recommended_attorney (singular) to list
     email_template: str
-    confidence_score: float = Field(..., ge=1.0, le=100.0)
\ No newline at end of file
+    confidence_score: float = Field(..., ge=1.0, le=100.0)
+
+class LLMRiskAssessment(BaseModel):
+    """Shape of the JSON object the LLM is asked to return"""
+    risks: List[str] = Field(..., min_length=1)
+    confidence_score: float = Field(85, ge=1.0, le=100.0)
+    reasoning: str = ""
+
+# JSON schema sent with response_format=json_schema (strict mode needs every
+# property listed as required and no additional properties)
+LLM_RISK_ASSESSMENT_SCHEMA = {
+    "name": "risk_assessment",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "risks": {"type": "array", "items": {"type": "string"}},
+            "confidence_score": {"type": "number"},
+            "reasoning": {"type": "string"}
+        },
+        "required": ["risks", "confidence_score", "reasoning"],
+        "additionalProperties": False
+    }
+}
+
+class BatchRiskAnalysisRequest(BaseModel):
+    requests: List[RiskAnalysisRequest] = Field(..., min_length=1, max_length=settings.RISK_BATCH_MAX_SIZE)
+
+class BatchRiskAnalysisItem(BaseModel):
+    index: int
+    company: str
+    practice_area: str
+    status: str  # completed, failed
+    result: Optional[RiskAnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchRiskAnalysisResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchRiskAnalysisItem]
+
+class RiskAnalysisJobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+class RiskAnalysisJob(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed
+    created_at: str
+    updated_at: str
+    stages: Dict[str, Any] = {}
+    result: Optional[RiskAnalysisResponse] = None
+    error: Optional[str] = None
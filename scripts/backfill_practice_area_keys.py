@@ -0,0 +1,30 @@
+"""
+Backfill practice_area_keys on existing attorney documents
+
+Attorney practice-area filters match on the normalized practice_area_keys
+array. Documents created before it existed, or before a change to
+PRACTICE_AREA_SYNONYMS, need their keys rebuilt; run this once after
+deploying and after editing the synonyms.
+
+Usage:
+    python -m scripts.backfill_practice_area_keys
+    python -m scripts.backfill_practice_area_keys --dry-run
+"""
+
+import argparse
+import json
+
+from services.attorney_service import AttorneyService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild practice_area_keys on attorney documents")
+    parser.add_argument("--dry-run", action="store_true", help="Only count documents that need updating")
+    args = parser.parse_args()
+
+    result = AttorneyService().backfill_practice_area_keys(dry_run=args.dry_run)
+    print(json.dumps({**result, "dry_run": args.dry_run}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark for attorney match scoring
+
+Compares the per-attorney Python scoring loop that _find_matching_attorneys
+used to run (with its flat historical bonus replaced by engagement_bonus)
+against the vectorized AttorneyScoringMatrix, on synthetic rosters. Both
+are checked to return the same top matches. Needs no Azure services.
+
+Usage:
+    python -m scripts.benchmark_attorney_scoring --sizes 10000 100000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Set
+
+from config import settings
+from services.attorney_scoring import AttorneyScoringMatrix, engagement_bonus
+
+PRACTICE_AREAS = [
+    "Corporate M&A", "Litigation", "Intellectual Property", "Employment Law", "Tax",
+    "Real Estate", "Compliance", "Banking & Finance", "Antitrust", "Environmental",
+    "Privacy & Data Protection", "Securities", "Bankruptcy", "Healthcare", "Energy"
+]
+PROFICIENCY_LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+
+def make_roster(size: int, seed: int) -> List[Dict[str, Any]]:
+    """Synthetic attorneys with one to three practice areas each"""
+    picker = random.Random(seed)
+    return [
+        {
+            "attorney_id": f"ATT-{idx:08X}",
+            "name": f"Attorney {idx}",
+            "email": f"attorney{idx}@example.com",
+            "seniority": picker.choice(settings.SENIORITY_LEVELS),
+            "years_of_experience": picker.randint(0, 40),
+            "practice_areas": [
+                {"area": area, "proficiency": picker.choice(PROFICIENCY_LEVELS)}
+                for area in picker.sample(PRACTICE_AREAS, k=picker.randint(1, 3))
+            ]
+        }
+        for idx in range(size)
+    ]
+
+
+def loop_top_k(attorneys: List[Dict[str, Any]], practice_area: str, historical_ids: Set[str], k: int):
+    """The scoring loop previously inlined in _find_matching_attorneys"""
+    attorney_scores = []
+    for attorney in attorneys:
+        score = 0
+        for pa in attorney.get('practice_areas', []):
+            if pa['area'] == practice_area:
+                score += 40
+                proficiency_bonus = {'Expert': 20, 'Advanced': 15, 'Intermediate': 10, 'Beginner': 5}
+                score += proficiency_bonus.get(pa['proficiency'], 0)
+        seniority_bonus = {'Senior Partner': 20, 'Partner': 15, 'Senior Associate': 10, 'Associate': 5}
+        score += seniority_bonus.get(attorney['seniority'], 0)
+        score += min(attorney['years_of_experience'], 20)
+        score += engagement_bonus(1 if attorney['attorney_id'] in historical_ids else 0)
+        attorney_scores.append({'attorney': attorney, 'score': score})
+    attorney_scores.sort(key=lambda x: x['score'], reverse=True)
+    return [(item['attorney'], item['score']) for item in attorney_scores[:k]]
+
+
+def time_ms(fn, repeats: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run_size(size: int, args) -> Dict[str, Any]:
+    attorneys = make_roster(size, args.seed)
+    picker = random.Random(args.seed + 1)
+    historical_ids = {attorney['attorney_id'] for attorney in picker.sample(attorneys, k=min(5, size))}
+    practice_area = PRACTICE_AREAS[0]
+
+    started = time.perf_counter()
+    matrix = AttorneyScoringMatrix(attorneys)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    expected = [(a['attorney_id'], s) for a, s in loop_top_k(attorneys, practice_area, historical_ids, args.top)]
+    actual = [(a['attorney_id'], s) for a, s in matrix.top_k(practice_area, historical_ids, args.top)]
+
+    loop_ms = time_ms(lambda: loop_top_k(attorneys, practice_area, historical_ids, args.top), args.repeats)
+    vector_ms = time_ms(lambda: matrix.top_k(practice_area, historical_ids, args.top), args.repeats)
+    return {
+        "attorneys": size,
+        "top_k": args.top,
+        "matrix_build_ms": round(build_ms, 2),
+        "loop_ms": round(loop_ms, 3),
+        "vectorized_ms": round(vector_ms, 3),
+        "speedup": round(loop_ms / vector_ms, 1) if vector_ms else None,
+        "same_results": expected == actual
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attorney match scoring")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10000, 100000], help="Roster sizes")
+    parser.add_argument("--top", type=int, default=3, help="Attorneys to return")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per size (median reported)")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = [run_size(size, args) for size in args.sizes]
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{'attorneys':>10}{'loop ms':>12}{'vector ms':>12}{'speedup':>10}{'build ms':>12}  same")
+    for row in report:
+        print(f"{row['attorneys']:>10}{row['loop_ms']:>12}{row['vectorized_ms']:>12}"
+              f"{row['speedup']:>9}x{row['matrix_build_ms']:>12}  {row['same_results']}")
+
+
+if __name__ == "__main__":
+    main()
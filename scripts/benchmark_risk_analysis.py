@@ -0,0 +1,161 @@
+"""
+Throughput benchmark for /api/v1/risk-analysis
+
+Drives the endpoint at a fixed concurrency and reports latency percentiles,
+requests per second and the per-stage Server-Timing breakdown. Run the API
+against the LLM stub (scripts/llm_stub_server.py) to avoid Azure OpenAI
+costs and quotas.
+
+Usage:
+    python -m scripts.benchmark_risk_analysis --concurrency 16 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+DEFAULT_PRACTICE_AREAS = ["Compliance", "Corporate Law", "Employment Law", "Tax", "Intellectual Property"]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    if not samples:
+        return 0.0
+    rank = max(1, round(fraction * len(samples) + 0.5))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99, mean and max of latency samples in milliseconds"""
+    ordered = sorted(samples)
+    return {
+        "p50": round(percentile(ordered, 0.50), 1),
+        "p95": round(percentile(ordered, 0.95), 1),
+        "p99": round(percentile(ordered, 0.99), 1),
+        "mean": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+        "max": round(ordered[-1], 1) if ordered else 0.0
+    }
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Parse 'stage;dur=12.3, other;dur=4.5' into {stage: ms}"""
+    timings = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                timings[name] = float(value)
+    return timings
+
+
+async def run(args) -> Dict[str, Any]:
+    practice_areas = args.practice_areas or DEFAULT_PRACTICE_AREAS
+    headers = {} if args.allow_cache else {"Cache-Control": "no-cache"}
+    latencies: List[float] = []
+    stage_samples: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    next_index = 0
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+
+        async def send(index: int, record: bool):
+            body = {
+                "companyName": f"Benchmark Company {index}",
+                "companyemail": f"contact{index}@example.com",
+                "practicearea": practice_areas[index % len(practice_areas)]
+            }
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/v1/risk-analysis", json=body, headers=headers)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                response, status = None, type(e).__name__
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if not record:
+                return
+            statuses[status] += 1
+            if response is not None and response.status_code == 200:
+                latencies.append(elapsed_ms)
+                for stage, duration in parse_server_timing(response.headers.get("server-timing", "")).items():
+                    stage_samples[stage].append(duration)
+
+        async def worker(total: int, record: bool):
+            nonlocal next_index
+            while True:
+                index = next_index
+                if index >= total:
+                    return
+                next_index += 1
+                await send(index, record)
+
+        if args.warmup:
+            await asyncio.gather(*[worker(args.warmup, record=False) for _ in range(args.concurrency)])
+            next_index = 0
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(args.requests, record=True) for _ in range(args.concurrency)])
+        wall_seconds = time.perf_counter() - started
+
+    succeeded = len(latencies)
+    return {
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "succeeded": succeeded,
+        "failed": args.requests - succeeded,
+        "statuses": dict(statuses),
+        "wall_seconds": round(wall_seconds, 2),
+        "requests_per_second": round(succeeded / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": summarize(latencies),
+        "stages_ms": {stage: summarize(samples) for stage, samples in sorted(stage_samples.items())}
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\nRisk analysis benchmark: {report['url']}")
+    print(f"Concurrency: {report['concurrency']}  Requests: {report['requests']}  "
+          f"Succeeded: {report['succeeded']}  Failed: {report['failed']}")
+    print(f"Status codes: {report['statuses']}")
+    print(f"Wall time: {report['wall_seconds']}s  Throughput: {report['requests_per_second']} req/s")
+
+    latency = report['latency_ms']
+    print(f"\nLatency (ms): p50={latency['p50']} p95={latency['p95']} p99={latency['p99']} "
+          f"mean={latency['mean']} max={latency['max']}")
+
+    if report['stages_ms']:
+        print("\nServer-Timing stages (ms):")
+        print(f"  {'stage':<20}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for stage, stats in report['stages_ms'].items():
+            print(f"  {stage:<20}{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/v1/risk-analysis at fixed concurrency")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests sent first")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--practice-areas", nargs="*", help="Practice areas to rotate through")
+    parser.add_argument("--allow-cache", action="store_true",
+                        help="Let the API serve cached analyses (default sends Cache-Control: no-cache)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Build the historical engagement index
+
+Scans every document in the Historical search index and the attorney-history
+blob container, extracts attorney IDs and practice areas, and writes the
+per-attorney engagement features (linked_legal_documents and the engagement
+summary) onto the attorney profiles in Cosmos DB. Run it after new history
+documents are uploaded and indexed; the API picks the changes up on its next
+attorney roster refresh.
+
+Usage:
+    python -m scripts.build_engagement_index
+    python -m scripts.build_engagement_index --dry-run --output engagement_table.json
+"""
+
+import argparse
+import json
+import logging
+
+from services.ai_search_service import AISearchService
+from services.attorney_service import AttorneyService
+from services.blob_storage_service import attorney_history_container
+from services.engagement_indexer import EngagementIndexer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the per-attorney historical engagement index")
+    parser.add_argument("--dry-run", action="store_true", help="Build the table without updating attorneys")
+    parser.add_argument("--output", help="Also write the engagement table to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    indexer = EngagementIndexer(AISearchService(), AttorneyService(), attorney_history_container)
+    result = indexer.run(dry_run=args.dry_run)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result['table'], f, indent=2, sort_keys=True)
+        print(f"Engagement table written to {args.output}")
+
+    print(json.dumps(result['summary'], indent=2))
+
+
+if __name__ == "__main__":
+    main()
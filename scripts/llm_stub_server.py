@@ -0,0 +1,181 @@
+"""
+Offline stand-in for the Azure OpenAI chat completions API
+
+Returns deterministic risk analysis JSON for the risk pipeline, with
+artificial latency and token-rate emulation, so the API can be load tested
+without calling GPT-4o.
+
+Usage:
+    python -m scripts.llm_stub_server --port 8001 --latency-ms 800 --tokens-per-second 60
+
+Point the API at it with:
+    AZURE_OPENAI_STUB_URL=http://localhost:8001
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+import uvicorn
+
+RISK_LIBRARY = [
+    "Regulatory enforcement exposure from recent changes in reporting obligations",
+    "Data privacy liability arising from cross-border transfer of customer data",
+    "Contractual disputes with suppliers over force majeure and delivery terms",
+    "Employment claims related to worker classification and wage-and-hour rules",
+    "Intellectual property infringement risk in newly launched product lines",
+    "Anti-corruption compliance gaps in third-party intermediary relationships",
+    "Environmental permitting and remediation liabilities at operating sites",
+    "Securities disclosure risk around forward-looking statements",
+    "Antitrust scrutiny of pricing practices and distribution agreements",
+    "Tax exposure from transfer pricing positions under audit",
+]
+
+app = FastAPI(title="LLM Stub Server")
+config = {
+    "latency_ms": 800.0,
+    "jitter_ms": 0.0,
+    "tokens_per_second": 60.0,
+}
+
+
+def build_completion(messages: List[Dict[str, Any]]) -> str:
+    """Deterministic risk analysis JSON derived from the prompt text"""
+    prompt = "\n".join(str(message.get("content", "")) for message in messages)
+    seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "big")
+    picker = random.Random(seed)
+    risks = picker.sample(RISK_LIBRARY, k=picker.randint(3, 5))
+    return json.dumps({
+        "risks": risks,
+        "confidence_score": picker.randint(70, 95),
+        "reasoning": "Deterministic stub response derived from the prompt contents."
+    })
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split content into token-sized pieces for streaming"""
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+async def wait_first_token():
+    """Sleep for the configured time-to-first-token"""
+    delay_ms = config["latency_ms"] + random.uniform(0, config["jitter_ms"])
+    await asyncio.sleep(delay_ms / 1000)
+
+
+def token_delay(tokens: int) -> float:
+    """Seconds needed to generate tokens at the configured rate"""
+    if config["tokens_per_second"] <= 0:
+        return 0.0
+    return tokens / config["tokens_per_second"]
+
+
+async def chat_completions(request: Request, model: str = "stub"):
+    """OpenAI-compatible chat completions, optionally streamed"""
+    body = await request.json()
+    messages = body.get("messages", [])
+    content = build_completion(messages)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    model = body.get("model", model)
+
+    await wait_first_token()
+
+    if not body.get("stream"):
+        await asyncio.sleep(token_delay(count_tokens(content)))
+        prompt_tokens = count_tokens("".join(str(m.get("content", "")) for m in messages))
+        completion_tokens = count_tokens(content)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    async def event_stream():
+        def chunk(delta: Dict[str, Any], finish_reason: str = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        yield chunk({"role": "assistant", "content": ""})
+        per_token = token_delay(1)
+        for piece in split_tokens(content):
+            await asyncio.sleep(per_token)
+            yield chunk({"content": piece})
+        yield chunk({}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/openai/deployments/{deployment}/chat/completions")
+async def azure_chat_completions(deployment: str, request: Request):
+    """Azure OpenAI route used by AzureOpenAI / AsyncAzureOpenAI"""
+    return await chat_completions(request, model=deployment)
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat_completions(request: Request):
+    """Plain OpenAI route"""
+    return await chat_completions(request)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", **config}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline OpenAI-compatible stub for load testing")
+    parser.add_argument("--host", default=os.getenv("LLM_STUB_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("LLM_STUB_PORT", "8001")))
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("LLM_STUB_LATENCY_MS", "800")),
+                        help="Time to first token")
+    parser.add_argument("--jitter-ms", type=float, default=float(os.getenv("LLM_STUB_JITTER_MS", "0")),
+                        help="Uniform random extra latency added to each call")
+    parser.add_argument("--tokens-per-second", type=float,
+                        default=float(os.getenv("LLM_STUB_TOKENS_PER_SECOND", "60")),
+                        help="Emulated generation speed; 0 disables")
+    args = parser.parse_args()
+
+    config.update(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second
+    )
+    print(f"LLM stub listening on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms:.0f}ms, {args.tokens_per_second:.0f} tokens/s)")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Query-plan reuse of the attorney and public source listing queries
+
+Replays a synthetic mix of listing requests through the interpolated query
+builders the services used before QueryBuilder and through the current
+parameterized ones. Cosmos DB compiles and caches a query plan per distinct
+query text, so the number of distinct texts is the number of plans the
+gateway has to build. Values containing quotes are counted separately
+because the interpolated queries cannot run with them at all.
+
+With --live the same workload is also run against Cosmos DB, reporting the
+median latency and total request charge of each style.
+
+Usage:
+    python -m scripts.measure_query_plans --requests 1000
+    python -m scripts.measure_query_plans --requests 200 --live
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from services.attorney_service import AttorneyService
+from services.public_source_service import PublicSourceService
+from utils.practice_areas import normalize_practice_area
+
+PRACTICE_AREAS = [
+    "Compliance", "compliance", "Corporate Law", "Employment Law", "Tax",
+    "Intellectual Property", "IP", "Banking & Finance", "Litigation"
+]
+RISK_AREAS = ["Regulatory", "Data Privacy", "Employment", "Tax", "Litigation", "Cybersecurity"]
+JURISDICTIONS = ["US", "UK", "EU", "India", "Côte d'Ivoire", "Unknown"]
+ENRICHMENT_STATUSES = ["pending", "completed", "failed"]
+
+
+def legacy_attorneys_query(
+    practice_area: Optional[str] = None,
+    seniority: Optional[str] = None,
+    min_experience: Optional[int] = None
+) -> str:
+    """The interpolated attorney listing query AttorneyService used to build"""
+    conditions = []
+    if practice_area:
+        conditions.append(f"ARRAY_CONTAINS(c.practice_area_keys, '{normalize_practice_area(practice_area)}')")
+    if seniority:
+        conditions.append(f"c.seniority = '{seniority}'")
+    if min_experience:
+        conditions.append(f"c.years_of_experience >= {min_experience}")
+    return "SELECT * FROM c" + (" WHERE " + " AND ".join(conditions) if conditions else "")
+
+
+def legacy_public_sources_query(
+    risk_area: Optional[str] = None,
+    jurisdiction: Optional[str] = None,
+    enrichment_status: Optional[str] = None
+) -> str:
+    """The interpolated public source listing query PublicSourceService used to build"""
+    conditions = []
+    if risk_area:
+        conditions.append(f"c.risk_area = '{risk_area}'")
+    if jurisdiction:
+        conditions.append(f"c.jurisdiction = '{jurisdiction}'")
+    if enrichment_status:
+        conditions.append(f"c.enrichment_status = '{enrichment_status}'")
+    return "SELECT * FROM c" + (" WHERE " + " AND ".join(conditions) if conditions else "")
+
+
+def make_workload(requests: int, seed: int) -> List[Tuple[str, Tuple]]:
+    """(container, filter arguments) per request; each filter is set half the time"""
+    picker = random.Random(seed)
+
+    def maybe(values):
+        return picker.choice(values) if picker.random() < 0.5 else None
+
+    workload = []
+    for _ in range(requests):
+        if picker.random() < 0.5:
+            args = (
+                maybe(PRACTICE_AREAS),
+                maybe(settings.SENIORITY_LEVELS),
+                picker.randint(1, 30) if picker.random() < 0.5 else None
+            )
+            workload.append((settings.ATTORNEY_CONTAINER, args))
+        else:
+            args = (maybe(RISK_AREAS), maybe(JURISDICTIONS), maybe(ENRICHMENT_STATUSES))
+            workload.append((settings.PUBLIC_DATA_CONTAINER, args))
+    return workload
+
+
+def build_queries(workload: List[Tuple[str, Tuple]]) -> Dict[str, List[Tuple[str, str, List]]]:
+    """(container, query, parameters) per request for both styles"""
+    legacy, parameterized = [], []
+    for container, args in workload:
+        if container == settings.ATTORNEY_CONTAINER:
+            legacy.append((container, legacy_attorneys_query(*args), []))
+            parameterized.append((container, *AttorneyService._build_attorneys_query(*args)))
+        else:
+            legacy.append((container, legacy_public_sources_query(*args), []))
+            parameterized.append((container, *PublicSourceService._build_public_sources_query(*args)))
+    return {"interpolated": legacy, "parameterized": parameterized}
+
+
+def count_quote_breaks(queries: List[Tuple[str, str, List]]) -> int:
+    """Queries whose interpolated literals contain an unescaped quote"""
+    return sum(1 for _, query, _ in queries if query.count("'") % 2 or "''" in query)
+
+
+def run_live(queries: List[Tuple[str, str, List]]) -> Dict[str, Any]:
+    """Median latency and total request charge of the queries against Cosmos DB"""
+    from services.database_service import DatabaseService
+    db = DatabaseService()
+
+    samples, charge, errors = [], 0.0, 0
+    for container, query, parameters in queries:
+        started = time.perf_counter()
+        try:
+            db.query_items(container, query, parameters)
+        except Exception:
+            errors += 1
+            continue
+        samples.append((time.perf_counter() - started) * 1000)
+        headers = db._get_container(container).client_connection.last_response_headers
+        charge += float(headers.get("x-ms-request-charge", 0))
+    return {
+        "median_ms": round(statistics.median(samples), 2) if samples else None,
+        "request_charge": round(charge, 2),
+        "errors": errors
+    }
+
+
+def measure(name: str, queries: List[Tuple[str, str, List]], live: bool) -> Dict[str, Any]:
+    distinct = {query for _, query, _ in queries}
+    row = {
+        "style": name,
+        "requests": len(queries),
+        "distinct_query_texts": len(distinct),
+        "plan_reuse_pct": round(100 * (1 - len(distinct) / len(queries)), 1) if queries else 0.0,
+        "broken_by_quotes": count_quote_breaks(queries) if name == "interpolated" else 0
+    }
+    if live:
+        row.update(run_live(queries))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure query-plan reuse of listing queries")
+    parser.add_argument("--requests", type=int, default=1000, help="Listing requests to replay")
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--live", action="store_true", help="Also run the queries against Cosmos DB")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    styles: Dict[str, List] = build_queries(make_workload(args.requests, args.seed))
+    report = [measure(name, queries, args.live) for name, queries in styles.items()]
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{'style':>14}{'requests':>10}{'distinct':>10}{'reuse %':>9}{'quote breaks':>14}")
+    for row in report:
+        print(f"{row['style']:>14}{row['requests']:>10}{row['distinct_query_texts']:>10}"
+              f"{row['plan_reuse_pct']:>9}{row['broken_by_quotes']:>14}")
+        if args.live:
+            print(f"{'':>14}median {row['median_ms']} ms, {row['request_charge']} RU, {row['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
-from typing import List, Dict, Any
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
+from typing import List, Dict, Any, Iterator
 from config import settings
 import logging
 
@@ -26,6 +27,19 @@ class AISearchService:
             credential=AzureKeyCredential(self.key)
         )
         
+        # Non-blocking clients for the async risk analysis pipeline
+        self.internal_docs_async_client = AsyncSearchClient(
+            endpoint=self.endpoint,
+            index_name=settings.AZURE_SEARCH_INTERNAL_INDEX,
+            credential=AzureKeyCredential(self.key)
+        )
+        
+        self.historical_data_async_client = AsyncSearchClient(
+            endpoint=self.endpoint,
+            index_name=settings.AZURE_SEARCH_HISTORICAL_INDEX,
+            credential=AzureKeyCredential(self.key)
+        )
+        
         # Field name configuration
         self.content_field = settings.AZURE_SEARCH_CONTENT_FIELD
         self.name_field = settings.AZURE_SEARCH_METADATA_NAME_FIELD
@@ -53,12 +67,7 @@ class AISearchService:
         Returns:
             List of search results with content and metadata
         """
-        logger.info("="*80)
-        logger.info("SEARCHING INTERNAL DOCUMENTS")
-        logger.info("="*80)
-        logger.info(f"Query: {query}")
-        logger.info(f"Top Results: {top}")
-        logger.info(f"Filter: {filter_expr if filter_expr else 'None'}")
+        logger.info("Searching internal documents: query=%r top=%d filter=%s", query, top, filter_expr)
         
         results = []
         try:
@@ -71,26 +80,16 @@ class AISearchService:
                 include_total_count=True
             )
             
-            for idx, result in enumerate(search_results, 1):
-                doc = {
-                    "content": result.get(self.content_field, ""),
-                    "source": result.get(self.name_field, ""),
-                    "path": result.get(self.path_field, ""),
-                    "score": result.get("@search.score", 0.0)
-                }
-                results.append(doc)
-                
-                logger.info(f"\n--- Result {idx} ---")
-                logger.info(f"Source: {doc['source']}")
-                logger.info(f"Score: {doc['score']:.4f}")
-                logger.info(f"Content Preview: {doc['content'][:200]}...")
+            for result in search_results:
+                results.append(self._to_document(result))
             
-            logger.info(f"\nRetrieved {len(results)} internal documents")
+            self._log_results("internal documents", results)
             
         except Exception as e:
-            logger.error(f"Error searching internal documents: {str(e)}")
-            logger.error(f"Field configuration may be incorrect. Check your index schema.")
-            logger.error(f"Expected fields: {self.content_field}, {self.name_field}, {self.path_field}")
+            logger.error(
+                "Error searching internal documents: %s (check the index schema; expected fields %s, %s, %s)",
+                e, self.content_field, self.name_field, self.path_field
+            )
         
         return results
     
@@ -111,12 +110,7 @@ class AISearchService:
         Returns:
             List of search results with content and metadata
         """
-        logger.info("="*80)
-        logger.info("SEARCHING HISTORICAL DATA")
-        logger.info("="*80)
-        logger.info(f"Query: {query}")
-        logger.info(f"Top Results: {top}")
-        logger.info(f"Filter: {filter_expr if filter_expr else 'None'}")
+        logger.info("Searching historical data: query=%r top=%d filter=%s", query, top, filter_expr)
         
         results = []
         try:
@@ -128,29 +122,33 @@ class AISearchService:
                 include_total_count=True
             )
             
-            for idx, result in enumerate(search_results, 1):
-                doc = {
-                    "content": result.get(self.content_field, ""),
-                    "source": result.get(self.name_field, ""),
-                    "path": result.get(self.path_field, ""),
-                    "score": result.get("@search.score", 0.0)
-                }
-                results.append(doc)
-                
-                logger.info(f"\n--- Result {idx} ---")
-                logger.info(f"Source: {doc['source']}")
-                logger.info(f"Score: {doc['score']:.4f}")
-                logger.info(f"Content Preview: {doc['content'][:200]}...")
+            for result in search_results:
+                results.append(self._to_document(result))
             
-            logger.info(f"\nRetrieved {len(results)} historical documents")
+            self._log_results("historical documents", results)
             
         except Exception as e:
-            logger.error(f"Error searching historical data: {str(e)}")
-            logger.error(f"Field configuration may be incorrect. Check your index schema.")
-            logger.error(f"Expected fields: {self.content_field}, {self.name_field}, {self.path_field}")
+            logger.error(
+                "Error searching historical data: %s (check the index schema; expected fields %s, %s, %s)",
+                e, self.content_field, self.name_field, self.path_field
+            )
         
         return results
     
+    def iter_historical_documents(self) -> Iterator[Dict[str, Any]]:
+        """
+        Every document in the historical index, for offline indexing
+        
+        The SDK follows the service's continuation pages; Azure AI Search
+        stops paging a single query after 100,000 documents.
+        """
+        search_results = self.historical_data_client.search(
+            search_text="*",
+            select=[self.content_field, self.name_field, self.path_field]
+        )
+        for result in search_results:
+            yield self._to_document(result)
+    
     def search_both_indexes(
         self, 
         query: str, 
@@ -162,18 +160,109 @@ class AISearchService:
         Returns:
             Dictionary with 'internal' and 'historical' keys containing results
         """
-        logger.info("\n" + "="*80)
-        logger.info("COMBINED SEARCH - BOTH INDEXES")
-        logger.info("="*80)
-        
         internal_results = self.search_internal_documents(query, top=top_per_index)
         historical_results = self.search_historical_data(query, top=top_per_index)
         
-        logger.info(f"\nCombined search complete:")
-        logger.info(f"  - Internal docs: {len(internal_results)} results")
-        logger.info(f"  - Historical data: {len(historical_results)} results")
+        logger.info(
+            "Combined search complete: %d internal, %d historical results",
+            len(internal_results), len(historical_results)
+        )
         
         return {
             "internal": internal_results,
             "historical": historical_results
-        }
\ No newline at end of file
+        }
+    
+    async def search_internal_documents_async(
+        self, 
+        query: str, 
+        top: int = 5,
+        filter_expr: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Non-blocking variant of search_internal_documents
+        
+        Search errors are logged and re-raised, so the risk pipeline can tell
+        an outage from an empty result.
+        """
+        logger.info("Searching internal documents: query=%r top=%d filter=%s", query, top, filter_expr)
+        
+        results = []
+        try:
+            search_results = await self.internal_docs_async_client.search(
+                search_text=query,
+                top=top,
+                filter=filter_expr,
+                select=[self.content_field, self.name_field, self.path_field],
+                include_total_count=True
+            )
+            async for result in search_results:
+                results.append(self._to_document(result))
+            
+            self._log_results("internal documents", results)
+            
+        except Exception as e:
+            logger.error(
+                "Error searching internal documents: %s (check the index schema; expected fields %s, %s, %s)",
+                e, self.content_field, self.name_field, self.path_field
+            )
+            raise
+        
+        return results
+    
+    async def search_historical_data_async(
+        self, 
+        query: str, 
+        top: int = 5,
+        filter_expr: str = None
+    ) -> List[Dict[str, Any]]:
+        """Non-blocking variant of search_historical_data; search errors are re-raised"""
+        logger.info("Searching historical data: query=%r top=%d filter=%s", query, top, filter_expr)
+        
+        results = []
+        try:
+            search_results = await self.historical_data_async_client.search(
+                search_text=query,
+                top=top,
+                filter=filter_expr,
+                select=[self.content_field, self.name_field, self.path_field],
+                include_total_count=True
+            )
+            async for result in search_results:
+                results.append(self._to_document(result))
+            
+            self._log_results("historical documents", results)
+            
+        except Exception as e:
+            logger.error(
+                "Error searching historical data: %s (check the index schema; expected fields %s, %s, %s)",
+                e, self.content_field, self.name_field, self.path_field
+            )
+            raise
+        
+        return results
+    
+    async def close_async(self):
+        """Close the non-blocking search clients"""
+        await self.internal_docs_async_client.close()
+        await self.historical_data_async_client.close()
+    
+    def _to_document(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a raw search hit into the document shape used by the pipeline"""
+        return {
+            "content": result.get(self.content_field, ""),
+            "source": result.get(self.name_field, ""),
+            "path": result.get(self.path_field, ""),
+            "score": result.get("@search.score", 0.0)
+        }
+    
+    @staticmethod
+    def _log_results(kind: str, results: List[Dict[str, Any]]):
+        """Log the hit count; per-hit previews only at DEBUG level"""
+        logger.info("Retrieved %d %s", len(results), kind)
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, doc in enumerate(results, 1):
+                logger.debug(
+                    "Result %d: source=%s score=%.4f preview=%r",
+                    idx, doc['source'], doc['score'], doc['content'][:200]
+                )
@@ -0,0 +1,58 @@
+from azure.cosmos.aio import CosmosClient
+from typing import Dict, Any, List
+from config import settings
+
+class AsyncDatabaseService:
+    """
+    Non-blocking counterpart of DatabaseService built on azure.cosmos.aio.
+
+    Containers are created by the synchronous DatabaseService at startup, so
+    this client only resolves them. Use it from coroutines running on the
+    event loop; call close() on shutdown to release the aiohttp session.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncDatabaseService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.client = CosmosClient(settings.COSMOS_ENDPOINT, settings.COSMOS_KEY)
+        self.database = self.client.get_database_client(settings.COSMOS_DATABASE)
+
+        self.attorney_container = self.database.get_container_client(settings.ATTORNEY_CONTAINER)
+        self.public_data_container = self.database.get_container_client(settings.PUBLIC_DATA_CONTAINER)
+
+        self._initialized = True
+
+    async def insert_item(self, container_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert item into container"""
+        container = self._get_container(container_name)
+        return await container.create_item(body=item)
+
+    async def query_items(self, container_name: str, query: str, parameters: List = None) -> List[Dict[str, Any]]:
+        """Query items from container (cross-partition)"""
+        container = self._get_container(container_name)
+        items = container.query_items(
+            query=query,
+            parameters=parameters or []
+        )
+        return [item async for item in items]
+
+    async def close(self):
+        """Close the underlying client session"""
+        await self.client.close()
+
+    def _get_container(self, container_name: str):
+        """Get container client by name"""
+        if container_name == settings.ATTORNEY_CONTAINER:
+            return self.attorney_container
+        elif container_name == settings.PUBLIC_DATA_CONTAINER:
+            return self.public_data_container
+        else:
+            raise ValueError(f"Unknown container: {container_name}")
@@ -0,0 +1,210 @@
+from bisect import bisect_right
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import threading
+import time
+from config import settings
+from services.attorney_scoring import AttorneyScoringMatrix
+from services.data_version import data_version
+from utils.practice_areas import normalize_practice_area, practice_area_keys
+
+logger = logging.getLogger(__name__)
+
+class AttorneyRosterIndex:
+    """
+    In-memory index of every attorney profile.
+
+    Holds an inverted map from practice area to attorneys plus secondary
+    maps by seniority and experience band, so attorney matching is served
+    from memory instead of a cross-partition Cosmos query, and a columnar
+    AttorneyScoringMatrix of the same roster for ranking. The roster is
+    loaded at startup and reloaded by a background task on a schedule and
+    within ATTORNEY_ROSTER_CHANGE_POLL_SECONDS of a write recorded by
+    AttorneyService. Until the first load completes, lookups return None
+    and callers query Cosmos directly.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        """
+        Args:
+            loader: Coroutine returning every attorney document
+        """
+        self.loader = loader
+        self.enabled = settings.ATTORNEY_ROSTER_ENABLED
+        self.refresh_seconds = settings.ATTORNEY_ROSTER_REFRESH_SECONDS
+        self.poll_seconds = settings.ATTORNEY_ROSTER_CHANGE_POLL_SECONDS
+        self.experience_bands = sorted(settings.ATTORNEY_EXPERIENCE_BANDS)
+
+        self._index: Optional[Dict[str, Any]] = None
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether a roster has been loaded"""
+        with self._lock:
+            return self.enabled and self._index is not None
+
+    def find(
+        self,
+        practice_area: Optional[str] = None,
+        seniority: Optional[str] = None,
+        min_experience: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Attorneys matching all given filters, same semantics as
+        AttorneyService.get_attorneys; None when the index is not ready
+        """
+        if not self.ready:
+            return None
+        with self._lock:
+            index = self._index
+
+        matched = None
+        if practice_area:
+            matched = set(index['by_practice_area'].get(normalize_practice_area(practice_area), ()))
+        if seniority:
+            ids = index['by_seniority'].get(seniority, set())
+            matched = ids.copy() if matched is None else matched & ids
+        if min_experience:
+            ids = self._with_min_experience(index, min_experience)
+            matched = ids if matched is None else matched & ids
+
+        attorneys = index['attorneys']
+        if matched is None:
+            return list(attorneys.values())
+        return [attorneys[attorney_id] for attorney_id in index['order'] if attorney_id in matched]
+
+    def candidates(self, practice_area: str) -> Optional[List[Dict[str, Any]]]:
+        """Attorneys in the practice area, falling back to all attorneys"""
+        attorneys = self.find(practice_area=practice_area)
+        if attorneys is None:
+            return None
+        if not attorneys:
+            logger.warning("No attorneys indexed for practice area, using all attorneys...")
+            attorneys = self.find()
+        return attorneys
+
+    def scoring_matrix(self) -> Optional[AttorneyScoringMatrix]:
+        """Scoring matrix of the whole roster; None when the index is not ready"""
+        if not self.ready:
+            return None
+        with self._lock:
+            return self._index['matrix']
+
+    def build(self, attorneys: List[Dict[str, Any]], version: int):
+        """Replace the index with one built from the given attorney documents"""
+        by_practice_area: Dict[str, set] = {}
+        by_seniority: Dict[str, set] = {}
+        by_experience_band: Dict[int, set] = {}
+        ordered: Dict[str, Dict[str, Any]] = {}
+
+        for attorney in attorneys:
+            attorney_id = attorney['attorney_id']
+            ordered[attorney_id] = attorney
+            for key in practice_area_keys(attorney.get('practice_areas', [])):
+                by_practice_area.setdefault(key, set()).add(attorney_id)
+            by_seniority.setdefault(attorney.get('seniority'), set()).add(attorney_id)
+            band = self._band(attorney.get('years_of_experience') or 0)
+            by_experience_band.setdefault(band, set()).add(attorney_id)
+
+        index = {
+            "attorneys": ordered,
+            "order": list(ordered.keys()),
+            "by_practice_area": by_practice_area,
+            "by_seniority": by_seniority,
+            "by_experience_band": by_experience_band,
+            "matrix": AttorneyScoringMatrix(list(ordered.values()))
+        }
+        with self._lock:
+            self._index = index
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    async def refresh(self) -> bool:
+        """Reload every attorney; the previous index is kept on failure"""
+        version = data_version.get(settings.ATTORNEY_CONTAINER)
+        started = time.monotonic()
+        try:
+            attorneys = await self.loader()
+        except Exception as e:
+            logger.error("Attorney roster refresh failed: %s", e)
+            return False
+        self.build(attorneys, version)
+        logger.info("Indexed %d attorneys in %.2fs", len(attorneys), time.monotonic() - started)
+        return True
+
+    def start(self):
+        """Start the background refresh task on the running event loop"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Cancel the background refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the index and the age of the last load"""
+        with self._lock:
+            index = self._index
+            loaded_at = self._loaded_at
+        if index is None:
+            return {"enabled": self.enabled, "ready": False}
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "attorneys": len(index['attorneys']),
+            "practice_areas": {area: len(ids) for area, ids in sorted(index['by_practice_area'].items())},
+            "seniority": {level: len(ids) for level, ids in index['by_seniority'].items()},
+            "experience_bands": {
+                self._band_label(band): len(ids) for band, ids in sorted(index['by_experience_band'].items())
+            },
+            "age_seconds": round(time.monotonic() - loaded_at, 1)
+        }
+
+    def _with_min_experience(self, index: Dict[str, Any], min_experience: int) -> set:
+        """Attorneys with at least min_experience years, using whole bands where possible"""
+        attorneys = index['attorneys']
+        first_band = self._band(min_experience)
+        ids = set()
+        for band, members in index['by_experience_band'].items():
+            if band > first_band:
+                ids |= members
+            elif band == first_band:
+                ids |= {
+                    attorney_id for attorney_id in members
+                    if (attorneys[attorney_id].get('years_of_experience') or 0) >= min_experience
+                }
+        return ids
+
+    def _band(self, years: int) -> int:
+        """Index of the experience band containing years"""
+        return max(0, bisect_right(self.experience_bands, years) - 1)
+
+    def _band_label(self, band: int) -> str:
+        lower = self.experience_bands[band]
+        if band + 1 < len(self.experience_bands):
+            return f"{lower}-{self.experience_bands[band + 1] - 1}"
+        return f"{lower}+"
+
+    async def _refresh_loop(self):
+        """Refresh on schedule, or early when attorneys are written"""
+        last_refresh = float("-inf")
+        while True:
+            with self._lock:
+                loaded_version = self._loaded_version
+            changed = loaded_version != data_version.get(settings.ATTORNEY_CONTAINER)
+            due = time.monotonic() - last_refresh >= self.refresh_seconds
+            if due or changed:
+                if await self.refresh():
+                    last_refresh = time.monotonic()
+            await asyncio.sleep(self.poll_seconds)
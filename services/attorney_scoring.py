@@ -0,0 +1,212 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+import numpy as np
+from config import settings
+from utils.practice_areas import normalize_practice_area
+
+# Match score components
+PRACTICE_AREA_MATCH_SCORE = 40
+PROFICIENCY_BONUS = {
+    'Expert': 20,
+    'Advanced': 15,
+    'Intermediate': 10,
+    'Beginner': 5
+}
+SENIORITY_BONUS = {
+    'Senior Partner': 20,
+    'Partner': 15,
+    'Senior Associate': 10,
+    'Associate': 5
+}
+MAX_EXPERIENCE_BONUS = 20
+HISTORICAL_ENGAGEMENT_BONUS = 30
+# Extra bonus for repeat engagements, on top of HISTORICAL_ENGAGEMENT_BONUS
+REPEAT_ENGAGEMENT_BONUS = 10
+
+
+def _repeat_weight(count):
+    """Share of REPEAT_ENGAGEMENT_BONUS earned by count (>= 1) engagements"""
+    full = math.log(max(2, settings.ENGAGEMENT_BONUS_FULL_COUNT))
+    return np.minimum(1.0, np.log(count) / full)
+
+
+def engagement_bonus(count: int, recency: float = 1.0) -> int:
+    """
+    Historical engagement bonus for count engagements in the practice area
+
+    One engagement earns HISTORICAL_ENGAGEMENT_BONUS; further ones add up
+    to REPEAT_ENGAGEMENT_BONUS, growing with log(count) and complete at
+    ENGAGEMENT_BONUS_FULL_COUNT engagements. The total is scaled by recency
+    (1.0 for a current or undated last engagement, halving every
+    ENGAGEMENT_RECENCY_HALF_LIFE_DAYS).
+    """
+    if count <= 0:
+        return 0
+    bonus = HISTORICAL_ENGAGEMENT_BONUS + REPEAT_ENGAGEMENT_BONUS * float(_repeat_weight(count))
+    return int(round(bonus * recency))
+
+
+def engagement_recency(last_engaged_at: Optional[str], now: Optional[datetime] = None) -> float:
+    """Recency factor of an ISO last-engagement timestamp; 1.0 when unknown"""
+    if not last_engaged_at:
+        return 1.0
+    try:
+        engaged_at = datetime.fromisoformat(last_engaged_at.replace("Z", "+00:00"))
+    except ValueError:
+        return 1.0
+    if engaged_at.tzinfo is None:
+        engaged_at = engaged_at.replace(tzinfo=timezone.utc)
+    age_days = max(0.0, ((now or datetime.now(timezone.utc)) - engaged_at).total_seconds() / 86400)
+    return 0.5 ** (age_days / settings.ENGAGEMENT_RECENCY_HALF_LIFE_DAYS)
+
+class AttorneyScoringMatrix:
+    """
+    Columnar form of a set of attorneys for vectorized match scoring.
+
+    Each attorney is a row. Seniority is stored as a code into
+    settings.SENIORITY_LEVELS and years of experience as an integer array;
+    practice areas, by normalized key, form an (attorneys x practice areas)
+    matrix holding the practice-area score of each attorney (match score
+    plus proficiency bonus), and a matching matrix of historical engagement
+    counts taken from linked_legal_documents (see
+    scripts/build_engagement_index.py). Scoring a request is a column lookup
+    plus a few array additions, and the top matches are selected with
+    argpartition.
+
+    The historical engagement bonus (see engagement_bonus) weighs the
+    engagements in the practice area by count, and by the recency of the
+    attorney's last indexed engagement. For attorneys the engagement
+    indexer has processed these are the indexed engagements only: the
+    indexer has already read every historical document, so a search hit
+    for the request would count the same document twice. Attorneys not
+    indexed yet are credited with the request's historical search hits.
+    """
+
+    def __init__(self, attorneys: List[Dict[str, Any]]):
+        self.attorneys = attorneys
+        count = len(attorneys)
+        self._rows = {attorney['attorney_id']: row for row, attorney in enumerate(attorneys)}
+
+        seniority_codes = {level: code for code, level in enumerate(settings.SENIORITY_LEVELS)}
+        # Last code is for seniorities outside SENIORITY_LEVELS
+        seniority_bonus = np.array(
+            [SENIORITY_BONUS.get(level, 0) for level in settings.SENIORITY_LEVELS] + [0],
+            dtype=np.int32
+        )
+        self.seniority = np.fromiter(
+            (seniority_codes.get(attorney.get('seniority'), len(seniority_codes)) for attorney in attorneys),
+            dtype=np.int8,
+            count=count
+        )
+        self.experience = np.fromiter(
+            (attorney.get('years_of_experience') or 0 for attorney in attorneys),
+            dtype=np.int32,
+            count=count
+        )
+
+        self.practice_areas: Dict[str, int] = {}
+        cells: Dict[Tuple[int, int], int] = {}
+        engagement_cells: Dict[Tuple[int, int], int] = {}
+        for row, attorney in enumerate(attorneys):
+            for pa in attorney.get('practice_areas', []):
+                key = normalize_practice_area(pa['area'])
+                column = self.practice_areas.setdefault(key, len(self.practice_areas))
+                score = PRACTICE_AREA_MATCH_SCORE + PROFICIENCY_BONUS.get(pa.get('proficiency'), 0)
+                cells[row, column] = cells.get((row, column), 0) + score
+                linked = len(pa.get('linked_legal_documents') or [])
+                if linked:
+                    engagement_cells[row, column] = engagement_cells.get((row, column), 0) + linked
+
+        shape = (count, max(1, len(self.practice_areas)))
+        self.practice_area_scores = self._matrix(shape, cells, np.int16)
+        self.engagements = self._matrix(shape, engagement_cells, np.int16)
+        now = datetime.now(timezone.utc)
+        self.recency = np.fromiter(
+            (engagement_recency((attorney.get('engagement') or {}).get('last_engaged_at'), now) for attorney in attorneys),
+            dtype=np.float64,
+            count=count
+        )
+        # Profiles the engagement indexer has processed
+        self.indexed = np.fromiter(
+            (attorney.get('engagement') is not None for attorney in attorneys),
+            dtype=bool,
+            count=count
+        )
+
+        # Part of the score that does not depend on the request
+        self._base = seniority_bonus[self.seniority] + np.minimum(self.experience, MAX_EXPERIENCE_BONUS)
+
+    def __len__(self) -> int:
+        return len(self.attorneys)
+
+    def scores(self, practice_area: str, historical_attorney_ids: Iterable[str] = ()) -> np.ndarray:
+        """
+        Match score of every attorney for the practice area
+
+        Args:
+            historical_attorney_ids: One entry per historical search hit
+                naming the attorney; repeated ids count repeatedly. Ignored
+                for indexed attorneys, whose engagements already include
+                every historical document
+        """
+        scores = self._base.copy()
+        counts = np.zeros(len(self.attorneys), dtype=np.int64)
+        column = self.practice_areas.get(normalize_practice_area(practice_area))
+        if column is not None:
+            scores += self.practice_area_scores[:, column]
+            counts += self.engagements[:, column]
+        historical_rows = [
+            self._rows[attorney_id] for attorney_id in historical_attorney_ids
+            if attorney_id in self._rows and not self.indexed[self._rows[attorney_id]]
+        ]
+        if historical_rows:
+            np.add.at(counts, historical_rows, 1)
+
+        engaged = np.flatnonzero(counts)
+        if len(engaged):
+            # engagement_bonus over the engaged rows
+            bonus = HISTORICAL_ENGAGEMENT_BONUS + REPEAT_ENGAGEMENT_BONUS * _repeat_weight(counts[engaged])
+            bonus = np.rint(bonus * self.recency[engaged])
+            scores[engaged] += bonus.astype(scores.dtype)
+        return scores
+
+    def top_k(
+        self,
+        practice_area: str,
+        historical_attorney_ids: Iterable[str] = (),
+        k: int = 3,
+        practice_area_only: bool = False
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        """
+        Best k (attorney, score) pairs, highest score first; ties keep roster order
+
+        Args:
+            practice_area_only: Rank only attorneys in the practice area,
+                unless none are
+        """
+        count = len(self.attorneys)
+        if count == 0 or k <= 0:
+            return []
+
+        scores = self.scores(practice_area, historical_attorney_ids)
+        rows = np.arange(count)
+        column = self.practice_areas.get(normalize_practice_area(practice_area))
+        if practice_area_only and column is not None:
+            rows = np.flatnonzero(self.practice_area_scores[:, column])
+
+        # Unique sort key: score first, then earlier rows
+        keys = scores[rows].astype(np.int64) * count + (count - 1 - rows)
+        k = min(k, len(rows))
+        top = np.argpartition(-keys, k - 1)[:k]
+        top = top[np.argsort(-keys[top])]
+        return [(self.attorneys[row], int(scores[row])) for row in rows[top]]
+
+    @staticmethod
+    def _matrix(shape: Tuple[int, int], cells: Dict[Tuple[int, int], int], dtype) -> np.ndarray:
+        """Dense matrix from {(row, column): value}"""
+        matrix = np.zeros(shape, dtype=dtype)
+        if cells:
+            rows, columns = zip(*cells.keys())
+            matrix[list(rows), list(columns)] = list(cells.values())
+        return matrix
@@ -1,19 +1,43 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
 import uuid
-from services.database_service import DatabaseService
-from models.attorney import AttorneyCreate, PracticeAreaStored
+from azure.cosmos import exceptions
+from services.database_service import DatabaseService, QueryBuilder
+from services.async_database_service import AsyncDatabaseService
+from services.bulk_ingestion import BulkIngestor
+from services.data_version import data_version
+from services.partition_key_map import get_partition_key_map
+from models.attorney import AttorneyCreate, PracticeAreaStored, BulkAttorneyRowResult, BulkAttorneyIngestionResult
+from utils.bloom_filter import BloomFilter
+from utils.practice_areas import normalize_practice_area, practice_area_keys
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 class AttorneyService:
     def __init__(self):
         self.db = DatabaseService()
+        self.async_db = AsyncDatabaseService()
+        self.partition_keys = get_partition_key_map(settings.ATTORNEY_CONTAINER)
+        
+        # Bloom filter of stored emails, the attorney data version it reflects
+        # and when it was last synced
+        self._email_filter: Optional[BloomFilter] = None
+        self._email_filter_version: Optional[int] = None
+        self._email_filter_synced_at = 0.0
+        self._email_filter_lock = threading.Lock()
     
     def create_attorney(self, attorney_data: AttorneyCreate) -> Dict[str, Any]:
         """Create a single attorney profile"""
         
         # Check for duplicate email
-        if self.email_exists(attorney_data.email):
+        if self._email_taken(attorney_data.email):
             raise ValueError(f"Email already exists: {attorney_data.email}")
         
         # Generate attorney_id
@@ -37,20 +61,115 @@ class AttorneyService:
             "seniority": attorney_data.seniority,
             "years_of_experience": attorney_data.years_of_experience,
             "practice_areas": practice_areas_stored,
+            "practice_area_keys": practice_area_keys(practice_areas_stored),
             "created_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat()
         }
         
-        # Insert into Cosmos DB
-        result = self.db.insert_item(settings.ATTORNEY_CONTAINER, attorney_doc)
+        # Insert into Cosmos DB; the unique key rejects duplicates within the seniority partition
+        try:
+            result = self.db.insert_item(settings.ATTORNEY_CONTAINER, attorney_doc)
+        except exceptions.CosmosResourceExistsError:
+            raise ValueError(f"Email already exists: {attorney_data.email}")
+        self.partition_keys.set(attorney_id, attorney_data.seniority)
+        self._remember_email(attorney_data.email)
+        self._sync_email_filter(data_version.bump(settings.ATTORNEY_CONTAINER))
         return result
     
     def email_exists(self, email: str) -> bool:
         """Check if email already exists"""
-        query = f"SELECT * FROM c WHERE c.email = '{email}'"
-        results = self.db.query_items(settings.ATTORNEY_CONTAINER, query)
+        query, parameters = QueryBuilder("VALUE c.id").where("c.email = @email", email=email).build()
+        results = self.db.query_items(settings.ATTORNEY_CONTAINER, query, parameters)
         return len(results) > 0
     
+    def _email_taken(self, email: str) -> bool:
+        """
+        Duplicate check before an insert
+        
+        Emails absent from an up-to-date Bloom filter are new without a
+        query. Possible matches, and every email while the filter's view may
+        be stale, are confirmed with email_exists.
+        """
+        known_emails = self._current_email_filter()
+        if known_emails is not None and email not in known_emails:
+            return False
+        return self.email_exists(email)
+    
+    async def _existing_emails_async(self, emails: List[str]) -> Set[str]:
+        """
+        Which of the emails are already stored
+        
+        Emails an up-to-date Bloom filter has never seen are skipped; the
+        rest are looked up with concurrent SELECT VALUE c.email ... IN (...) queries
+        of BULK_EMAIL_LOOKUP_CHUNK_SIZE emails each.
+        """
+        candidates = [email for email in emails if email]
+        known_emails = await asyncio.to_thread(self._current_email_filter) if candidates else None
+        if known_emails is not None:
+            candidates = [email for email in candidates if email in known_emails]
+        
+        chunk_size = settings.BULK_EMAIL_LOOKUP_CHUNK_SIZE
+        queries = [
+            QueryBuilder("VALUE c.email").where_in("c.email", "email", candidates[start:start + chunk_size]).build()
+            for start in range(0, len(candidates), chunk_size)
+        ]
+        results = await asyncio.gather(*(
+            self.async_db.query_items(settings.ATTORNEY_CONTAINER, query, parameters)
+            for query, parameters in queries
+        ))
+        return {email for found in results for email in found}
+    
+    def _current_email_filter(self) -> Optional[BloomFilter]:
+        """
+        Bloom filter of stored emails if its view is known to be current
+        
+        The filter is loaded once with a full email projection and then kept
+        up to date: this service adds its own inserts, and writes by other
+        instances (seen as a moved attorney data version) are merged in with
+        a query for emails modified since the last sync. Returns None when
+        writes by other workers cannot be observed (the default per-process
+        CACHE_BACKEND=memory version counters) or the container has no
+        unique key on /email, so callers fall back to a query.
+        """
+        if not data_version.shared or not self.db.attorney_email_unique:
+            return None
+        # A cached version could hide another worker's insert from the filter
+        version = data_version.get(settings.ATTORNEY_CONTAINER, max_age=0)
+        with self._email_filter_lock:
+            if self._email_filter is None:
+                synced_at = time.time()
+                query, parameters = QueryBuilder("VALUE c.email").build()
+                emails = self.db.query_items(settings.ATTORNEY_CONTAINER, query, parameters)
+                self._email_filter = BloomFilter.from_items(
+                    emails,
+                    settings.ATTORNEY_EMAIL_BLOOM_CAPACITY,
+                    settings.ATTORNEY_EMAIL_BLOOM_ERROR_RATE
+                )
+                self._email_filter_version = version
+                self._email_filter_synced_at = synced_at
+            elif self._email_filter_version != version:
+                synced_at = time.time()
+                # _ts has one-second resolution and comes from the server clock
+                since = int(self._email_filter_synced_at - settings.ATTORNEY_EMAIL_SYNC_SKEW_SECONDS)
+                query, parameters = QueryBuilder("VALUE c.email").where("c._ts >= @since", since=since).build()
+                for email in self.db.query_items(settings.ATTORNEY_CONTAINER, query, parameters):
+                    self._email_filter.add(email)
+                self._email_filter_version = version
+                self._email_filter_synced_at = synced_at
+            return self._email_filter
+    
+    def _remember_email(self, email: str):
+        """Add an email this service just stored to the Bloom filter"""
+        with self._email_filter_lock:
+            if self._email_filter is not None:
+                self._email_filter.add(email)
+    
+    def _sync_email_filter(self, version: int):
+        """Advance the Bloom filter's version past our own write; other writes are merged on next use"""
+        with self._email_filter_lock:
+            if self._email_filter_version is not None and self._email_filter_version == version - 1:
+                self._email_filter_version = version
+    
     def get_attorneys(
         self,
         practice_area: Optional[str] = None,
@@ -58,31 +177,199 @@ class AttorneyService:
         min_experience: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get all attorneys with optional filters"""
+        query, parameters = self._build_attorneys_query(practice_area, seniority, min_experience)
+        attorneys = self.db.query_items(settings.ATTORNEY_CONTAINER, query, parameters)
+        self._record_partition_keys(attorneys)
+        return attorneys
+    
+    async def get_attorneys_async(
+        self,
+        practice_area: Optional[str] = None,
+        seniority: Optional[str] = None,
+        min_experience: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Non-blocking variant of get_attorneys"""
+        query, parameters = self._build_attorneys_query(practice_area, seniority, min_experience)
+        attorneys = await self.async_db.query_items(settings.ATTORNEY_CONTAINER, query, parameters)
+        self._record_partition_keys(attorneys)
+        return attorneys
+    
+    def get_attorneys_page(
+        self,
+        practice_area: Optional[str] = None,
+        seniority: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        page_size: int = settings.ATTORNEYS_DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of attorneys with optional filters
+        
+        Walks the seniority partitions in SENIORITY_LEVELS order with
+        single-partition queries, whose Cosmos continuation tokens can be
+        resumed (the SDK has none for cross-partition queries). Without a
+        seniority filter, a last cross-partition pass pages through
+        attorneys whose seniority is missing or outside SENIORITY_LEVELS
+        with ORDER BY c.id OFFSET/LIMIT. The returned continuation encodes
+        the pass and its position; it is None after the last page, and a
+        page is only empty when there are no more results.
         
-        query_parts = ["SELECT * FROM c"]
-        conditions = []
+        Raises:
+            ValueError: if the continuation token is malformed
+        """
+        # None stands for the catch-all pass
+        partitions: List[Optional[str]] = [seniority] if seniority else [*settings.SENIORITY_LEVELS, None]
+        index, token = self._decode_continuation(continuation, len(partitions))
+        query, parameters = self._build_attorneys_query(practice_area, seniority, min_experience)
+        
+        attorneys: List[Dict[str, Any]] = []
+        while index < len(partitions) and len(attorneys) < page_size:
+            limit = page_size - len(attorneys)
+            if partitions[index] is None:
+                offset = self._catch_all_offset(token)
+                # One extra row tells whether another page follows
+                page = self.db.query_items(
+                    settings.ATTORNEY_CONTAINER,
+                    *self._attorneys_query_builder(practice_area, None, min_experience)
+                    .where(
+                        "(NOT IS_DEFINED(c.seniority) OR NOT ARRAY_CONTAINS(@seniority_levels, c.seniority))",
+                        seniority_levels=settings.SENIORITY_LEVELS
+                    )
+                    .order_by("c.id")
+                    .offset_limit(offset, limit + 1)
+                    .build()
+                )
+                token = str(offset + limit) if len(page) > limit else None
+                page = page[:limit]
+            else:
+                # Empty pages that still carry a continuation are followed
+                page, token = self.db.query_page(
+                    settings.ATTORNEY_CONTAINER,
+                    query,
+                    parameters,
+                    page_size=limit,
+                    continuation=token,
+                    partition_key=partitions[index]
+                )
+            attorneys.extend(page)
+            if token is None:
+                index += 1
+        
+        self._record_partition_keys(attorneys)
+        return {
+            "attorneys": attorneys,
+            "continuation": self._encode_continuation(index, token) if index < len(partitions) else None
+        }
+    
+    @staticmethod
+    def _catch_all_offset(token: Optional[str]) -> int:
+        """OFFSET of the catch-all pass encoded in its token"""
+        if token is None:
+            return 0
+        if not token.isdigit():
+            raise ValueError("Invalid continuation token")
+        return int(token)
+    
+    @staticmethod
+    def _encode_continuation(partition_index: int, token: Optional[str]) -> str:
+        state = json.dumps({"partition": partition_index, "token": token}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(state.encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def _decode_continuation(continuation: Optional[str], partitions: int) -> Tuple[int, Optional[str]]:
+        """(partition index, Cosmos continuation token) of a page token"""
+        if not continuation:
+            return 0, None
+        try:
+            state = json.loads(base64.urlsafe_b64decode(continuation.encode("ascii")))
+            index, token = int(state["partition"]), state["token"]
+        except (ValueError, TypeError, KeyError, UnicodeEncodeError):
+            raise ValueError("Invalid continuation token")
+        if not 0 <= index < partitions or not (token is None or isinstance(token, str)):
+            raise ValueError("Invalid continuation token")
+        return index, token
+    
+    @staticmethod
+    def _build_attorneys_query(
+        practice_area: Optional[str] = None,
+        seniority: Optional[str] = None,
+        min_experience: Optional[int] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Build the parameterized attorney listing query for the given filters"""
+        return AttorneyService._attorneys_query_builder(practice_area, seniority, min_experience).build()
+    
+    @staticmethod
+    def _attorneys_query_builder(
+        practice_area: Optional[str] = None,
+        seniority: Optional[str] = None,
+        min_experience: Optional[int] = None
+    ) -> QueryBuilder:
+        """QueryBuilder with the attorney listing filters applied"""
+        builder = QueryBuilder()
         
         if practice_area:
-            conditions.append(f"ARRAY_CONTAINS(c.practice_areas, {{'area': '{practice_area}'}}, true)")
+            builder.where(
+                "ARRAY_CONTAINS(c.practice_area_keys, @practice_area_key)",
+                practice_area_key=normalize_practice_area(practice_area)
+            )
         
         if seniority:
-            conditions.append(f"c.seniority = '{seniority}'")
+            builder.where("c.seniority = @seniority", seniority=seniority)
         
         if min_experience:
-            conditions.append(f"c.years_of_experience >= {min_experience}")
-        
-        if conditions:
-            query_parts.append("WHERE " + " AND ".join(conditions))
+            builder.where("c.years_of_experience >= @min_experience", min_experience=min_experience)
         
-        query = " ".join(query_parts)
-        return self.db.query_items(settings.ATTORNEY_CONTAINER, query)
+        return builder
     
     def get_attorney_by_id(self, attorney_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific attorney by ID"""
-        query = f"SELECT * FROM c WHERE c.attorney_id = '{attorney_id}'"
-        results = self.db.query_items(settings.ATTORNEY_CONTAINER, query)
+        """Get a specific attorney by ID; a point read when its seniority is known"""
+        seniority = self.partition_keys.get(attorney_id)
+        if seniority is not None:
+            attorney = self.db.read_item(settings.ATTORNEY_CONTAINER, attorney_id, seniority)
+            if attorney is not None:
+                return attorney
+            self.partition_keys.forget(attorney_id)
+        
+        query, parameters = QueryBuilder().where("c.attorney_id = @attorney_id", attorney_id=attorney_id).build()
+        results = self.db.query_items(settings.ATTORNEY_CONTAINER, query, parameters)
+        self._record_partition_keys(results)
         return results[0] if results else None
     
+    def _record_partition_keys(self, attorneys: List[Dict[str, Any]]):
+        """Remember the seniority partition of attorneys read from Cosmos"""
+        self.partition_keys.set_many((attorney['id'], attorney.get('seniority')) for attorney in attorneys)
+    
+    def update_attorneys(self, attorney_docs: List[Dict[str, Any]]) -> int:
+        """Replace stored attorney documents, refreshing practice_area_keys; returns how many were written"""
+        updated = 0
+        for attorney_doc in attorney_docs:
+            attorney_doc['practice_area_keys'] = practice_area_keys(attorney_doc.get('practice_areas', []))
+            self.db.update_item(
+                settings.ATTORNEY_CONTAINER,
+                attorney_doc['id'],
+                attorney_doc['seniority'],
+                attorney_doc
+            )
+            updated += 1
+        self._record_partition_keys(attorney_docs)
+        if updated:
+            data_version.bump(settings.ATTORNEY_CONTAINER)
+        return updated
+    
+    def backfill_practice_area_keys(self, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Add or correct practice_area_keys on stored attorneys
+        
+        Returns counts of scanned and updated documents
+        """
+        attorneys = self.db.query_items(settings.ATTORNEY_CONTAINER, *QueryBuilder().build())
+        stale = [
+            attorney for attorney in attorneys
+            if attorney.get('practice_area_keys') != practice_area_keys(attorney.get('practice_areas', []))
+        ]
+        updated = 0 if dry_run else self.update_attorneys(stale)
+        return {"scanned": len(attorneys), "stale": len(stale), "updated": updated}
+    
     def delete_attorney(self, attorney_id: str) -> bool:
         """Delete an attorney profile"""
         attorney = self.get_attorney_by_id(attorney_id)
@@ -94,78 +381,100 @@ class AttorneyService:
             attorney_id,
             attorney['seniority']
         )
+        self.partition_keys.forget(attorney_id)
+        data_version.bump(settings.ATTORNEY_CONTAINER)
         return True
     
-    def bulk_create_attorneys(self, attorneys_data: List[Dict[str, Any]]) -> List[str]:
+    async def bulk_create_attorneys(self, attorneys_data: List[Dict[str, Any]]) -> BulkAttorneyIngestionResult:
         """
         Bulk create attorneys from parsed data
-        Returns list of created attorney IDs
-        Provides detailed feedback on skipped attorneys
+        
+        Duplicate emails, repeated within the batch or already stored, are
+        found up front with a few chunked IN queries. The remaining rows are
+        written concurrently, grouped by seniority partition (see
+        BulkIngestor). Returns one result with the outcome of every row.
         """
-        created_ids = []
-        skipped = []
+        started = time.perf_counter()
+        rows: List[Optional[BulkAttorneyRowResult]] = [None] * len(attorneys_data)
+        documents: List[Dict[str, Any]] = []
+        positions: List[int] = []
         
-        print(f"\n Starting bulk creation of {len(attorneys_data)} attorneys...")
+        # First row with an email wins; later rows repeating it are duplicates
+        first_rows: Dict[str, int] = {}
+        for position, attorney_data in enumerate(attorneys_data):
+            first_rows.setdefault(attorney_data.get('email'), position)
+        existing = await self._existing_emails_async(list(first_rows))
         
-        for idx, attorney_data in enumerate(attorneys_data, 1):
-            email = attorney_data['email']
-            name = attorney_data['name']
+        for position, attorney_data in enumerate(attorneys_data):
+            email = attorney_data.get('email')
+            name = attorney_data.get('name')
             
-            # Skip if email exists
-            if self.email_exists(email):
-                skip_msg = f"  Attorney {idx}/{len(attorneys_data)}: Skipped - Duplicate email: {email} ({name})"
-                print(skip_msg)
-                skipped.append({
-                    "email": email,
-                    "name": name,
-                    "reason": "Duplicate email"
-                })
+            if email in existing:
+                error = "Duplicate email"
+            elif first_rows[email] != position:
+                error = f"Duplicate email in batch (row {first_rows[email] + 1})"
+            else:
+                error = None
+            if error:
+                rows[position] = BulkAttorneyRowResult(
+                    row=position + 1, name=name, email=email, status="duplicate", error=error
+                )
                 continue
             
-            try:
-                attorney_id = f"ATT-{str(uuid.uuid4())[:8].upper()}"
-                
-                practice_areas_stored = [
-                    {
-                        **pa,
-                        "linked_legal_documents": [],
-                        "linked_knowledge_docs": []
-                    } for pa in attorney_data['practice_areas']
-                ]
-                
-                attorney_doc = {
-                    "id": attorney_id,
-                    "attorney_id": attorney_id,
-                    **attorney_data,
-                    "practice_areas": practice_areas_stored,
-                    "created_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                
-                self.db.insert_item(settings.ATTORNEY_CONTAINER, attorney_doc)
-                created_ids.append(attorney_id)
-                print(f"Attorney {idx}/{len(attorneys_data)}: Created - {name} ({email}) - ID: {attorney_id}")
-                
-            except Exception as e:
-                skip_msg = f" Attorney {idx}/{len(attorneys_data)}: Failed - {name} ({email}) - Error: {str(e)}"
-                print(skip_msg)
-                skipped.append({
-                    "email": email,
-                    "name": name,
-                    "reason": str(e)
-                })
-        
-        # Final summary
-        print(f"\n" + "=" * 60)
-        print(f" BULK CREATION SUMMARY")
-        print(f"=" * 60)
-        print(f" Successfully created: {len(created_ids)}")
-        print(f"  Skipped (duplicates): {len(skipped)}")
-        print(f"=" * 60)
-        
-        if skipped:
-            print(f"\n  SKIPPED ATTORNEYS:")
-            for skip in skipped:
-                print(f"   • {skip['name']} ({skip['email']}) - {skip['reason']}")
-        
-        return created_ids
+            attorney_id = f"ATT-{str(uuid.uuid4())[:8].upper()}"
+            practice_areas_stored = [
+                {
+                    **pa,
+                    "linked_legal_documents": [],
+                    "linked_knowledge_docs": []
+                } for pa in attorney_data.get('practice_areas', [])
+            ]
+            documents.append({
+                "id": attorney_id,
+                "attorney_id": attorney_id,
+                **attorney_data,
+                "practice_areas": practice_areas_stored,
+                "practice_area_keys": practice_area_keys(practice_areas_stored),
+                "created_at": datetime.utcnow().isoformat(),
+                "updated_at": datetime.utcnow().isoformat()
+            })
+            positions.append(position)
+        
+        ingestor = BulkIngestor(self.async_db, settings.ATTORNEY_CONTAINER, "seniority")
+        outcomes = await ingestor.create_all(documents)
+        
+        created = []
+        for position, document, outcome in zip(positions, documents, outcomes):
+            status = {"created": "created", "conflict": "duplicate"}.get(outcome['status'], "failed")
+            rows[position] = BulkAttorneyRowResult(
+                row=position + 1,
+                name=document.get('name'),
+                email=document.get('email'),
+                status=status,
+                attorney_id=document['attorney_id'] if status == "created" else None,
+                error="Duplicate email" if status == "duplicate" else outcome['error'],
+                attempts=outcome['attempts']
+            )
+            if status == "created":
+                created.append(document)
+        
+        if created:
+            self.partition_keys.set_many((document['id'], document['seniority']) for document in created)
+            for document in created:
+                self._remember_email(document['email'])
+            self._sync_email_filter(data_version.bump(settings.ATTORNEY_CONTAINER))
+        
+        result = BulkAttorneyIngestionResult(
+            total=len(rows),
+            created=sum(1 for row in rows if row.status == "created"),
+            duplicates=sum(1 for row in rows if row.status == "duplicate"),
+            failed=sum(1 for row in rows if row.status == "failed"),
+            throttle_retries=ingestor.throttle_retries,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            rows=rows
+        )
+        logger.info(
+            "Bulk attorney import: %d rows, %d created, %d duplicates, %d failed in %.0f ms",
+            result.total, result.created, result.duplicates, result.failed, result.duration_ms
+        )
+        return result
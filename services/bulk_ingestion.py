@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+from azure.cosmos import exceptions
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class _PartitionWriter:
+    """Concurrency limit and throttling pause of one logical partition"""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.resume_at = 0.0
+
+    async def wait_if_paused(self):
+        delay = self.resume_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        self.resume_at = max(self.resume_at, asyncio.get_running_loop().time() + seconds)
+
+
+class BulkIngestor:
+    """
+    Concurrent creation of many documents in one container.
+
+    Documents are grouped by partition key and written with async
+    create_item calls, bounded overall and per partition. A 429 that
+    survives the SDK's own retries pauses every writer of that partition
+    for the retry-after the service asked for, then the document is
+    retried. Conflicts (id or unique key) are reported per document
+    rather than raised.
+    """
+
+    def __init__(self, async_db, container_name: str, partition_key_field: str):
+        """
+        Args:
+            async_db: AsyncDatabaseService
+            container_name: Target container
+            partition_key_field: Document field holding the partition key value
+        """
+        self.async_db = async_db
+        self.container_name = container_name
+        self.partition_key_field = partition_key_field
+        self.concurrency = settings.BULK_INGEST_CONCURRENCY
+        self.partition_concurrency = settings.BULK_INGEST_PARTITION_CONCURRENCY
+        self.max_throttle_retries = settings.BULK_INGEST_MAX_THROTTLE_RETRIES
+        self.throttle_retries = 0
+
+    async def create_all(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create every document
+
+        Returns:
+            One outcome per document, in input order: {status, attempts,
+            error} with status created, conflict or failed
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        groups: Dict[Any, List[int]] = {}
+        for position, document in enumerate(documents):
+            groups.setdefault(document.get(self.partition_key_field), []).append(position)
+
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+
+        async def write(position: int, partition: _PartitionWriter):
+            outcomes[position] = await self._create(documents[position], partition, semaphore)
+
+        tasks = []
+        for positions in groups.values():
+            partition = _PartitionWriter(self.partition_concurrency)
+            tasks.extend(write(position, partition) for position in positions)
+        await asyncio.gather(*tasks)
+
+        logger.info(
+            "Bulk ingestion into %s: %d documents in %d partitions, %d throttle retries",
+            self.container_name, len(documents), len(groups), self.throttle_retries
+        )
+        return outcomes
+
+    async def _create(
+        self,
+        document: Dict[str, Any],
+        partition: _PartitionWriter,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        attempts = 0
+        while True:
+            await partition.wait_if_paused()
+            # Partition first, so rows queued behind a busy or paused partition
+            # do not hold global slots that other partitions could use
+            async with partition.semaphore, semaphore:
+                attempts += 1
+                try:
+                    await self.async_db.insert_item(self.container_name, document)
+                    return {"status": "created", "attempts": attempts, "error": None}
+                except exceptions.CosmosResourceExistsError as e:
+                    return {"status": "conflict", "attempts": attempts, "error": e.message}
+                except exceptions.CosmosHttpResponseError as e:
+                    if e.status_code != 429 or attempts > self.max_throttle_retries:
+                        return {"status": "failed", "attempts": attempts, "error": e.message}
+                    retry_after = self._retry_after_seconds(e)
+                except Exception as e:
+                    return {"status": "failed", "attempts": attempts, "error": str(e)}
+            self.throttle_retries += 1
+            partition.pause(retry_after)
+
+    @staticmethod
+    def _retry_after_seconds(error: exceptions.CosmosHttpResponseError) -> float:
+        """Retry-after of a 429 response, or the configured default"""
+        headers = error.response.headers if error.response is not None else {}
+        retry_after_ms = headers.get("x-ms-retry-after-ms")
+        try:
+            return float(retry_after_ms) / 1000
+        except (TypeError, ValueError):
+            return settings.BULK_INGEST_DEFAULT_RETRY_AFTER_SECONDS
@@ -0,0 +1,365 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import json
+import logging
+import sqlite3
+import threading
+import time
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction"""
+
+    # Entries are only visible to the current process
+    shared = False
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float]):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, value), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[key] = (self._expiry(), value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def incr(self, key: str) -> int:
+        """Increment an integer counter (starting from 0) and return it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            value = entry[1] + 1 if entry is not None and entry[0] > time.monotonic() else 1
+            self._entries[key] = (self._expiry(), value)
+            self._entries.move_to_end(key)
+            self._evict()
+            return value
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def _expiry(self) -> float:
+        if self.ttl_seconds is None:
+            return float("inf")
+        return time.monotonic() + self.ttl_seconds
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class SQLiteCache:
+    """
+    Cache in a local SQLite file shared by every worker process on the node.
+
+    Values are stored as JSON. Each namespace is capped at max_entries;
+    inserts beyond that evict the least recently read entries. Reads only
+    note the key in memory; their access times are written in one batch
+    before the next insert, or after CACHE_SQLITE_TOUCH_FLUSH_SECONDS, so a
+    hit costs no write. Hit/miss counters are per process.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, namespace: str, max_entries: int, ttl_seconds: Optional[float]):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (namespace, accessed_at)"
+        )
+        self._conn.commit()
+        # key -> access time of reads not yet written to accessed_at
+        self._touched: Dict[str, float] = {}
+        self._touched_flushed_at = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            self.hits += 1
+            if (
+                len(self._touched) >= self.max_entries
+                or time.monotonic() - self._touched_flushed_at >= settings.CACHE_SQLITE_TOUCH_FLUSH_SECONDS
+            ):
+                self._flush_touched()
+                self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently read entries if full"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), self._expiry(now), now)
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._evict(now)
+            self._conn.commit()
+
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter (starting from 0) and return it"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "INSERT INTO cache_entries (namespace, key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, '1', ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET "
+                "value = CASE WHEN expires_at > excluded.accessed_at "
+                "THEN CAST(value AS INTEGER) + 1 ELSE 1 END, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at "
+                "RETURNING value",
+                (self.namespace, key, self._expiry(now), now)
+            ).fetchone()
+            self._conn.commit()
+        return int(row[0])
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Drop every entry in this namespace"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+            self._touched.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process and the shared size"""
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time())
+            ).fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "path": self.path,
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _expiry(self, now: float) -> float:
+        if self.ttl_seconds is None:
+            return float("inf")
+        return now + self.ttl_seconds
+
+    def _flush_touched(self):
+        """Write the pending read times; the caller commits"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache_entries SET accessed_at = MAX(accessed_at, ?) WHERE namespace = ? AND key = ?",
+                [(accessed_at, self.namespace, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+        self._touched_flushed_at = time.monotonic()
+
+    def _evict(self, now: float):
+        """Delete expired entries, then the least recently read beyond max_entries"""
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?", (self.namespace, now)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries WHERE namespace = ?
+                ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.namespace, self.namespace, self.max_entries)
+        )
+
+
+class RedisCache:
+    """
+    Cache on a Redis-compatible server shared by every worker and node.
+
+    Values are stored as JSON under "<CACHE_KEY_PREFIX>:<namespace>:<key>"
+    with the TTL set on the key; the entry limit is left to the server's
+    maxmemory policy. Requires the optional redis package.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, namespace: str, max_entries: int, ttl_seconds: Optional[float]):
+        import redis
+
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._prefix = f"{settings.CACHE_KEY_PREFIX}:{namespace}:"
+        self._client = redis.Redis.from_url(url, socket_timeout=settings.CACHE_REDIS_TIMEOUT_SECONDS)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        try:
+            raw = self._client.get(self._prefix + key)
+        except Exception as e:
+            logger.warning("Redis cache read failed: %s", e)
+            raw = None
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any):
+        """Store a value with the namespace TTL"""
+        ttl = int(self.ttl_seconds) if self.ttl_seconds is not None else None
+        try:
+            self._client.set(self._prefix + key, json.dumps(value), ex=ttl)
+        except Exception as e:
+            logger.warning("Redis cache write failed: %s", e)
+
+    def incr(self, key: str) -> int:
+        """
+        Atomically increment an integer counter (starting from 0) and return it
+
+        Returns 0 when the server cannot be reached.
+        """
+        try:
+            return int(self._client.incr(self._prefix + key))
+        except Exception as e:
+            logger.warning("Redis counter increment failed: %s", e)
+            return 0
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        try:
+            self._client.delete(self._prefix + key)
+        except Exception as e:
+            logger.warning("Redis cache delete failed: %s", e)
+
+    def clear(self):
+        """Drop every entry in this namespace"""
+        try:
+            keys = list(self._client.scan_iter(match=self._prefix + "*", count=500))
+            for start in range(0, len(keys), 500):
+                self._client.delete(*keys[start:start + 500])
+        except Exception as e:
+            logger.warning("Redis cache clear failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis",
+                "size": None,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def create_cache(namespace: str, max_entries: int, ttl_seconds: Optional[float]):
+    """
+    Cache selected by CACHE_BACKEND ("memory", "sqlite" or "redis")
+
+    Shared backends must hold JSON-serializable values. A shared backend
+    that cannot be opened falls back to an in-process LRU cache.
+    """
+    backend = settings.CACHE_BACKEND
+    try:
+        if backend == "sqlite":
+            return SQLiteCache(settings.CACHE_SQLITE_PATH, namespace, max_entries, ttl_seconds)
+        if backend == "redis":
+            return RedisCache(settings.CACHE_REDIS_URL, namespace, max_entries, ttl_seconds)
+    except Exception as e:
+        logger.error("Could not open %s cache for %s, using in-process cache: %s", backend, namespace, e)
+    return LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
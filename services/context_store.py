@@ -0,0 +1,177 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import threading
+import time
+from config import settings
+from services.cache_backend import LRUCache, create_cache
+from services.data_version import data_version
+from utils.practice_areas import normalize_practice_area
+
+logger = logging.getLogger(__name__)
+
+class PracticeAreaContextStore:
+    """
+    In-memory snapshots of the retrieval context for each practice area.
+
+    The search query and public-source lookups in the risk pipeline depend
+    only on the practice area, so their results are precomputed here and
+    served from memory, keyed by normalized practice area. A background
+    task refreshes the configured practice areas
+    (settings.PRACTICE_AREA_RISK_AREAS) on a schedule, and as soon as the
+    public-source data changes. Other practice areas seen on the request
+    path are kept in a bounded LRU until they expire or the public-source
+    data version changes, and are never refreshed in the background. With a shared CACHE_BACKEND, snapshots are
+    also written there so a worker can serve context another worker has
+    already loaded.
+    """
+
+    def __init__(self, loader: Callable[[str], Awaitable[Dict[str, Any]]]):
+        """
+        Args:
+            loader: Coroutine returning {'rag_context', 'public_sources',
+                'complete'} for a practice area
+        """
+        self.loader = loader
+        self.enabled = settings.RISK_CONTEXT_STORE_ENABLED
+        self.refresh_seconds = settings.RISK_CONTEXT_REFRESH_SECONDS
+        self.max_age_seconds = settings.RISK_CONTEXT_MAX_AGE_SECONDS
+        self.poll_seconds = settings.RISK_CONTEXT_CHANGE_POLL_SECONDS
+
+        # Configured practice areas by key; only these are refreshed
+        self._configured = {normalize_practice_area(area): area for area in settings.PRACTICE_AREA_RISK_AREAS}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._discovered = LRUCache(settings.RISK_CONTEXT_DISCOVERED_MAX_ENTRIES, self.max_age_seconds)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        shared = create_cache(
+            "practice_area_context",
+            max_entries=settings.RISK_CONTEXT_SHARED_MAX_ENTRIES,
+            ttl_seconds=self.max_age_seconds
+        )
+        self._shared = shared if shared.shared else None
+
+    def get(self, practice_area: str) -> Optional[Dict[str, Any]]:
+        """Return the stored context for a practice area if it is fresh enough"""
+        if not self.enabled:
+            return None
+        key = normalize_practice_area(practice_area)
+        snapshot = self._local(key)
+        if snapshot is None or self._is_stale(key, snapshot):
+            snapshot = self._shared.get(key) if self._shared is not None else None
+            if snapshot is None or self._is_stale(key, snapshot):
+                return None
+            self._store_local(key, snapshot)
+        return snapshot
+
+    def put(self, practice_area: str, context: Dict[str, Any]):
+        """Store freshly retrieved context for a practice area"""
+        if not self.enabled:
+            return
+        snapshot = {
+            "rag_context": context['rag_context'],
+            "public_sources": context['public_sources'],
+            "refreshed_at": time.time(),
+            "data_version": data_version.get(settings.PUBLIC_DATA_CONTAINER)
+        }
+        key = normalize_practice_area(practice_area)
+        self._store_local(key, snapshot)
+        if self._shared is not None:
+            self._shared.set(key, snapshot)
+
+    def known_practice_areas(self) -> List[str]:
+        """Configured practice areas, the ones refreshed in the background"""
+        return sorted(self._configured.values())
+
+    async def refresh_all(self):
+        """Reload the context of every configured practice area"""
+        practice_areas = self.known_practice_areas()
+        slots = asyncio.Semaphore(settings.RISK_CONTEXT_REFRESH_CONCURRENCY)
+        started = time.monotonic()
+
+        async def refresh(practice_area: str) -> bool:
+            async with slots:
+                try:
+                    context = await self.loader(practice_area)
+                except Exception as e:
+                    logger.error("Context refresh for '%s' failed: %s", practice_area, e)
+                    return False
+            if not context.get('complete'):
+                logger.warning("Context refresh for '%s' incomplete, keeping previous snapshot", practice_area)
+                return False
+            self.put(practice_area, context)
+            return True
+
+        results = await asyncio.gather(*[refresh(area) for area in practice_areas])
+        logger.info(
+            "Refreshed context for %d/%d practice areas in %.2fs",
+            sum(results), len(practice_areas), time.monotonic() - started
+        )
+
+    def start(self):
+        """Start the background refresh task on the running event loop"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Cancel the background refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Age of each configured snapshot and the size of the request-path LRU"""
+        now = time.time()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "practice_areas": {
+                    area: round(now - snapshot['refreshed_at'], 1)
+                    for area, snapshot in self._snapshots.items()
+                },
+                "discovered": self._discovered.stats()
+            }
+
+    def _local(self, key: str) -> Optional[Dict[str, Any]]:
+        if key in self._configured:
+            with self._lock:
+                return self._snapshots.get(key)
+        return self._discovered.get(key)
+
+    def _store_local(self, key: str, snapshot: Dict[str, Any]):
+        if key in self._configured:
+            with self._lock:
+                self._snapshots[key] = snapshot
+        else:
+            self._discovered.set(key, snapshot)
+
+    def _is_stale(self, key: str, snapshot: Dict[str, Any]) -> bool:
+        if time.time() - snapshot['refreshed_at'] > self.max_age_seconds:
+            return True
+        # Configured areas keep serving until the refresh replaces them;
+        # discovered ones are not refreshed, so a data change invalidates them
+        return (
+            key not in self._configured
+            and snapshot.get('data_version') != data_version.get(settings.PUBLIC_DATA_CONTAINER)
+        )
+
+    async def _refresh_loop(self):
+        """Refresh on schedule, or early when public sources change"""
+        last_version = None
+        last_refresh = float("-inf")
+        while True:
+            version = data_version.get(settings.PUBLIC_DATA_CONTAINER)
+            due = time.monotonic() - last_refresh >= self.refresh_seconds
+            if due or version != last_version:
+                try:
+                    await self.refresh_all()
+                except Exception as e:
+                    logger.error("Context store refresh failed: %s", e)
+                last_version = version
+                last_refresh = time.monotonic()
+            await asyncio.sleep(self.poll_seconds)
@@ -0,0 +1,81 @@
+from typing import Dict, Optional, Tuple
+import threading
+import time
+from config import settings
+from services.cache_backend import create_cache
+
+class DataVersionTracker:
+    """
+    Monotonic version counters for the attorney and public-source data.
+
+    Services bump the counter for a container whenever they write to it.
+    Caches fold the combined stamp into their keys so that any write makes
+    previously cached results unreachable. With a shared CACHE_BACKEND the
+    counters live in that backend, so a write handled by one worker
+    invalidates the entries every worker shares; each process re-reads them
+    at most every DATA_VERSION_CACHE_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._containers = [settings.ATTORNEY_CONTAINER, settings.PUBLIC_DATA_CONTAINER]
+        self._versions: Dict[str, int] = {name: 0 for name in self._containers}
+        self._shared = None
+        # container -> (read at, version) of the shared counters
+        self._read: Dict[str, Tuple[float, int]] = {}
+        if settings.CACHE_BACKEND != "memory":
+            shared = create_cache("data_version", max_entries=len(self._containers) * 8, ttl_seconds=None)
+            self._shared = shared if shared.shared else None
+
+    @property
+    def shared(self) -> bool:
+        """Whether writes by other worker processes are visible"""
+        return self._shared is not None
+
+    def bump(self, container_name: str) -> int:
+        """Record a write to a container and return its new version"""
+        with self._lock:
+            if self._shared is not None:
+                self._versions.setdefault(container_name, 0)
+                version = self._shared.incr(container_name)
+                if version:
+                    self._read[container_name] = (time.monotonic(), version)
+                else:
+                    self._read.pop(container_name, None)
+                return version
+            self._versions[container_name] = self._versions.get(container_name, 0) + 1
+            return self._versions[container_name]
+
+    def get(self, container_name: str, max_age: Optional[float] = None) -> int:
+        """
+        Current version of a single container
+
+        Args:
+            max_age: Seconds a shared version read earlier may be reused;
+                defaults to DATA_VERSION_CACHE_SECONDS, 0 reads it now
+        """
+        if self._shared is not None:
+            max_age = settings.DATA_VERSION_CACHE_SECONDS if max_age is None else max_age
+            with self._lock:
+                read = self._read.get(container_name)
+            if read is not None and time.monotonic() - read[0] < max_age:
+                return read[1]
+            version = self._shared.get(container_name) or 0
+            with self._lock:
+                # A concurrent bump may have stored a newer version meanwhile
+                read = self._read.get(container_name)
+                if read is not None and read[1] > version:
+                    version = read[1]
+                self._read[container_name] = (time.monotonic(), version)
+            return version
+        with self._lock:
+            return self._versions.get(container_name, 0)
+
+    def stamp(self) -> str:
+        """Combined version stamp of all tracked containers"""
+        with self._lock:
+            names = sorted(set(self._containers) | set(self._versions))
+        return "|".join(f"{name}:{self.get(name)}" for name in names)
+
+# Shared tracker for all services in the process
+data_version = DataVersionTracker()
@@ -1,7 +1,71 @@
 from azure.cosmos import CosmosClient, PartitionKey, exceptions
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import logging
 from config import settings
 
+logger = logging.getLogger(__name__)
+
+class QueryBuilder:
+    """
+    Builds parameterized Cosmos DB SQL.
+
+    Filter values are passed as @parameters instead of being interpolated, so
+    the query text depends only on which filters are set: the gateway can
+    reuse the query plan across values, and quotes in a value cannot break
+    the query.
+
+        query, parameters = (
+            QueryBuilder()
+            .where("c.email = @email", email=email)
+            .build()
+        )
+    """
+
+    def __init__(self, select: str = "*"):
+        self.select = select
+        self.conditions: List[str] = []
+        self.parameters: Dict[str, Any] = {}
+        self.order: Optional[str] = None
+        self.paged = False
+
+    def where(self, condition: str, **params) -> "QueryBuilder":
+        """Add an AND condition; its @names are bound from params"""
+        for name, value in params.items():
+            if name in self.parameters and self.parameters[name] != value:
+                raise ValueError(f"Query parameter @{name} bound twice")
+            self.parameters[name] = value
+        self.conditions.append(condition)
+        return self
+
+    def where_in(self, expression: str, name: str, values: List[Any]) -> "QueryBuilder":
+        """Add an AND "expression IN (@name0, @name1, ...)" condition"""
+        names = [f"{name}{index}" for index in range(len(values))]
+        placeholders = ", ".join(f"@{param}" for param in names)
+        return self.where(f"{expression} IN ({placeholders})", **dict(zip(names, values)))
+
+    def order_by(self, expression: str) -> "QueryBuilder":
+        """Sort the results by an expression such as c.id"""
+        self.order = expression
+        return self
+
+    def offset_limit(self, offset: int, limit: int) -> "QueryBuilder":
+        """Skip offset results and return at most limit"""
+        self.parameters.update(offset=offset, limit=limit)
+        self.paged = True
+        return self
+
+    def build(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """(query, parameters) for query_items"""
+        query = f"SELECT {self.select} FROM c"
+        if self.conditions:
+            query += " WHERE " + " AND ".join(self.conditions)
+        if self.order:
+            query += f" ORDER BY {self.order}"
+        if self.paged:
+            query += " OFFSET @offset LIMIT @limit"
+        parameters = [{"name": f"@{name}", "value": value} for name, value in self.parameters.items()]
+        return query, parameters
+
 class DatabaseService:
     _instance = None
     
@@ -19,10 +83,15 @@ class DatabaseService:
         self.database = self.client.get_database_client(settings.COSMOS_DATABASE)
         
         # Initialize containers
+        # Unique keys are scoped to a logical partition, so this only rejects
+        # a repeated email within one seniority; AttorneyService checks the
+        # other partitions before inserting
         self.attorney_container = self._get_or_create_container(
             settings.ATTORNEY_CONTAINER,
-            partition_key=PartitionKey(path="/seniority")
+            partition_key=PartitionKey(path="/seniority"),
+            unique_key_policy={"uniqueKeys": [{"paths": ["/email"]}]}
         )
+        self.attorney_email_unique = self._has_unique_key(self.attorney_container, "/email")
         
         self.public_data_container = self._get_or_create_container(
             settings.PUBLIC_DATA_CONTAINER,
@@ -31,15 +100,32 @@ class DatabaseService:
         
         self._initialized = True
     
-    def _get_or_create_container(self, container_name: str, partition_key):
+    def _get_or_create_container(self, container_name: str, partition_key, unique_key_policy: Dict[str, Any] = None):
         """Get existing container or create new one"""
+        return self.database.create_container_if_not_exists(
+            id=container_name,
+            partition_key=partition_key,
+            unique_key_policy=unique_key_policy
+        )
+    
+    @staticmethod
+    def _has_unique_key(container, path: str) -> bool:
+        """Whether the container has a unique key policy on a single path"""
         try:
-            return self.database.get_container_client(container_name)
-        except exceptions.CosmosResourceNotFoundError:
-            return self.database.create_container(
-                id=container_name,
-                partition_key=partition_key
-            )
+            properties = container.read()
+        except exceptions.CosmosHttpResponseError as e:
+            logger.warning("Could not read the unique key policy of %s: %s", container.id, e)
+            return False
+        unique_keys = (properties.get("uniqueKeyPolicy") or {}).get("uniqueKeys", [])
+        if any(key.get("paths") == [path] for key in unique_keys):
+            return True
+        # Unique keys can only be set when a container is created
+        logger.warning(
+            "Container %s has no unique key on %s; recreate it to add one. "
+            "Duplicates are checked with a query before each insert until then",
+            container.id, path
+        )
+        return False
     
     def insert_item(self, container_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
         """Insert item into container"""
@@ -56,6 +142,44 @@ class DatabaseService:
         )
         return list(items)
     
+    def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: List = None,
+        page_size: int = 100,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of at most page_size query results
+        
+        Returns (items, continuation); continuation is None once the results
+        are exhausted. Continuation tokens are only resumable for queries
+        scoped to a partition_key.
+        """
+        container = self._get_container(container_name)
+        scope = {"partition_key": partition_key} if partition_key is not None else {"enable_cross_partition_query": True}
+        pages = container.query_items(
+            query=query,
+            parameters=parameters or [],
+            max_item_count=page_size,
+            **scope
+        ).by_page(continuation)
+        try:
+            items = list(next(pages))
+        except StopIteration:
+            return [], None
+        return items, pages.continuation_token
+    
+    def read_item(self, container_name: str, item_id: str, partition_key: str) -> Optional[Dict[str, Any]]:
+        """Point read of one item; None if it does not exist in that partition"""
+        container = self._get_container(container_name)
+        try:
+            return container.read_item(item=item_id, partition_key=partition_key)
+        except exceptions.CosmosResourceNotFoundError:
+            return None
+    
     def update_item(self, container_name: str, item_id: str, partition_key: str, item: Dict[str, Any]) -> Dict[str, Any]:
         """Update item in container"""
         container = self._get_container(container_name)
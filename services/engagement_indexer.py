@@ -0,0 +1,213 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import re
+from config import settings
+from utils.practice_areas import normalize_practice_area
+
+logger = logging.getLogger(__name__)
+
+ATTORNEY_ID_PATTERN = re.compile(r'ATT-[A-Z0-9]{8}')
+
+# Blobs the search indexer may have skipped but that can be read as text
+TEXT_EXTENSIONS = (".txt", ".csv", ".json", ".md")
+
+class EngagementIndexer:
+    """
+    Offline index of historical engagements per attorney.
+
+    Scans every document in the Historical search index and the
+    attorney-history blob container once, extracts the attorney IDs and
+    practice areas each document mentions, and writes the result back onto
+    the attorney profiles: linked_legal_documents on each practice area,
+    plus an "engagement" summary (matter count, last engagement, per-area
+    counts and recent matters). Attorney matching reads these features
+    instead of scanning search hits on every request.
+    """
+
+    def __init__(self, ai_search, attorney_service, history_container):
+        """
+        Args:
+            ai_search: AISearchService for the Historical index
+            attorney_service: AttorneyService used to read and update profiles
+            history_container: ContainerClient of the attorney-history container
+        """
+        self.ai_search = ai_search
+        self.attorney_service = attorney_service
+        self.history_container = history_container
+        self.max_linked_documents = settings.ENGAGEMENT_MAX_LINKED_DOCUMENTS
+        self.max_recent_matters = settings.ENGAGEMENT_MAX_RECENT_MATTERS
+
+    def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Scan all history, rebuild the engagement table and update attorneys"""
+        attorneys = self.attorney_service.get_attorneys()
+        area_pattern = self._practice_area_pattern(attorneys)
+
+        documents = self.collect_documents()
+        table, links, unknown_ids = self.build_table(documents, area_pattern)
+
+        known_ids = {attorney['attorney_id'] for attorney in attorneys}
+        changed = self.apply(attorneys, table, links)
+        updated = 0
+        if changed and not dry_run:
+            updated = self.attorney_service.update_attorneys(changed)
+
+        summary = {
+            "documents": len(documents),
+            "documents_with_attorneys": sum(1 for doc in documents if doc['attorney_ids']),
+            "attorneys_with_engagements": len(known_ids & set(table)),
+            "unknown_attorney_ids": sorted(unknown_ids - known_ids),
+            "attorneys_changed": len(changed),
+            "attorneys_updated": updated,
+            "dry_run": dry_run
+        }
+        logger.info("Engagement index: %s", {k: v for k, v in summary.items() if k != "unknown_attorney_ids"})
+        return {"summary": summary, "table": table}
+
+    def collect_documents(self) -> List[Dict[str, Any]]:
+        """
+        One entry per history document: {name, content, modified_at}
+
+        Text comes from the search index; blobs missing from the index are
+        read directly when they are plain text.
+        """
+        blobs = {
+            blob.name: blob for blob in self.history_container.list_blobs()
+        }
+        by_file_name = {name.split("/")[-1]: name for name in blobs}
+
+        documents: Dict[str, Dict[str, Any]] = {}
+        for doc in self.ai_search.iter_historical_documents():
+            name = by_file_name.get(doc['source'], doc['source'])
+            blob = blobs.get(name)
+            documents[name] = {
+                "name": name,
+                "content": doc['content'] or "",
+                "modified_at": blob.last_modified.isoformat() if blob is not None and blob.last_modified else None
+            }
+
+        skipped = 0
+        for name, blob in blobs.items():
+            if name in documents:
+                continue
+            if not name.lower().endswith(TEXT_EXTENSIONS) or blob.size > settings.ENGAGEMENT_MAX_BLOB_BYTES:
+                skipped += 1
+                continue
+            content = self.history_container.download_blob(name).readall().decode("utf-8", errors="ignore")
+            documents[name] = {
+                "name": name,
+                "content": content,
+                "modified_at": blob.last_modified.isoformat() if blob.last_modified else None
+            }
+
+        if skipped:
+            logger.warning("%d attorney-history blobs are neither indexed nor plain text; skipped", skipped)
+        return list(documents.values())
+
+    def build_table(
+        self,
+        documents: List[Dict[str, Any]],
+        area_pattern: Optional[re.Pattern]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, List[str]]], Set[str]]:
+        """
+        Per-attorney engagement summaries and per-practice-area document links
+
+        Returns:
+            (table, links, attorney_ids) where links maps attorney ID ->
+            practice area key -> document names, most recent first
+        """
+        # Most recent first; undated documents last
+        ordered = sorted(documents, key=lambda doc: doc['modified_at'] or "", reverse=True)
+
+        table: Dict[str, Dict[str, Any]] = {}
+        links: Dict[str, Dict[str, List[str]]] = {}
+        seen_ids: Set[str] = set()
+        for doc in ordered:
+            attorney_ids = set(ATTORNEY_ID_PATTERN.findall(doc['content']))
+            doc['attorney_ids'] = attorney_ids
+            if not attorney_ids:
+                continue
+            areas = self._practice_areas(doc['content'], area_pattern)
+            seen_ids |= attorney_ids
+
+            for attorney_id in attorney_ids:
+                entry = table.setdefault(attorney_id, {
+                    "matter_count": 0,
+                    "last_engaged_at": doc['modified_at'],
+                    "practice_area_counts": {},
+                    "recent_matters": []
+                })
+                entry['matter_count'] += 1
+                if len(entry['recent_matters']) < self.max_recent_matters:
+                    entry['recent_matters'].append(doc['name'])
+                for area in areas:
+                    entry['practice_area_counts'][area] = entry['practice_area_counts'].get(area, 0) + 1
+                    linked = links.setdefault(attorney_id, {}).setdefault(area, [])
+                    if len(linked) < self.max_linked_documents:
+                        linked.append(doc['name'])
+        return table, links, seen_ids
+
+    def apply(
+        self,
+        attorneys: List[Dict[str, Any]],
+        table: Dict[str, Dict[str, Any]],
+        links: Dict[str, Dict[str, List[str]]]
+    ) -> List[Dict[str, Any]]:
+        """Attorney documents whose engagement features changed, updated in place"""
+        indexed_at = datetime.utcnow().isoformat()
+        changed = []
+        for attorney in attorneys:
+            attorney_id = attorney['attorney_id']
+            engagement = table.get(attorney_id, {
+                "matter_count": 0,
+                "last_engaged_at": None,
+                "practice_area_counts": {},
+                "recent_matters": []
+            })
+            practice_areas = [
+                {
+                    **pa,
+                    "linked_legal_documents": links.get(attorney_id, {}).get(normalize_practice_area(pa['area']), [])
+                }
+                for pa in attorney.get('practice_areas', [])
+            ]
+
+            previous = {k: v for k, v in (attorney.get('engagement') or {}).items() if k != "indexed_at"}
+            if previous == engagement and practice_areas == attorney.get('practice_areas', []):
+                continue
+
+            attorney['practice_areas'] = practice_areas
+            attorney['engagement'] = {**engagement, "indexed_at": indexed_at}
+            attorney['updated_at'] = indexed_at
+            changed.append(attorney)
+        return changed
+
+    @staticmethod
+    def _practice_area_pattern(attorneys: Iterable[Dict[str, Any]]) -> Optional[re.Pattern]:
+        """
+        Case-insensitive pattern over every known practice area name and
+        synonym; "&" and "and" are interchangeable
+        """
+        names = set(settings.PRACTICE_AREA_RISK_AREAS.keys()) | set(settings.PRACTICE_AREA_SYNONYMS.keys())
+        for attorney in attorneys:
+            names.update(pa['area'] for pa in attorney.get('practice_areas', []))
+
+        alternatives = set()
+        for name in names:
+            words = re.findall(r"\w+|&", name)
+            if words:
+                alternatives.add(r"[\W_]*".join(
+                    "(?:and|&)" if word.casefold() in ("and", "&") else re.escape(word) for word in words
+                ))
+        if not alternatives:
+            return None
+        # Longest first so "Corporate M&A" wins over "Corporate"
+        ordered = sorted(alternatives, key=len, reverse=True)
+        return re.compile(r"(?<!\w)(" + "|".join(ordered) + r")(?!\w)", re.IGNORECASE)
+
+    @staticmethod
+    def _practice_areas(content: str, pattern: Optional[re.Pattern]) -> Set[str]:
+        """Keys of the practice areas mentioned in the text"""
+        if pattern is None:
+            return set()
+        return {normalize_practice_area(match) for match in pattern.findall(content)}
@@ -0,0 +1,261 @@
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import sqlite3
+import threading
+import time
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states are picked up again once their lease expires
+UNFINISHED_STATUSES = ("queued", "running")
+
+class InMemoryJobStore:
+    """
+    Job records held in process memory; lost on restart
+
+    Implements the same owner and lease semantics as SQLiteJobStore.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any], owner: str, lease_seconds: float):
+        """Insert a new job record leased to the submitting worker"""
+        now = time.time()
+        with self._lock:
+            self._jobs[job['job_id']] = {
+                "record": json.loads(json.dumps(job)),
+                "owner": owner,
+                "lease_until": now + lease_seconds,
+                "expires_at": now + self.ttl_seconds
+            }
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job record, or None if it is unknown or expired"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry['expires_at'] < time.time():
+                return None
+            return json.loads(json.dumps(entry['record']))
+
+    def update(self, job_id: str, **fields):
+        """Merge fields into a job record and extend its TTL"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is not None:
+                entry['record'].update(json.loads(json.dumps(fields)))
+                entry['expires_at'] = time.time() + self.ttl_seconds
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Mark a queued job, or a running one whose lease expired, as running for owner"""
+        now = time.time()
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry['expires_at'] < now or not self._claimable(entry, now):
+                return None
+            entry['record']['status'] = "running"
+            entry.update(owner=owner, lease_until=now + lease_seconds)
+            return json.loads(json.dumps(entry['record']))
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a job owner still holds"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry['owner'] != owner:
+                return False
+            entry['lease_until'] = time.time() + lease_seconds
+            return True
+
+    def recover_expired(self, owner: str, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Take over unfinished jobs whose lease expired, requeued for owner, oldest first"""
+        now = time.time()
+        recovered = []
+        with self._lock:
+            for entry in self._jobs.values():
+                record = entry['record']
+                if (entry['expires_at'] >= now and record['status'] in UNFINISHED_STATUSES
+                        and entry['lease_until'] < now):
+                    record['status'] = "queued"
+                    entry.update(owner=owner, lease_until=now + lease_seconds)
+                    recovered.append(json.loads(json.dumps(record)))
+        return sorted(recovered, key=lambda job: job.get('created_at') or "")
+
+    def purge_expired(self) -> int:
+        """Delete expired jobs and return how many were removed"""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job['expires_at'] < now]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def close(self):
+        """Nothing to release"""
+
+    @staticmethod
+    def _claimable(entry: Dict[str, Any], now: float) -> bool:
+        status = entry['record']['status']
+        return status == "queued" or (status == "running" and entry['lease_until'] < now)
+
+
+class SQLiteJobStore:
+    """
+    Job records in a local SQLite file, so queued and finished jobs survive
+    a process restart. Each record is stored as JSON next to the columns
+    used for lookups and expiry.
+
+    Several worker processes may share the file. A worker runs a job only
+    after claiming it with a single conditional UPDATE, and keeps a lease
+    on it while it runs; jobs are recovered by another worker only once
+    their lease has expired.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS risk_jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                record TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                owner TEXT,
+                lease_until REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        # Stores created before leases were added
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(risk_jobs)")}
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE risk_jobs ADD COLUMN owner TEXT")
+            self._conn.execute("ALTER TABLE risk_jobs ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_risk_jobs_status ON risk_jobs (status)")
+        self._conn.commit()
+        logger.info("Risk job store: %s", path)
+
+    def create(self, job: Dict[str, Any], owner: str, lease_seconds: float):
+        """Insert a new job record leased to the submitting worker"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO risk_jobs (job_id, status, record, expires_at, owner, lease_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job['job_id'], job['status'], json.dumps(job), now + self.ttl_seconds, owner, now + lease_seconds)
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job record, or None if it is unknown or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM risk_jobs WHERE job_id = ? AND expires_at >= ?",
+                (job_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, job_id: str, **fields):
+        """Merge fields into a job record and extend its TTL"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM risk_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return
+            job = {**json.loads(row[0]), **fields}
+            self._conn.execute(
+                "UPDATE risk_jobs SET status = ?, record = ?, expires_at = ? WHERE job_id = ?",
+                (job['status'], json.dumps(job), time.time() + self.ttl_seconds, job_id)
+            )
+            self._conn.commit()
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Mark a queued job, or a running one whose lease expired, as running
+        for owner
+
+        Returns the job record, or None when another worker holds the job or
+        it has finished or expired.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE risk_jobs
+                SET status = 'running', record = json_set(record, '$.status', 'running'),
+                    owner = ?, lease_until = ?
+                WHERE job_id = ? AND expires_at >= ?
+                  AND (status = 'queued' OR (status = 'running' AND lease_until < ?))
+                """,
+                (owner, now + lease_seconds, job_id, now, now)
+            )
+            self._conn.commit()
+        return self.get(job_id) if cursor.rowcount else None
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a job owner still holds"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE risk_jobs SET lease_until = ? WHERE job_id = ? AND owner = ?",
+                (time.time() + lease_seconds, job_id, owner)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def recover_expired(self, owner: str, lease_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Take over unfinished jobs whose lease expired, requeued for owner
+
+        Each job is taken with its own conditional UPDATE, so two workers
+        recovering at once never both get it. Returned oldest first.
+        """
+        placeholders = ", ".join("?" for _ in UNFINISHED_STATUSES)
+        now = time.time()
+        recovered = []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id FROM risk_jobs WHERE status IN ({placeholders}) "
+                "AND lease_until < ? AND expires_at >= ?",
+                (*UNFINISHED_STATUSES, now, now)
+            ).fetchall()
+            for (job_id,) in rows:
+                cursor = self._conn.execute(
+                    f"""
+                    UPDATE risk_jobs
+                    SET status = 'queued', record = json_set(record, '$.status', 'queued'),
+                        owner = ?, lease_until = ?
+                    WHERE job_id = ? AND status IN ({placeholders}) AND lease_until < ?
+                    """,
+                    (owner, now + lease_seconds, job_id, *UNFINISHED_STATUSES, now)
+                )
+                if cursor.rowcount:
+                    row = self._conn.execute("SELECT record FROM risk_jobs WHERE job_id = ?", (job_id,)).fetchone()
+                    recovered.append(json.loads(row[0]))
+            self._conn.commit()
+        return sorted(recovered, key=lambda job: job.get('created_at') or "")
+
+    def purge_expired(self) -> int:
+        """Delete expired jobs and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM risk_jobs WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def create_job_store():
+    """Job store selected by RISK_JOB_STORE ("sqlite" or "memory")"""
+    if settings.RISK_JOB_STORE == "sqlite":
+        return SQLiteJobStore(settings.RISK_JOB_DB_PATH, settings.RISK_JOB_TTL_SECONDS)
+    return InMemoryJobStore(settings.RISK_JOB_TTL_SECONDS)
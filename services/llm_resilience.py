@@ -0,0 +1,274 @@
+from collections import deque
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import threading
+import time
+from config import settings
+from services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """The LLM circuit breaker is open and the call was not attempted"""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """No LLM attempt succeeded before the per-call deadline"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after failure_threshold consecutive failed calls. After
+    reset_seconds a single trial call is let through (half-open); its
+    outcome closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """A call succeeded"""
+        with self._lock:
+            if self.state != "closed":
+                logger.info("LLM circuit breaker closed")
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_abandoned(self):
+        """A call was given up by its caller before its outcome was known"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """A call failed or missed its deadline"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(
+                        "LLM circuit breaker opened after %d consecutive failures",
+                        self.consecutive_failures
+                    )
+                    metrics.increment("llm_circuit_opened")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current breaker state"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_seconds": self.reset_seconds
+            }
+
+
+class ResilientLLMClient:
+    """
+    Deadline, hedging and circuit breaking around the async Azure OpenAI
+    chat completion client.
+
+    Each call must succeed within LLM_CALL_DEADLINE_SECONDS. When hedging
+    is enabled and the first attempt has not answered after the recent
+    p95 latency, a second identical request is sent and whichever succeeds
+    first wins. A failed first attempt triggers the hedge immediately.
+    Calls are rejected with CircuitOpenError while the breaker is open.
+
+    Streamed calls (stream=True) are not hedged and their latency is kept
+    out of the hedge window. The returned iterator enforces
+    LLM_STREAM_DEADLINE_SECONDS over the whole response, and the breaker
+    records the outcome once the stream ends or fails.
+    """
+
+    def __init__(self, async_client):
+        self.async_client = async_client
+        self.deadline_seconds = settings.LLM_CALL_DEADLINE_SECONDS
+        self.stream_deadline_seconds = settings.LLM_STREAM_DEADLINE_SECONDS
+        self.hedge_enabled = settings.LLM_HEDGE_ENABLED
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+        )
+        self._latencies = deque(maxlen=settings.LLM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging is off"""
+        if not self.hedge_enabled:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(settings.LLM_HEDGE_PERCENTILE * len(samples)))
+        return max(samples[index], settings.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    async def complete_async(self, hedge: bool = True, **kwargs) -> Any:
+        """
+        chat.completions.create with deadline and hedging
+
+        With stream=True the result is a GuardedStream of chunks.
+
+        Raises:
+            CircuitOpenError: the breaker is open
+            LLMDeadlineExceeded: nothing succeeded before the deadline
+        """
+        self._admit()
+        stream = kwargs.get("stream", False)
+        deadline = self.stream_deadline_seconds if stream else self.deadline_seconds
+        kwargs.setdefault("timeout", deadline)
+        started = time.monotonic()
+        delay = self.hedge_delay() if hedge and not stream else None
+
+        def attempt():
+            return asyncio.ensure_future(self.async_client.chat.completions.create(**kwargs))
+
+        first = attempt()
+        pending, hedged, error = {first}, False, None
+        try:
+            while True:
+                remaining = started + deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                timeout = remaining
+                if delay is not None and not hedged:
+                    timeout = min(remaining, max(0.0, started + delay - time.monotonic()))
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if stream:
+                            return GuardedStream(self, task.result(), started, deadline)
+                        self._succeeded(started, hedge_won=task is not first)
+                        return task.result()
+                    error = task.exception()
+
+                if delay is not None and not hedged and (not pending or time.monotonic() - started >= delay):
+                    pending.add(attempt())
+                    hedged = True
+                    metrics.increment("llm_hedges_sent")
+                elif not pending:
+                    break
+        except BaseException:
+            # Cancelled by the caller; a half-open trial must not stay in flight
+            self.breaker.record_abandoned()
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+        raise self._failed(error, deadline)
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state and the current hedge delay"""
+        return {
+            **self.breaker.stats(),
+            "deadline_seconds": self.deadline_seconds,
+            "stream_deadline_seconds": self.stream_deadline_seconds,
+            "hedge_delay_seconds": self.hedge_delay()
+        }
+
+    def _admit(self):
+        """Reject the call when the breaker is open"""
+        if not self.breaker.allow():
+            metrics.increment("llm_circuit_rejections")
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+    def _succeeded(self, started: float, hedge_won: bool, record_latency: bool = True):
+        """Record a successful call"""
+        if record_latency:
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+        if hedge_won:
+            metrics.increment("llm_hedge_wins")
+        self.breaker.record_success()
+
+    def _failed(self, error: Optional[BaseException], deadline: Optional[float] = None) -> Exception:
+        """Record a failed call and return the exception to raise"""
+        self.breaker.record_failure()
+        if error is None:
+            metrics.increment("llm_deadline_exceeded")
+            deadline = self.deadline_seconds if deadline is None else deadline
+            return LLMDeadlineExceeded(f"LLM call exceeded its {deadline:.1f}s deadline")
+        return error
+
+
+class GuardedStream:
+    """
+    Chunks of an opened LLM stream
+
+    Raises LLMDeadlineExceeded once the deadline passes mid-stream and
+    reports errors and completion to the breaker. Closing it before the
+    stream has ended, including before the first chunk was read, tells
+    the breaker the outcome is unknown, so callers should always aclose()
+    it.
+    """
+
+    def __init__(self, client: ResilientLLMClient, stream, started: float, deadline: float):
+        self._client = client
+        self._stream = stream
+        self._chunks = stream.__aiter__()
+        self._started = started
+        self._deadline = deadline
+        self._finished = False
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._finished:
+            raise StopAsyncIteration
+        remaining = max(0.0, self._started + self._deadline - time.monotonic())
+        try:
+            return await asyncio.wait_for(self._chunks.__anext__(), timeout=remaining)
+        except StopAsyncIteration:
+            self._finished = True
+            self._client._succeeded(self._started, hedge_won=False, record_latency=False)
+            await self.aclose()
+            raise
+        except asyncio.TimeoutError:
+            self._finished = True
+            error = self._client._failed(None, self._deadline)
+        except Exception as e:
+            self._finished = True
+            error = self._client._failed(e, self._deadline)
+        await self.aclose()
+        raise error
+
+    async def aclose(self):
+        """Close the underlying stream"""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._finished:
+            # The caller stopped reading; the outcome is unknown
+            self._finished = True
+            self._client.breaker.record_abandoned()
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            await close()
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import logging
+import re
+import threading
+import numpy as np
+from config import settings
+from services.cache_backend import create_cache
+from utils.practice_areas import normalize_practice_area
+
+logger = logging.getLogger(__name__)
+
+class SemanticResponseCache:
+    """
+    Cache of LLM risk lists keyed on the context-bearing part of the prompt.
+
+    Prompts for different companies in the same practice area usually share
+    the retrieved context and differ only in company name and contact
+    details. Lookups first try an exact fingerprint of the normalized
+    context, then a near-duplicate match: each context is reduced to a
+    MinHash signature of its word shingles, and a stored entry is reused
+    when the estimated Jaccard similarity reaches the configured threshold.
+
+    Values live in the configured CACHE_BACKEND, so exact hits are shared
+    across workers; the MinHash signatures used for near-duplicate matching
+    are kept per process. Practice areas are keyed by their normalized form
+    (see normalize_practice_area), so synonyms share entries.
+    """
+
+    _WORD = re.compile(r"\w+")
+
+    def __init__(self):
+        self.enabled = settings.LLM_CACHE_ENABLED
+        self.threshold = settings.LLM_CACHE_SIMILARITY_THRESHOLD
+        self.shingle_size = settings.LLM_CACHE_SHINGLE_SIZE
+        self.max_entries = settings.LLM_CACHE_MAX_ENTRIES
+
+        self._values = create_cache(
+            "llm_response",
+            max_entries=self.max_entries,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+        )
+        # normalized practice area -> fingerprint -> MinHash signature
+        self._signatures: Dict[str, "OrderedDict[str, np.ndarray]"] = {}
+        self._lock = threading.Lock()
+
+        # Multiply-shift hash family; odd multipliers keep it universal mod 2**64
+        rng = np.random.default_rng(seed=7919)
+        self._hash_a = rng.integers(1, 2**63, size=settings.LLM_CACHE_NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+        self._hash_b = rng.integers(0, 2**63, size=settings.LLM_CACHE_NUM_HASHES, dtype=np.uint64)
+
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def lookup(self, practice_area: str, context: str) -> Optional[Tuple[List[str], float]]:
+        """Return (risks, confidence) for an identical or near-identical context"""
+        if not self.enabled:
+            return None
+
+        practice_area = normalize_practice_area(practice_area)
+        fingerprint = self.fingerprint(practice_area, context)
+        value = self._values.get(fingerprint)
+        if value is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return value['risks'], value['confidence']
+
+        signature = self._signature(context)
+        for candidate, similarity in self._similar(practice_area, signature):
+            value = self._values.get(candidate)
+            if value is None:
+                self._forget(practice_area, candidate)
+                continue
+            logger.info("LLM cache near-duplicate hit (similarity %.2f)", similarity)
+            with self._lock:
+                self.near_hits += 1
+            return value['risks'], value['confidence']
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def store(self, practice_area: str, context: str, risks: List[str], confidence: float):
+        """Remember the LLM result for this context"""
+        if not self.enabled:
+            return
+
+        practice_area = normalize_practice_area(practice_area)
+        fingerprint = self.fingerprint(practice_area, context)
+        self._values.set(fingerprint, {"risks": list(risks), "confidence": confidence})
+
+        signature = self._signature(context)
+        with self._lock:
+            signatures = self._signatures.setdefault(practice_area, OrderedDict())
+            signatures[fingerprint] = signature
+            signatures.move_to_end(fingerprint)
+            while len(signatures) > self.max_entries:
+                signatures.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Exact and near-duplicate hit counters"""
+        with self._lock:
+            lookups = self.exact_hits + self.near_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "similarity_threshold": self.threshold,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.exact_hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+                "entries": self._values.stats()['size']
+            }
+
+    def _similar(self, practice_area: str, signature: np.ndarray) -> List[Tuple[str, float]]:
+        """Stored fingerprints above the threshold, most similar first"""
+        with self._lock:
+            signatures = list(self._signatures.get(practice_area, {}).items())
+        if not signatures:
+            return []
+
+        fingerprints = [fingerprint for fingerprint, _ in signatures]
+        matrix = np.stack([stored for _, stored in signatures])
+        similarities = (matrix == signature).mean(axis=1)
+
+        order = np.argsort(-similarities)
+        return [
+            (fingerprints[idx], float(similarities[idx]))
+            for idx in order if similarities[idx] >= self.threshold
+        ]
+
+    def _forget(self, practice_area: str, fingerprint: str):
+        """Drop a signature whose value has expired or been evicted"""
+        with self._lock:
+            self._signatures.get(practice_area, {}).pop(fingerprint, None)
+
+    def fingerprint(self, practice_area: str, context: str) -> str:
+        """Exact fingerprint of the normalized practice area and context"""
+        words = self._WORD.findall(context.casefold())
+        payload = normalize_practice_area(practice_area) + "\n" + " ".join(words)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _signature(self, context: str) -> np.ndarray:
+        """MinHash signature of the context's word shingles"""
+        words = self._WORD.findall(context.casefold())
+        size = self.shingle_size
+        shingles = {
+            " ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))
+        }
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+                for shingle in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # (shingles x hash functions); uint64 arithmetic wraps mod 2**64
+        permuted = (np.outer(hashes, self._hash_a) + self._hash_b) >> np.uint64(32)
+        return permuted.min(axis=0)
@@ -0,0 +1,154 @@
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import functools
+import inspect
+import threading
+import time
+
+# Upper bounds (ms) of the latency histogram buckets; slower samples overflow
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Stage timings of the request being handled, for the Server-Timing header
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with interpolated percentile estimates"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one sample"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = max(self.buckets[idx - 1] if idx > 0 else 0.0, self.min)
+                upper = min(self.buckets[idx] if idx < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, sum, percentiles and cumulative bucket counts"""
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            cumulative[f"le_{bound}"] = running
+        cumulative["le_inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.total, 2),
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50": round(self.percentile(0.50), 2),
+            "p95": round(self.percentile(0.95), 2),
+            "p99": round(self.percentile(0.99), 2),
+            "max": round(self.max, 2),
+            "buckets": cumulative
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and latency histograms for the risk analysis pipeline.
+
+    Exposed through /api/v1/metrics so failure modes that the pipeline
+    recovers from (fallbacks, repaired LLM output) stay visible, and so
+    slow dependencies show up in the stage latency percentiles.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._histograms: Dict[str, Histogram] = defaultdict(Histogram)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1):
+        """Add to a named counter"""
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name: str, value_ms: float):
+        """Record a latency sample in milliseconds"""
+        with self._lock:
+            self._histograms[name].observe(value_ms)
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        """
+        Time a pipeline stage into its histogram and the current request.
+
+        A stage seen more than once in a request keeps its longest duration,
+        since repeated stages (e.g. one public-source query per risk area)
+        run concurrently.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.observe(stage, elapsed_ms)
+            timings = _request_timings.get()
+            if timings is not None:
+                timings[stage] = max(timings.get(stage, 0.0), elapsed_ms)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator timing every call of a function or coroutine function as a stage"""
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.time_stage(stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time_stage(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def start_request() -> Dict[str, float]:
+        """Begin collecting stage timings for the request in this context"""
+        timings: Dict[str, float] = {}
+        _request_timings.set(timings)
+        return timings
+
+    @staticmethod
+    def server_timing(timings: Dict[str, float]) -> str:
+        """Format stage timings as a Server-Timing header value"""
+        return ", ".join(f"{stage};dur={duration:.1f}" for stage, duration in timings.items())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current value of every counter and histogram"""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "latency_ms": {
+                    name: histogram.snapshot()
+                    for name, histogram in sorted(self._histograms.items())
+                }
+            }
+
+
+metrics = MetricsRegistry()
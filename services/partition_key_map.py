@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+import sqlite3
+import sys
+import threading
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class PartitionKeyMap:
+    """
+    Item id -> partition key value for one Cosmos container.
+
+    Knowing the partition key turns a lookup by id into a point read
+    (read_item, ~1 RU) instead of a cross-partition query. Entries are held
+    in a dict, with the few distinct partition key values interned, and
+    saved to a local SQLite file shared by the workers on the node so they
+    survive restarts. Writes to the file are queued and flushed in batches
+    by a background thread every PARTITION_KEY_MAP_FLUSH_SECONDS, so
+    recording ids never waits on SQLite. Services record ids as they create
+    or list items and forget them on delete; an id that is not mapped is
+    resolved with a query and then recorded.
+
+    Use get_partition_key_map for the instance shared by the services of
+    the process.
+    """
+
+    def __init__(self, container_name: str, path: Optional[str] = None):
+        """
+        Args:
+            container_name: Cosmos container the ids belong to
+            path: SQLite file; defaults to settings.PARTITION_KEY_MAP_PATH,
+                empty to keep the map in memory only
+        """
+        self.container_name = container_name
+        self.path = settings.PARTITION_KEY_MAP_PATH if path is None else path
+        self._keys: Dict[str, str] = {}
+        # Writes not yet flushed to SQLite; None marks a forgotten id
+        self._pending: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = None
+        if self.path:
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS partition_keys (
+                    container TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    partition_key TEXT NOT NULL,
+                    PRIMARY KEY (container, item_id)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT item_id, partition_key FROM partition_keys WHERE container = ?",
+                (container_name,)
+            ).fetchall()
+            self._keys = {item_id: sys.intern(partition_key) for item_id, partition_key in rows}
+            # The writer thread has its own connection
+            self._writer_conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._writer = threading.Thread(
+                target=self._write_loop, name=f"partition-keys-{container_name}", daemon=True
+            )
+            self._writer.start()
+            logger.info("Partition key map for %s: %d ids from %s", container_name, len(self._keys), self.path)
+
+    def get(self, item_id: str) -> Optional[str]:
+        """Partition key of an id, or None if it is not mapped"""
+        with self._lock:
+            partition_key = self._keys.get(item_id)
+            if partition_key is None and self._conn is not None and item_id not in self._pending:
+                # Another worker may have recorded it since we loaded
+                row = self._conn.execute(
+                    "SELECT partition_key FROM partition_keys WHERE container = ? AND item_id = ?",
+                    (self.container_name, item_id)
+                ).fetchone()
+                if row is not None:
+                    partition_key = self._keys[item_id] = sys.intern(row[0])
+            if partition_key is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return partition_key
+
+    def set(self, item_id: str, partition_key: str):
+        """Record the partition key of one id"""
+        self.set_many([(item_id, partition_key)])
+
+    def set_many(self, entries: Iterable[Tuple[str, str]]):
+        """Record (id, partition key) pairs; unchanged entries are not rewritten"""
+        with self._lock:
+            changed = [
+                (item_id, sys.intern(partition_key)) for item_id, partition_key in entries
+                if partition_key is not None and self._keys.get(item_id) != partition_key
+            ]
+            self._keys.update(changed)
+            if self._conn is not None:
+                self._pending.update(changed)
+
+    def forget(self, item_id: str):
+        """Drop an id, e.g. after the item was deleted"""
+        with self._lock:
+            self._keys.pop(item_id, None)
+            if self._conn is not None:
+                self._pending[item_id] = None
+
+    def flush(self):
+        """Write the queued changes to SQLite"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending or self._conn is None:
+                return
+            try:
+                self._writer_conn.executemany(
+                    "INSERT OR REPLACE INTO partition_keys (container, item_id, partition_key) VALUES (?, ?, ?)",
+                    [
+                        (self.container_name, item_id, partition_key)
+                        for item_id, partition_key in pending.items() if partition_key is not None
+                    ]
+                )
+                self._writer_conn.executemany(
+                    "DELETE FROM partition_keys WHERE container = ? AND item_id = ?",
+                    [(self.container_name, item_id) for item_id, partition_key in pending.items() if partition_key is None]
+                )
+                self._writer_conn.commit()
+            except sqlite3.Error as e:
+                self._writer_conn.rollback()
+                logger.warning("Could not save %d partition keys of %s: %s", len(pending), self.container_name, e)
+                with self._lock:
+                    # Keep newer changes queued since the swap
+                    self._pending = {**pending, **self._pending}
+
+    def stats(self) -> Dict[str, int]:
+        """Mapped ids and lookup counters of this process"""
+        with self._lock:
+            return {
+                "ids": len(self._keys),
+                "partition_keys": len(set(self._keys.values())),
+                "pending_writes": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def close(self):
+        """Flush queued writes and close the SQLite connections"""
+        if self._writer is not None:
+            self._stop.set()
+            self._writer.join()
+            self._writer = None
+        if self._conn is not None:
+            self.flush()
+            self._writer_conn.close()
+            self._conn.close()
+            self._conn = None
+
+    def _write_loop(self):
+        """Flush queued writes periodically until closed"""
+        while not self._stop.wait(settings.PARTITION_KEY_MAP_FLUSH_SECONDS):
+            self.flush()
+
+
+_maps: Dict[str, PartitionKeyMap] = {}
+_maps_lock = threading.Lock()
+
+
+def get_partition_key_map(container_name: str) -> PartitionKeyMap:
+    """The process-wide map of a container, created on first use"""
+    with _maps_lock:
+        if container_name not in _maps:
+            _maps[container_name] = PartitionKeyMap(container_name)
+        return _maps[container_name]
+
+
+def close_partition_key_maps():
+    """Flush and close every shared map"""
+    with _maps_lock:
+        maps = list(_maps.values())
+        _maps.clear()
+    for partition_key_map in maps:
+        partition_key_map.close()
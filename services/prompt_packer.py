@@ -0,0 +1,211 @@
+from typing import Any, Dict, List, Optional
+import logging
+import math
+import re
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of public sources by impact level (search hits use their score)
+IMPACT_WEIGHTS = {"High": 1.0, "Medium": 0.75, "Low": 0.5}
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken when its encoding can be loaded locally,
+    otherwise with a word/punctuation approximation that slightly
+    over-counts so budgets stay conservative.
+    """
+
+    _APPROXIMATE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+    def __init__(self, encoding_name: str):
+        self.encoding = None
+        try:
+            import tiktoken
+            self.encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            logger.warning("tiktoken encoding '%s' unavailable, approximating token counts: %s", encoding_name, e)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        words = self._APPROXIMATE_PATTERN.findall(text)
+        return math.ceil(sum(max(1, len(word) / 4) for word in words))
+
+
+class PromptPacker:
+    """
+    Packs retrieved documents into a fixed token budget.
+
+    Each document is split into chunks at paragraph and sentence boundaries.
+    Chunks are ranked by the document's retrieval score (normalized per
+    section, decayed by position within the document) and added greedily
+    until the budget is full. Selected chunks are emitted in their original
+    order, so every document reads as a contiguous excerpt.
+    """
+
+    _PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+    _SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+")
+
+    def __init__(self):
+        self.token_budget = settings.RISK_PROMPT_CONTEXT_TOKEN_BUDGET
+        self.chunk_max_tokens = settings.RISK_PROMPT_CHUNK_MAX_TOKENS
+        self.position_decay = settings.RISK_PROMPT_CHUNK_POSITION_DECAY
+        self.counter = TokenCounter(settings.RISK_PROMPT_TOKEN_ENCODING)
+
+    def pack(
+        self,
+        rag_context: Dict[str, Any],
+        public_sources: List[Dict[str, Any]],
+        token_budget: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Select the context that fits the token budget
+
+        Returns:
+            Dictionary with 'internal' and 'historical' lists of
+            {'source', 'content'} excerpts, the selected 'public_sources'
+            and the 'tokens' used
+        """
+        budget = token_budget if token_budget is not None else self.token_budget
+        candidates = []
+
+        for section in ("internal", "historical"):
+            docs = [doc for doc in rag_context.get(section, []) if doc.get('content')]
+            top_score = max((doc.get('score') or 0.0 for doc in docs), default=0.0) or 1.0
+            for doc_idx, doc in enumerate(docs):
+                weight = (doc.get('score') or 0.0) / top_score
+                header = self._document_header(section, doc['source'])
+                for chunk_idx, chunk in enumerate(self.split(doc['content'])):
+                    candidates.append({
+                        "section": section,
+                        "doc_idx": doc_idx,
+                        "chunk_idx": chunk_idx,
+                        "text": chunk,
+                        "tokens": self.counter.count(chunk),
+                        "header_tokens": self.counter.count(header),
+                        "priority": weight / (1 + self.position_decay * chunk_idx)
+                    })
+
+        for src_idx, src in enumerate(public_sources):
+            text = self.format_public_source(src)
+            candidates.append({
+                "section": "public",
+                "doc_idx": src_idx,
+                "chunk_idx": 0,
+                "text": text,
+                "tokens": self.counter.count(text),
+                "header_tokens": 0,
+                "priority": IMPACT_WEIGHTS.get(src.get('impact_level'), 0.5)
+            })
+
+        # Highest priority first; ties keep retrieval order
+        ranked = sorted(
+            candidates,
+            key=lambda c: (-c['priority'], c['section'], c['doc_idx'], c['chunk_idx'])
+        )
+
+        used = 0
+        opened_docs = set()
+        selected = []
+        for candidate in ranked:
+            doc_key = (candidate['section'], candidate['doc_idx'])
+            cost = candidate['tokens']
+            if doc_key not in opened_docs:
+                cost += candidate['header_tokens']
+            if used + cost > budget:
+                continue  # A smaller chunk further down may still fit
+            used += cost
+            opened_docs.add(doc_key)
+            selected.append(candidate)
+
+        selected.sort(key=lambda c: (c['section'], c['doc_idx'], c['chunk_idx']))
+        packed = {"internal": [], "historical": [], "public_sources": [], "tokens": used}
+
+        for section in ("internal", "historical"):
+            docs = [doc for doc in rag_context.get(section, []) if doc.get('content')]
+            for doc_idx, doc in enumerate(docs):
+                chunks = [
+                    c for c in selected
+                    if c['section'] == section and c['doc_idx'] == doc_idx
+                ]
+                if chunks:
+                    packed[section].append({"source": doc['source'], "content": self._join_chunks(chunks)})
+
+        packed["public_sources"] = [
+            public_sources[c['doc_idx']] for c in selected if c['section'] == "public"
+        ]
+
+        logger.info(
+            "Packed %d/%d context chunks into %d/%d tokens",
+            len(selected), len(candidates), used, budget
+        )
+        return packed
+
+    def split(self, text: str) -> List[str]:
+        """Split text into chunks that end on paragraph or sentence boundaries"""
+        chunks = []
+        for paragraph in self._PARAGRAPH_BREAK.split(text):
+            paragraph = " ".join(paragraph.split())
+            if not paragraph:
+                continue
+            if self.counter.count(paragraph) <= self.chunk_max_tokens:
+                chunks.append(paragraph)
+                continue
+
+            current, current_tokens = [], 0
+            for sentence in self._SENTENCE_BREAK.split(paragraph):
+                sentence_tokens = self.counter.count(sentence)
+                if current and current_tokens + sentence_tokens > self.chunk_max_tokens:
+                    chunks.append(" ".join(current))
+                    current, current_tokens = [], 0
+                if sentence_tokens > self.chunk_max_tokens:
+                    chunks.extend(self._split_words(sentence))
+                    continue
+                current.append(sentence)
+                current_tokens += sentence_tokens
+            if current:
+                chunks.append(" ".join(current))
+        return chunks
+
+    @staticmethod
+    def format_public_source(src: Dict[str, Any]) -> str:
+        """Prompt block for a single public source"""
+        return (
+            f"[Public Source: {src['title']}]\n"
+            f"Risk Area: {src.get('risk_area', 'N/A')}\n"
+            f"Summary: {src.get('summary', 'N/A')}\n"
+            f"Impact: {src.get('impact_level', 'N/A')}\n"
+            f"Jurisdiction: {src.get('jurisdiction', 'N/A')}"
+        )
+
+    @staticmethod
+    def _join_chunks(chunks: List[Dict[str, Any]]) -> str:
+        """Join selected chunks of one document, marking skipped text"""
+        parts = [chunks[0]['text']]
+        for previous, chunk in zip(chunks, chunks[1:]):
+            separator = "\n" if chunk['chunk_idx'] == previous['chunk_idx'] + 1 else "\n[...]\n"
+            parts.append(separator + chunk['text'])
+        return "".join(parts)
+
+    @staticmethod
+    def _document_header(section: str, source: str) -> str:
+        """Prompt header line for a retrieved document"""
+        label = "Internal Document" if section == "internal" else "Historical Engagement"
+        return f"[{label}: {source}]\n"
+
+    def _split_words(self, sentence: str) -> List[str]:
+        """Last resort for a single sentence longer than a chunk"""
+        chunks, current, current_tokens = [], [], 0
+        for word in sentence.split():
+            current.append(word)
+            current_tokens += self.counter.count(" " + word)
+            if current_tokens >= self.chunk_max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
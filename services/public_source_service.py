@@ -1,13 +1,18 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import uuid
-from services.database_service import DatabaseService
+from services.database_service import DatabaseService, QueryBuilder
+from services.async_database_service import AsyncDatabaseService
+from services.data_version import data_version
+from services.partition_key_map import get_partition_key_map
 from models.public_source import PublicSourceCreate
 from config import settings
 
 class PublicSourceService:
     def __init__(self):
         self.db = DatabaseService()
+        self.async_db = AsyncDatabaseService()
+        self.partition_keys = get_partition_key_map(settings.PUBLIC_DATA_CONTAINER)
     
     def create_public_source(self, source_data: PublicSourceCreate) -> Dict[str, Any]:
         """Create a public data source with minimal info (title + URL)"""
@@ -36,6 +41,8 @@ class PublicSourceService:
         }
         
         result = self.db.insert_item(settings.PUBLIC_DATA_CONTAINER, public_source_doc)
+        self.partition_keys.set(news_id, public_source_doc['jurisdiction'])
+        data_version.bump(settings.PUBLIC_DATA_CONTAINER)
         return result
     
     def get_public_sources(
@@ -45,31 +52,61 @@ class PublicSourceService:
         enrichment_status: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get all public sources with optional filters"""
-        
-        query_parts = ["SELECT * FROM c"]
-        conditions = []
+        query, parameters = self._build_public_sources_query(risk_area, jurisdiction, enrichment_status)
+        sources = self.db.query_items(settings.PUBLIC_DATA_CONTAINER, query, parameters)
+        self._record_partition_keys(sources)
+        return sources
+    
+    async def get_public_sources_async(
+        self,
+        risk_area: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        enrichment_status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Non-blocking variant of get_public_sources"""
+        query, parameters = self._build_public_sources_query(risk_area, jurisdiction, enrichment_status)
+        sources = await self.async_db.query_items(settings.PUBLIC_DATA_CONTAINER, query, parameters)
+        self._record_partition_keys(sources)
+        return sources
+    
+    @staticmethod
+    def _build_public_sources_query(
+        risk_area: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        enrichment_status: Optional[str] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Build the parameterized public source listing query for the given filters"""
+        builder = QueryBuilder()
         
         if risk_area:
-            conditions.append(f"c.risk_area = '{risk_area}'")
+            builder.where("c.risk_area = @risk_area", risk_area=risk_area)
         
         if jurisdiction:
-            conditions.append(f"c.jurisdiction = '{jurisdiction}'")
+            builder.where("c.jurisdiction = @jurisdiction", jurisdiction=jurisdiction)
         
         if enrichment_status:
-            conditions.append(f"c.enrichment_status = '{enrichment_status}'")
+            builder.where("c.enrichment_status = @enrichment_status", enrichment_status=enrichment_status)
         
-        if conditions:
-            query_parts.append("WHERE " + " AND ".join(conditions))
-        
-        query = " ".join(query_parts)
-        return self.db.query_items(settings.PUBLIC_DATA_CONTAINER, query)
+        return builder.build()
     
     def get_public_source_by_id(self, news_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific public source by ID"""
-        query = f"SELECT * FROM c WHERE c.news_id = '{news_id}'"
-        results = self.db.query_items(settings.PUBLIC_DATA_CONTAINER, query)
+        """Get a specific public source by ID; a point read when its jurisdiction is known"""
+        jurisdiction = self.partition_keys.get(news_id)
+        if jurisdiction is not None:
+            source = self.db.read_item(settings.PUBLIC_DATA_CONTAINER, news_id, jurisdiction)
+            if source is not None:
+                return source
+            self.partition_keys.forget(news_id)
+        
+        query, parameters = QueryBuilder().where("c.news_id = @news_id", news_id=news_id).build()
+        results = self.db.query_items(settings.PUBLIC_DATA_CONTAINER, query, parameters)
+        self._record_partition_keys(results)
         return results[0] if results else None
     
+    def _record_partition_keys(self, sources: List[Dict[str, Any]]):
+        """Remember the jurisdiction partition of public sources read from Cosmos"""
+        self.partition_keys.set_many((source['id'], source.get('jurisdiction')) for source in sources)
+    
     def update_enrichment_status(
         self,
         news_id: str,
@@ -98,6 +135,7 @@ class PublicSourceService:
             item['jurisdiction'],
             item
         )
+        data_version.bump(settings.PUBLIC_DATA_CONTAINER)
         return True
     
     def delete_public_source(self, news_id: str) -> bool:
@@ -111,6 +149,8 @@ class PublicSourceService:
             news_id,
             source['jurisdiction']
         )
+        self.partition_keys.forget(news_id)
+        data_version.bump(settings.PUBLIC_DATA_CONTAINER)
         return True
     
     def bulk_create_public_sources(self, sources_data: List[Dict[str, Any]]) -> List[str]:
@@ -142,6 +182,10 @@ class PublicSourceService:
             }
             
             self.db.insert_item(settings.PUBLIC_DATA_CONTAINER, public_source_doc)
+            self.partition_keys.set(news_id, public_source_doc['jurisdiction'])
             created_ids.append(news_id)
         
+        if created_ids:
+            data_version.bump(settings.PUBLIC_DATA_CONTAINER)
+        
         return created_ids
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import re
+import threading
+from config import settings
+from services.cache_backend import create_cache
+from services.data_version import data_version
+from risk_analysis_model import RiskAnalysisRequest, RiskAnalysisResponse
+
+class RiskAnalysisCache:
+    """
+    Cache of complete risk analysis responses.
+
+    Keys combine the normalized request with the current attorney and
+    public-source data version, so any write through AttorneyService or
+    PublicSourceService invalidates previously cached analyses. Responses
+    are stored as JSON so they can live in a shared CACHE_BACKEND.
+    """
+
+    def __init__(self):
+        self.enabled = settings.RISK_CACHE_ENABLED
+        self._cache = create_cache(
+            "risk_analysis",
+            max_entries=settings.RISK_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RISK_CACHE_TTL_SECONDS
+        )
+        self._stamp = data_version.stamp()
+        self._stamp_lock = threading.Lock()
+
+    def get(self, request: RiskAnalysisRequest) -> Optional[RiskAnalysisResponse]:
+        """Return a copy of the cached response for this request, if any"""
+        if not self.enabled:
+            return None
+        response = self._cache.get(self._build_key(request))
+        return RiskAnalysisResponse(**response) if response is not None else None
+
+    def set(self, request: RiskAnalysisRequest, response: RiskAnalysisResponse):
+        """Cache the response for this request"""
+        if not self.enabled:
+            return
+        self._cache.set(self._build_key(request), response.model_dump(mode="json"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus the data version the entries belong to"""
+        return {
+            "enabled": self.enabled,
+            "data_version": self._stamp,
+            **self._cache.stats()
+        }
+
+    def _build_key(self, request: RiskAnalysisRequest) -> str:
+        """Hash of the normalized request and the current data version"""
+        stamp = self._refresh_stamp()
+        normalized = {
+            "company": self._normalize_text(request.companyName),
+            "practice_area": self._normalize_text(request.practicearea),
+            "email": (request.companyemail or "").strip().lower(),
+            "phone": re.sub(r"\D", "", request.companyphonenumber or ""),
+            "data_version": stamp
+        }
+        payload = json.dumps(normalized, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _refresh_stamp(self) -> str:
+        """Drop local entries once the underlying data has changed"""
+        stamp = data_version.stamp()
+        with self._stamp_lock:
+            if stamp != self._stamp:
+                # Shared entries are keyed on the stamp too and age out on
+                # their own; clearing them here would race other workers
+                if not self._cache.shared:
+                    self._cache.clear()
+                self._stamp = stamp
+        return stamp
+
+    @staticmethod
+    def _normalize_text(value: str) -> str:
+        """Case-fold and collapse whitespace"""
+        return " ".join((value or "").split()).casefold()
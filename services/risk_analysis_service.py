@@ -1,20 +1,43 @@
-from openai import AzureOpenAI
-from typing import List, Dict, Any, Tuple
-import json
+from openai import AsyncAzureOpenAI
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+import asyncio
 import logging
+import time
 from config import settings
 from services.ai_search_service import AISearchService
 from services.public_source_service import PublicSourceService
 from services.attorney_service import AttorneyService
+from services.attorney_roster import AttorneyRosterIndex
+from services.attorney_scoring import AttorneyScoringMatrix
+from services.engagement_indexer import ATTORNEY_ID_PATTERN
+from services.risk_analysis_cache import RiskAnalysisCache
+from services.context_store import PracticeAreaContextStore
+from services.prompt_packer import PromptPacker
+from services.llm_response_cache import SemanticResponseCache
+from services.metrics_service import metrics
+from services.llm_resilience import ResilientLLMClient, CircuitOpenError
+from utils.stream_parser import IncrementalRiskParser, RiskResponseParseError, parse_risk_assessment
+from utils.structured_logging import log_payload
+from utils.practice_areas import normalize_practice_area
 from risk_analysis_model import (
+    LLM_RISK_ASSESSMENT_SCHEMA,
     RiskAnalysisRequest, 
     RiskAnalysisResponse, 
     ReferenceItem,
-    RecommendedAttorney
+    RecommendedAttorney,
+    BatchRiskAnalysisItem,
+    BatchRiskAnalysisResponse
 )
 
 logger = logging.getLogger(__name__)
 
+# Returned when the LLM call or its parsing fails
+FALLBACK_RISKS = [
+    "General compliance risk in the specified practice area requires assessment",
+    "Regulatory changes may impact operations and require monitoring",
+    "Documentation and reporting requirements need review"
+]
+
 class RiskAnalysisService:
     """Service for performing RAG-based risk analysis and attorney matching"""
     
@@ -24,59 +47,369 @@ class RiskAnalysisService:
         self.attorney_service = AttorneyService()
         
         # Initialize Azure OpenAI client
-        self.llm_client = AzureOpenAI(
-            api_key=settings.AZURE_OPENAI_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION,
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT
-        )
+        self.async_llm_client = AsyncAzureOpenAI(**self._llm_client_options())
+        
+        # Deadline, hedging and circuit breaker around the LLM client
+        self.llm_resilience = ResilientLLMClient(self.async_llm_client)
+        # Last successful (risks, confidence) per normalized practice area,
+        # served while the circuit breaker is open
+        self._last_good_analysis: Dict[str, Tuple[List[str], float]] = {}
+        
+        # Cache of complete responses keyed on request + data version
+        self.result_cache = RiskAnalysisCache()
+        
+        # Precomputed search and public-source context per practice area
+        self.context_store = PracticeAreaContextStore(self._load_practice_area_context)
+        
+        # All attorneys indexed by practice area, seniority and experience
+        self.attorney_roster = AttorneyRosterIndex(self.attorney_service.get_attorneys_async)
+        
+        # Reuses LLM risk lists across prompts with near-identical context
+        self.llm_cache = SemanticResponseCache()
+        # Shared LLM calls by context fingerprint: {'task', 'waiters'}
+        self._llm_in_flight: Dict[str, Dict[str, Any]] = {}
+        
+        # Fits retrieved context into the prompt token budget
+        self.prompt_packer = PromptPacker()
         
         logger.info("Risk Analysis Service initialized")
     
-    def analyze_company_risks(self, request: RiskAnalysisRequest) -> RiskAnalysisResponse:
+    async def analyze_company_risks_async(
+        self,
+        request: RiskAnalysisRequest,
+        use_cache: bool = True
+    ) -> RiskAnalysisResponse:
         """
         Main method to analyze company risks and recommend attorney
         
         Pipeline:
-        1. Search internal legal documents for practice area knowledge
-        2. Search historical engagements for similar cases
-        3. Query public data sources for recent risks
-        4. Build context and prompt for LLM
-        5. Get risk analysis from LLM
-        6. Match attorney based on practice area and experience
-        7. Generate email template
-        8. Return structured response
+        1. Concurrently retrieve internal documents, historical engagements,
+           public data sources and candidate attorneys
+        2. Build context and prompt for LLM
+        3. Get risk analysis from LLM
+        4. Match attorney based on practice area and experience
+        5. Generate email template
+        6. Return structured response
+        
+        Every stage runs on the async OpenAI, AI Search and Cosmos clients so
+        the event loop is never blocked while waiting on I/O. Responses are
+        served from the result cache when the same normalized request was
+        analyzed against the current data version, and LLM results are
+        reused for identical or near-identical context. Pass use_cache=False
+        to bypass both lookups.
+        """
+        cached = self.result_cache.get(request) if use_cache else None
+        if cached is not None:
+            logger.info("Risk analysis cache hit for %s / %s", request.companyName, request.practicearea)
+            return cached
+        
+        self._log_pipeline_start(request)
+        
+        context = await self._gather_context_async(request.practicearea)
+        return await self._complete_analysis_async(request, context, use_cache=use_cache)
+    
+    async def analyze_batch_async(
+        self,
+        requests: List[RiskAnalysisRequest],
+        use_cache: bool = True
+    ) -> BatchRiskAnalysisResponse:
         """
-        logger.info("\n" + "="*80)
-        logger.info("STARTING RISK ANALYSIS PIPELINE")
-        logger.info("="*80)
-        logger.info(f"Company: {request.companyName}")
-        logger.info(f"Practice Area: {request.practicearea}")
-        logger.info(f"Email: {request.companyemail}")
-        logger.info(f"Phone: {request.companyphonenumber}")
+        Analyze many companies, sharing retrieval across each practice area
+        
+        Requests are grouped by normalized practice area. Retrieval and attorney matching
+        depend only on the practice area, so they run once per group; the
+        per-company LLM calls then run with bounded concurrency across the
+        whole batch. Failures are reported per item.
+        """
+        logger.info("Starting batch risk analysis for %d companies", len(requests))
+        
+        results: List[BatchRiskAnalysisItem] = [None] * len(requests)
+        groups: Dict[str, List[int]] = {}
+        
+        for idx, request in enumerate(requests):
+            cached = self.result_cache.get(request) if use_cache else None
+            if cached is not None:
+                results[idx] = self._batch_item(idx, request, result=cached)
+            else:
+                groups.setdefault(normalize_practice_area(request.practicearea), []).append(idx)
+        
+        logger.info("Batch grouped into %d practice areas (%d cache hits)",
+                    len(groups), len(requests) - sum(len(g) for g in groups.values()))
+        
+        llm_slots = asyncio.Semaphore(settings.RISK_BATCH_LLM_CONCURRENCY)
+        
+        async def analyze_item(idx: int, context: Dict[str, Any], attorneys: List[RecommendedAttorney]):
+            request = requests[idx]
+            try:
+                result = await self._complete_analysis_async(
+                    request, context, attorneys=attorneys, llm_slots=llm_slots, use_cache=use_cache
+                )
+                results[idx] = self._batch_item(idx, request, result=result)
+            except Exception as e:
+                logger.error("Batch item %d (%s) failed: %s", idx, request.companyName, e)
+                results[idx] = self._batch_item(idx, request, error=str(e))
+        
+        async def analyze_group(indexes: List[int]):
+            # Any spelling in the group retrieves the same context
+            practice_area = requests[indexes[0]].practicearea
+            try:
+                context = await self._gather_context_async(practice_area)
+                attorneys = self._find_matching_attorneys(
+                    practice_area,
+                    context['rag_context'],
+                    candidates=context['attorneys']
+                )
+            except Exception as e:
+                logger.error("Batch retrieval for '%s' failed: %s", practice_area, e)
+                for idx in indexes:
+                    results[idx] = self._batch_item(idx, requests[idx], error=str(e))
+                return
+            
+            await asyncio.gather(*[analyze_item(idx, context, attorneys) for idx in indexes])
+        
+        await asyncio.gather(*[
+            analyze_group(indexes) for indexes in groups.values()
+        ])
+        
+        succeeded = sum(1 for item in results if item.status == "completed")
+        logger.info("Batch risk analysis complete: %d/%d succeeded", succeeded, len(results))
+        
+        return BatchRiskAnalysisResponse(
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=results
+        )
+    
+    async def _complete_analysis_async(
+        self,
+        request: RiskAnalysisRequest,
+        context: Dict[str, Any],
+        attorneys: List[RecommendedAttorney] = None,
+        llm_slots: asyncio.Semaphore = None,
+        use_cache: bool = True
+    ) -> RiskAnalysisResponse:
+        """
+        Run the per-company part of the pipeline on already retrieved context
+        
+        Args:
+            request: Company being analyzed
+            context: Output of _gather_context_async for its practice area
+            attorneys: Pre-matched attorneys; matched here when not provided
+            llm_slots: Optional semaphore bounding concurrent LLM calls
+            use_cache: Whether cached LLM results may be reused
+        """
+        rag_context = context['rag_context']
+        public_sources = context['public_sources']
+        
+        prompt, context_block = self._build_risk_analysis_prompt(request, rag_context, public_sources)
+        llm_call = self._get_llm_risk_analysis_async(
+            prompt,
+            public_sources,
+            practice_area=request.practicearea,
+            context_block=context_block,
+            use_cache=use_cache
+        )
+        
+        if llm_slots is not None:
+            async with llm_slots:
+                risks, references, confidence = await llm_call
+        else:
+            risks, references, confidence = await llm_call
+        
+        if attorneys is None:
+            attorneys = self._find_matching_attorneys(
+                request.practicearea,
+                rag_context,
+                candidates=context['attorneys']
+            )
+        
+        response = self._assemble_response(request, risks, references, confidence, attorneys)
+        if self._is_cacheable(risks):
+            self.result_cache.set(request, response)
+        return response
+    
+    @staticmethod
+    def _batch_item(
+        idx: int,
+        request: RiskAnalysisRequest,
+        result: RiskAnalysisResponse = None,
+        error: str = None
+    ) -> BatchRiskAnalysisItem:
+        """Build the per-company entry of a batch response"""
+        return BatchRiskAnalysisItem(
+            index=idx,
+            company=request.companyName,
+            practice_area=request.practicearea,
+            status="completed" if result is not None else "failed",
+            result=result,
+            error=error
+        )
+    
+    async def stream_company_risks(
+        self,
+        request: RiskAnalysisRequest,
+        use_cache: bool = True
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of analyze_company_risks_async
+        
+        Yields (event, data) pairs as soon as each part of the analysis is
+        ready:
+        - "attorneys": recommended attorneys, once retrieval has finished
+        - "references": reference links from public sources
+        - "risk": one event per risk, as the LLM completes it
+        - "email_template": the generated email
+        - "complete": the full RiskAnalysisResponse; its risks are the
+          validated list and replace the "risk" events streamed before it,
+          which can differ when the response had to be repaired
+        
+        Analyses cut off by an LLM error are streamed but not cached.
+        """
+        cached = self.result_cache.get(request) if use_cache else None
+        if cached is not None:
+            logger.info("Risk analysis cache hit for %s / %s", request.companyName, request.practicearea)
+            yield "attorneys", [attorney.dict() for attorney in cached.recommended_attorneys]
+            yield "references", [reference.dict() for reference in cached.references]
+            for idx, risk in enumerate(cached.risks):
+                yield "risk", {"index": idx, "risk": risk}
+            yield "email_template", {"email_template": cached.email_template}
+            yield "complete", cached.dict()
+            return
+        
+        self._log_pipeline_start(request)
+        
+        context = await self._gather_context_async(request.practicearea)
+        rag_context = context['rag_context']
+        public_sources = context['public_sources']
         
-        # Step 1: Retrieve relevant documents using RAG
-        rag_context = self._retrieve_rag_context(request)
+        attorneys = self._find_matching_attorneys(
+            request.practicearea,
+            rag_context,
+            candidates=context['attorneys']
+        )
+        yield "attorneys", [attorney.dict() for attorney in attorneys]
+        
+        references = self._build_references(public_sources)
+        yield "references", [reference.dict() for reference in references]
         
-        # Step 2: Get public data sources for additional context
-        public_sources = self._get_relevant_public_sources(request.practicearea)
+        prompt, context_block = self._build_risk_analysis_prompt(request, rag_context, public_sources)
         
-        # Step 3: Build LLM prompt with context
-        prompt = self._build_risk_analysis_prompt(request, rag_context, public_sources)
+        cached_analysis = self.llm_cache.lookup(request.practicearea, context_block) if use_cache else None
+        if cached_analysis is not None:
+            risks, confidence = cached_analysis
+            for idx, risk in enumerate(risks):
+                yield "risk", {"index": idx, "risk": risk}
+            response = self._assemble_response(request, risks, references, confidence, attorneys)
+            yield "email_template", {"email_template": response.email_template}
+            if self._is_cacheable(risks):
+                self.result_cache.set(request, response)
+            yield "complete", response.dict()
+            return
         
-        # Step 4: Get risk analysis from LLM
-        risks, references, confidence = self._get_llm_risk_analysis(prompt, public_sources)
+        self._log_llm_call()
+        metrics.increment("llm_calls")
+        
+        messages = self._build_llm_messages(prompt)
+        parser = IncrementalRiskParser()
+        risks, confidence = [], 50
+        failed = False
+        llm_started = time.perf_counter()
+        try:
+            stream = await self.llm_resilience.complete_async(
+                hedge=False,
+                messages=messages,
+                stream=True,
+                **self._llm_request_options()
+            )
+            try:
+                async for chunk in stream:
+                    # Azure sends content-filter chunks without choices
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    for risk in parser.feed(chunk.choices[0].delta.content):
+                        yield "risk", {"index": len(risks), "risk": risk}
+                        risks.append(risk)
+            finally:
+                # Settles the breaker when the client disconnects mid-stream
+                await stream.aclose()
+            
+            try:
+                parsed_risks, _, confidence = self._parse_llm_risk_response(parser.text, public_sources)
+            except RiskResponseParseError as e:
+                parsed_risks, _, confidence = await self._repair_llm_response_async(
+                    messages, parser.text, e, public_sources
+                )
+            # Emit anything the incremental parser could not see; the
+            # validated list is authoritative for the final response
+            for idx, risk in enumerate(parsed_risks[len(risks):], start=len(risks)):
+                yield "risk", {"index": idx, "risk": risk}
+            risks = parsed_risks
+        except Exception as e:
+            logger.error("LLM Error: %s", e)
+            failed = True
+            if risks:
+                metrics.increment("llm_partial_responses")
+            else:
+                risks, _, confidence = self._degraded_risk_analysis(
+                    request.practicearea, public_sources, circuit_open=isinstance(e, CircuitOpenError)
+                )
+                for idx, risk in enumerate(risks):
+                    yield "risk", {"index": idx, "risk": risk}
+        metrics.observe("llm", (time.perf_counter() - llm_started) * 1000)
+        if not failed:
+            self._remember_llm_analysis(request.practicearea, context_block, risks, confidence)
         
-        # Step 5: Find best matching attorney
-        attorneys = self._find_matching_attorneys(request.practicearea, rag_context)
+        response = self._assemble_response(request, risks, references, confidence, attorneys)
+        yield "email_template", {"email_template": response.email_template}
         
-        # Step 6: Generate email template
+        if not failed and self._is_cacheable(risks):
+            self.result_cache.set(request, response)
+        yield "complete", response.dict()
+    
+    async def close_async(self):
+        """Release the async clients held by the service"""
+        await self.async_llm_client.close()
+        await self.ai_search.close_async()
+        await self.attorney_service.async_db.close()
+    
+    @staticmethod
+    def _llm_client_options() -> Dict[str, Any]:
+        """Azure OpenAI connection settings, or the local stub when configured"""
+        if settings.AZURE_OPENAI_STUB_URL:
+            logger.warning("Sending LLM calls to the stub server at %s", settings.AZURE_OPENAI_STUB_URL)
+            return {
+                "api_key": settings.AZURE_OPENAI_KEY or "stub",
+                "api_version": settings.AZURE_OPENAI_API_VERSION,
+                "azure_endpoint": settings.AZURE_OPENAI_STUB_URL
+            }
+        return {
+            "api_key": settings.AZURE_OPENAI_KEY,
+            "api_version": settings.AZURE_OPENAI_API_VERSION,
+            "azure_endpoint": settings.AZURE_OPENAI_ENDPOINT
+        }
+    
+    def _log_pipeline_start(self, request: RiskAnalysisRequest):
+        """Log the pipeline banner and request details"""
+        logger.info("Starting risk analysis: company=%s practice_area=%s",
+                    request.companyName, request.practicearea)
+        logger.debug("Contact: email=%s phone=%s", request.companyemail, request.companyphonenumber)
+    
+    def _assemble_response(
+        self,
+        request: RiskAnalysisRequest,
+        risks: List[str],
+        references: List[ReferenceItem],
+        confidence: float,
+        attorneys: List[RecommendedAttorney]
+    ) -> RiskAnalysisResponse:
+        """Generate the email template and build the final response"""
         email_template = self._generate_email_template(
             request, 
             attorneys[0], 
             risks
         )
         
-        # Step 7: Build response
         response = RiskAnalysisResponse(
             company=request.companyName,
             practice_area=request.practicearea,
@@ -87,127 +420,214 @@ class RiskAnalysisService:
             confidence_score=confidence
         )
 
-        logger.info("\n" + "="*80)
-        logger.info("RISK ANALYSIS COMPLETE")
-        logger.info("="*80)
-        logger.info(f"Identified {len(risks)} risks")
-        logger.info(f"Found {len(references)} references")
-        logger.info(f"Recommended {len(attorneys)} attorneys")  # Changed logging
-        logger.info(f"Top attorney: {attorneys[0].name}")
-        logger.info(f"Confidence: {confidence}%")
+        logger.info(
+            "Risk analysis complete: %d risks, %d references, %d attorneys (top: %s), confidence %s%%",
+            len(risks), len(references), len(attorneys), attorneys[0].name, confidence
+        )
         
         return response
     
-    def _retrieve_rag_context(self, request: RiskAnalysisRequest) -> Dict[str, Any]:
+    async def _gather_context_async(self, practice_area: str) -> Dict[str, Any]:
         """
-        Retrieve relevant documents from both indexes using RAG
+        Run every retrieval stage at once and wait for all of them.
+        
+        Internal search, historical search, one public-source query per mapped
+        risk area and the attorney fetch are independent, so they start
+        together, each with its own deadline; a stage that misses it is
+        logged and replaced by an empty result so the request can proceed.
+        
+        Search and public-source results are taken from the precomputed
+        context store when it holds a fresh snapshot for the practice area.
+        The attorney fetch is skipped when the attorney roster is loaded,
+        since matching then ranks the roster's scoring matrix.
+        
+        Returns:
+            Dictionary with 'rag_context', 'public_sources' and 'attorneys'
+            keys; 'attorneys' is None when the fetch was skipped
         """
-        logger.info("\n" + "-"*80)
-        logger.info("STEP 1: RAG DOCUMENT RETRIEVAL")
-        logger.info("-"*80)
+        logger.info("Step 1: concurrent context retrieval (async)")
         
-        # Build search query focused on practice area and company context
-        search_query = f"{request.practicearea} legal compliance risks regulations"
-        logger.info(f"Search Query: {search_query}")
+        started = time.monotonic()
+        if self.attorney_roster.scoring_matrix() is None:
+            attorney_stage = self._run_stage(
+                self._fetch_candidate_attorneys_async(practice_area),
+                "attorney fetch", settings.RISK_ATTORNEY_TIMEOUT_SECONDS, default=[]
+            )
+        else:
+            # Matching ranks the loaded roster
+            attorney_stage = asyncio.sleep(0, result=None)
         
-        # Search both indexes
-        rag_results = self.ai_search.search_both_indexes(search_query, top_per_index=3)
+        retrieval = self.context_store.get(practice_area)
+        if retrieval is not None:
+            logger.info("Using precomputed context for '%s'", practice_area)
+            attorneys = await attorney_stage
+        else:
+            retrieval, attorneys = await asyncio.gather(
+                self._load_practice_area_context(practice_area),
+                attorney_stage
+            )
+            if retrieval['complete']:
+                self.context_store.put(practice_area, retrieval)
         
-        # Log retrieved context
-        logger.info(f"\nRETRIEVED RAG CONTEXT:")
-        logger.info(f"  - Internal Documents: {len(rag_results['internal'])}")
-        logger.info(f"  - Historical Engagements: {len(rag_results['historical'])}")
+        self._log_context_summary(retrieval['rag_context'], retrieval['public_sources'], attorneys)
+        logger.info("Context retrieval finished in %.2fs", time.monotonic() - started)
         
-        if len(rag_results['internal']) == 0 and len(rag_results['historical']) == 0:
-            logger.warning("WARNING: No RAG documents retrieved. Analysis will rely only on public sources.")
+        return {
+            "rag_context": retrieval['rag_context'],
+            "public_sources": retrieval['public_sources'],
+            "attorneys": attorneys
+        }
+    
+    async def _load_practice_area_context(self, practice_area: str) -> Dict[str, Any]:
+        """
+        Run the search and public-source stages for a practice area
         
-        return rag_results
+        Used on a context store miss and by the store's background refresh.
+        """
+        search_query = self._build_search_query(practice_area)
+        risk_areas = self._map_risk_areas(practice_area)
+        logger.info("Search query %r, risk areas %s", search_query, risk_areas)
+        
+        internal, historical, *public_source_groups = await asyncio.gather(
+            self._run_stage(
+                self._search_internal_async(search_query),
+                "internal search", settings.RISK_SEARCH_TIMEOUT_SECONDS, default=None
+            ),
+            self._run_stage(
+                self._search_historical_async(search_query),
+                "historical search", settings.RISK_SEARCH_TIMEOUT_SECONDS, default=None
+            ),
+            *[
+                self._run_stage(
+                    self._query_public_sources_async(risk_area),
+                    f"public sources ({risk_area})",
+                    settings.RISK_PUBLIC_SOURCE_TIMEOUT_SECONDS, default=None
+                )
+                for risk_area in risk_areas
+            ]
+        )
+        return self._combine_retrieval(internal, historical, public_source_groups)
     
-    def _get_relevant_public_sources(self, practice_area: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _combine_retrieval(
+        internal: List[Dict[str, Any]],
+        historical: List[Dict[str, Any]],
+        public_source_groups: List[List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
         """
-        Query public data sources for relevant news/updates
+        Merge stage results; stages that timed out or failed come back as None
+        and are treated as empty, marking the retrieval as incomplete
         """
-        logger.info("\n" + "-"*80)
-        logger.info("STEP 2: PUBLIC DATA SOURCE QUERY")
-        logger.info("-"*80)
-        
-        # Map practice area to risk areas in database
-        risk_area_mapping = {
-            "Corporate M&A": ["Corporate Governance", "Securities Law"],
-            "Data Privacy": ["Data Protection"],
-            "Intellectual Property": ["Intellectual Property"],
-            "Tax": ["Tax"],
-            "Employment": ["Employment"],
-            "Compliance": ["Data Protection", "Corporate Governance", "Securities Law"],
-            "Securities Law": ["Securities Law"],
-            "Banking": ["Banking"],
-            "Real Estate": ["Real Estate"]
+        stages = [internal, historical, *public_source_groups]
+        return {
+            "rag_context": {
+                "internal": internal or [],
+                "historical": historical or []
+            },
+            "public_sources": [source for group in public_source_groups for source in (group or [])],
+            "complete": all(stage is not None for stage in stages)
         }
+    
+    @staticmethod
+    async def _run_stage(coro, stage: str, timeout: float, default: Any) -> Any:
+        """Await a stage with a deadline, falling back to a default on timeout or error"""
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Stage '%s' exceeded its %.1fs deadline, continuing without it", stage, timeout)
+        except Exception as e:
+            logger.error("Stage '%s' failed: %s", stage, e)
+        return default
+    
+    @staticmethod
+    def _build_search_query(practice_area: str) -> str:
+        """Build search query focused on practice area context"""
+        return f"{practice_area} legal compliance risks regulations"
+    
+    @staticmethod
+    def _map_risk_areas(practice_area: str) -> List[str]:
+        """Map practice area (any casing or known synonym) to risk areas in database"""
+        for name, risk_areas in settings.PRACTICE_AREA_RISK_AREAS.items():
+            if normalize_practice_area(name) == normalize_practice_area(practice_area):
+                return risk_areas
+        return [practice_area]
+    
+    @metrics.timed("search_internal")
+    async def _search_internal_async(self, search_query: str) -> List[Dict[str, Any]]:
+        """Search the internal documents index"""
+        return await self.ai_search.search_internal_documents_async(search_query, 3)
+    
+    @metrics.timed("search_historical")
+    async def _search_historical_async(self, search_query: str) -> List[Dict[str, Any]]:
+        """Search the historical engagements index"""
+        return await self.ai_search.search_historical_data_async(search_query, 3)
+    
+    @metrics.timed("public_sources")
+    async def _query_public_sources_async(self, risk_area: str) -> List[Dict[str, Any]]:
+        """Query enriched public data sources for a single risk area"""
+        sources = await self.public_source_service.get_public_sources_async(
+            risk_area=risk_area,
+            enrichment_status="completed"
+        )
+        return sources[:3]  # Top 3 per risk area
+    
+    @metrics.timed("attorney_fetch")
+    async def _fetch_candidate_attorneys_async(self, practice_area: str) -> List[Dict[str, Any]]:
+        """Get attorneys with matching practice area, falling back to all attorneys"""
+        attorneys = self.attorney_roster.candidates(practice_area)
+        if attorneys is not None:
+            return attorneys
         
-        risk_areas = risk_area_mapping.get(practice_area, [practice_area])
-        logger.info(f"Mapped practice area '{practice_area}' to risk areas: {risk_areas}")
+        attorneys = await self.attorney_service.get_attorneys_async(practice_area=practice_area)
         
-        all_sources = []
-        for risk_area in risk_areas:
-            sources = self.public_source_service.get_public_sources(
-                risk_area=risk_area,
-                enrichment_status="completed"
-            )
-            all_sources.extend(sources[:3])  # Top 3 per risk area
+        if not attorneys:
+            logger.warning("No attorneys found for practice area, searching all attorneys...")
+            attorneys = await self.attorney_service.get_attorneys_async()
+        
+        return attorneys
+    
+    def _log_context_summary(
+        self,
+        rag_context: Dict[str, Any],
+        public_sources: List[Dict[str, Any]],
+        attorneys: Optional[List[Dict[str, Any]]]
+    ):
+        """Log what the retrieval stages produced"""
+        logger.info(
+            "Retrieved %d internal documents, %d historical engagements, "
+            "%d public sources, %s candidate attorneys",
+            len(rag_context['internal']), len(rag_context['historical']),
+            len(public_sources), len(attorneys) if attorneys is not None else "roster"
+        )
         
-        logger.info(f"Found {len(all_sources)} relevant public sources")
-        for idx, source in enumerate(all_sources, 1):
-            logger.info(f"\n  Source {idx}:")
-            logger.info(f"    Title: {source['title']}")
-            logger.info(f"    Risk Area: {source.get('risk_area', 'N/A')}")
-            logger.info(f"    Impact: {source.get('impact_level', 'N/A')}")
-            logger.info(f"    URL: {source['reference']['url']}")
+        if len(rag_context['internal']) == 0 and len(rag_context['historical']) == 0:
+            logger.warning("No RAG documents retrieved. Analysis will rely only on public sources.")
         
-        return all_sources
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, source in enumerate(public_sources, 1):
+                logger.debug(
+                    "Source %d: title=%r risk_area=%s impact=%s url=%s",
+                    idx, source['title'], source.get('risk_area', 'N/A'),
+                    source.get('impact_level', 'N/A'), source['reference']['url']
+                )
     
+    @metrics.timed("prompt_build")
     def _build_risk_analysis_prompt(
         self, 
         request: RiskAnalysisRequest,
         rag_context: Dict[str, Any],
         public_sources: List[Dict[str, Any]]
-    ) -> str:
+    ) -> Tuple[str, str]:
         """
         Build comprehensive prompt for LLM with all context
-        """
-        logger.info("\n" + "-"*80)
-        logger.info("STEP 3: BUILDING LLM PROMPT")
-        logger.info("-"*80)
         
-        # Build context sections - only include if we have content
-        internal_context = ""
-        if rag_context['internal']:
-            internal_docs = "\n\n".join([
-                f"[Internal Document: {doc['source']}]\n{doc['content'][:2000]}"
-                for doc in rag_context['internal'] if doc['content']
-            ])
-            if internal_docs:
-                internal_context = f"INTERNAL LEGAL KNOWLEDGE BASE:\n{internal_docs}\n\n"
-        
-        historical_context = ""
-        if rag_context['historical']:
-            historical_docs = "\n\n".join([
-                f"[Historical Engagement: {doc['source']}]\n{doc['content'][:2000]}"
-                for doc in rag_context['historical'] if doc['content']
-            ])
-            if historical_docs:
-                historical_context = f"HISTORICAL ENGAGEMENT DATA:\n{historical_docs}\n\n"
+        Returns:
+            The prompt and its context block (the part shared by every
+            company in the same practice area)
+        """
+        logger.info("Step 2: building LLM prompt")
         
-        public_context = ""
-        if public_sources:
-            public_docs = "\n\n".join([
-                f"[Public Source: {src['title']}]\n"
-                f"Risk Area: {src.get('risk_area', 'N/A')}\n"
-                f"Summary: {src.get('summary', 'N/A')}\n"
-                f"Impact: {src.get('impact_level', 'N/A')}\n"
-                f"Jurisdiction: {src.get('jurisdiction', 'N/A')}"
-                for src in public_sources
-            ])
-            public_context = f"RECENT PUBLIC LEGAL DEVELOPMENTS:\n{public_docs}\n\n"
+        context_block, packed = self._build_context_block(rag_context, public_sources)
         
         # Build the prompt
         prompt = f"""You are a legal risk analysis expert. Analyze potential legal risks for a company based on the provided context.
@@ -218,7 +638,7 @@ COMPANY INFORMATION:
 - Contact Email: {request.companyemail}
 - Contact Phone: {request.companyphonenumber}
 
-{internal_context}{historical_context}{public_context}
+{context_block}
 
 TASK:
 Based on the above context, identify 3-5 specific legal risks this company might face in the "{request.practicearea}" practice area.
@@ -243,108 +663,336 @@ Return your analysis as a JSON object with this structure:
 
 IMPORTANT: Return ONLY valid JSON, no additional text or markdown formatting."""
 
-        logger.info("Prompt built successfully")
-        logger.info(f"  - Prompt length: {len(prompt)} characters")
-        logger.info(f"  - Internal docs included: {len(rag_context['internal'])}")
-        logger.info(f"  - Historical docs included: {len(rag_context['historical'])}")
-        logger.info(f"  - Public sources included: {len(public_sources)}")
+        logger.info(
+            "Prompt built: %d characters, %d/%d context tokens, internal %d/%d, "
+            "historical %d/%d, public sources %d/%d",
+            len(prompt), packed['tokens'], self.prompt_packer.token_budget,
+            len(packed['internal']), len(rag_context['internal']),
+            len(packed['historical']), len(rag_context['historical']),
+            len(packed['public_sources']), len(public_sources)
+        )
+        log_payload(logger, "Full prompt sent to LLM", prompt)
+        
+        return prompt, context_block
+    
+    def _build_context_block(
+        self,
+        rag_context: Dict[str, Any],
+        public_sources: List[Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Pack retrieved context into the token budget and format its sections
         
-        logger.info("\n" + "-"*80)
-        logger.info("FULL PROMPT SENT TO LLM:")
-        logger.info("-"*80)
-        logger.info(prompt)
-        logger.info("-"*80)
+        Returns:
+            The context text for the prompt and the packing result
+        """
+        packed = self.prompt_packer.pack(rag_context, public_sources)
         
-        return prompt
+        # Build context sections - only include if we have content
+        internal_context = ""
+        if packed['internal']:
+            internal_docs = "\n\n".join([
+                f"[Internal Document: {doc['source']}]\n{doc['content']}"
+                for doc in packed['internal']
+            ])
+            internal_context = f"INTERNAL LEGAL KNOWLEDGE BASE:\n{internal_docs}\n\n"
+        
+        historical_context = ""
+        if packed['historical']:
+            historical_docs = "\n\n".join([
+                f"[Historical Engagement: {doc['source']}]\n{doc['content']}"
+                for doc in packed['historical']
+            ])
+            historical_context = f"HISTORICAL ENGAGEMENT DATA:\n{historical_docs}\n\n"
+        
+        public_context = ""
+        if packed['public_sources']:
+            public_docs = "\n\n".join([
+                self.prompt_packer.format_public_source(src)
+                for src in packed['public_sources']
+            ])
+            public_context = f"RECENT PUBLIC LEGAL DEVELOPMENTS:\n{public_docs}\n\n"
+        
+        return f"{internal_context}{historical_context}{public_context}", packed
     
-    def _get_llm_risk_analysis(
+    async def _repair_llm_response_async(
+        self,
+        messages: List[Dict[str, str]],
+        llm_response: str,
+        error: RiskResponseParseError,
+        public_sources: List[Dict[str, Any]]
+    ) -> Tuple[List[str], List[ReferenceItem], float]:
+        """
+        One retry that shows the model its invalid output and the parse error
+        
+        Raises RiskResponseParseError if the repaired output is still invalid.
+        """
+        metrics.increment("llm_repair_attempts")
+        logger.warning("LLM response invalid (%s), requesting repair", error)
+        response = await self.llm_resilience.complete_async(
+            messages=self._build_repair_messages(messages, llm_response, error),
+            **self._llm_request_options(repair=True)
+        )
+        result = self._parse_llm_risk_response(response.choices[0].message.content or "", public_sources)
+        metrics.increment("llm_repair_successes")
+        return result
+    
+    async def _get_llm_risk_analysis_async(
         self, 
         prompt: str, 
-        public_sources: List[Dict[str, Any]]
+        public_sources: List[Dict[str, Any]],
+        practice_area: str = None,
+        context_block: str = None,
+        use_cache: bool = True
     ) -> Tuple[List[str], List[ReferenceItem], float]:
         """
         Call Azure OpenAI to analyze risks
+        
+        When a context block is given, the semantic LLM cache is consulted
+        first (unless use_cache is False) and updated with fresh results.
+        Concurrent calls for the same context (e.g. a batch of companies in
+        one practice area) share a single in-flight LLM request.
         """
-        logger.info("\n" + "-"*80)
-        logger.info("STEP 4: LLM RISK ANALYSIS")
-        logger.info("-"*80)
-        logger.info(f"Model: {settings.AZURE_OPENAI_DEPLOYMENT_NAME}")
-        logger.info(f"Temperature: {settings.AZURE_OPENAI_TEMPERATURE}")
-        logger.info(f"Max Tokens: {settings.AZURE_OPENAI_MAX_TOKENS}")
+        cached = self._lookup_llm_cache(practice_area, context_block, public_sources, use_cache)
+        if cached is not None:
+            return cached
+        
+        if not use_cache or context_block is None:
+            return await self._call_llm_async(prompt, public_sources, practice_area, context_block)
+        
+        key = self.llm_cache.fingerprint(practice_area, context_block)
+        shared = self._llm_in_flight.get(key)
+        if shared is None:
+            # The call runs as its own task so that no single caller's
+            # cancellation can fail the others waiting on it
+            task = asyncio.ensure_future(
+                self._call_llm_async(prompt, public_sources, practice_area, context_block)
+            )
+            shared = self._llm_in_flight[key] = {"task": task, "waiters": 0}
+            task.add_done_callback(lambda _: self._forget_in_flight(key, shared))
+        else:
+            logger.info("Joining in-flight LLM analysis for '%s'", practice_area)
+        
+        shared['waiters'] += 1
+        try:
+            risks, references, confidence = await asyncio.shield(shared['task'])
+        finally:
+            shared['waiters'] -= 1
+            if shared['waiters'] == 0 and not shared['task'].done():
+                # Every caller gave up; later ones start a fresh call
+                self._forget_in_flight(key, shared)
+                shared['task'].cancel()
+        return list(risks), list(references), confidence
+    
+    def _forget_in_flight(self, key: str, shared: Dict[str, Any]):
+        """Drop a shared LLM call from the in-flight map unless a newer one replaced it"""
+        if self._llm_in_flight.get(key) is shared:
+            del self._llm_in_flight[key]
+    
+    @metrics.timed("llm")
+    async def _call_llm_async(
+        self,
+        prompt: str,
+        public_sources: List[Dict[str, Any]],
+        practice_area: str,
+        context_block: str
+    ) -> Tuple[List[str], List[ReferenceItem], float]:
+        """Single LLM call; successful results go into the LLM cache"""
+        self._log_llm_call()
+        metrics.increment("llm_calls")
         
+        messages = self._build_llm_messages(prompt)
         try:
-            response = self.llm_client.chat.completions.create(
-                model=settings.AZURE_OPENAI_DEPLOYMENT_NAME,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a legal risk analysis expert. Provide thorough, accurate risk assessments in JSON format."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=settings.AZURE_OPENAI_TEMPERATURE,
-                max_tokens=settings.AZURE_OPENAI_MAX_TOKENS
+            response = await self.llm_resilience.complete_async(
+                messages=messages,
+                **self._llm_request_options()
             )
             
-            llm_response = response.choices[0].message.content.strip()
-            
-            logger.info("\n" + "-"*80)
-            logger.info("LLM RAW RESPONSE:")
-            logger.info("-"*80)
-            logger.info(llm_response)
-            logger.info("-"*80)
-            
-            # Parse JSON response
-            # Remove markdown code blocks if present
-            if llm_response.startswith("```json"):
-                llm_response = llm_response.replace("```json", "").replace("```", "").strip()
-            elif llm_response.startswith("```"):
-                llm_response = llm_response.replace("```", "").strip()
-            
-            result = json.loads(llm_response)
-            
-            risks = result.get("risks", [])
-            confidence = result.get("confidence_score",85)
-            reasoning = result.get("reasoning", "")
-            
-            logger.info("\nLLM ANALYSIS PARSED:")
-            logger.info(f"  - Risks identified: {len(risks)}")
-            logger.info(f"  - Confidence score: {confidence:.2%}")
-            logger.info(f"  - Reasoning: {reasoning}")
-            
-            for idx, risk in enumerate(risks, 1):
-                logger.info(f"\n  Risk {idx}: {risk}")
-            
-            # Build references from public sources
-            references = [
-                ReferenceItem(
-                    label=f"{src.get('risk_area', 'Legal Update')} - {src['title'][:50]}...",
-                    url=src['reference']['url']
+            llm_response = response.choices[0].message.content or ""
+            try:
+                risks, references, confidence = self._parse_llm_risk_response(llm_response, public_sources)
+            except RiskResponseParseError as e:
+                risks, references, confidence = await self._repair_llm_response_async(
+                    messages, llm_response, e, public_sources
                 )
-                for src in public_sources[:5]  # Top 5 references
-            ]
-            
-            logger.info(f"\nGenerated {len(references)} reference links")
-            
+            self._remember_llm_analysis(practice_area, context_block, risks, confidence)
             return risks, references, confidence
             
         except Exception as e:
-            logger.error(f"LLM Error: {str(e)}")
-            # Fallback risks
-            return [
-                "General compliance risk in the specified practice area requires assessment",
-                "Regulatory changes may impact operations and require monitoring",
-                "Documentation and reporting requirements need review"
-            ], [], 50
+            logger.error("LLM Error: %s", e)
+            return self._degraded_risk_analysis(
+                practice_area, public_sources, circuit_open=isinstance(e, CircuitOpenError)
+            )
+    
+    def _remember_llm_analysis(
+        self,
+        practice_area: str,
+        context_block: str,
+        risks: List[str],
+        confidence: float
+    ):
+        """Keep a successful LLM result for the LLM cache and circuit breaker fallback"""
+        if context_block is not None:
+            self.llm_cache.store(practice_area, context_block, risks, confidence)
+        if practice_area is not None:
+            self._last_good_analysis[normalize_practice_area(practice_area)] = (list(risks), confidence)
     
+    def _degraded_risk_analysis(
+        self,
+        practice_area: str,
+        public_sources: List[Dict[str, Any]],
+        circuit_open: bool
+    ) -> Tuple[List[str], List[ReferenceItem], float]:
+        """
+        Result used when the LLM call fails: the last good analysis for the
+        practice area while the circuit breaker is open, else the fallback
+        """
+        last_good = None
+        if circuit_open and practice_area is not None:
+            last_good = self._last_good_analysis.get(normalize_practice_area(practice_area))
+        if last_good is not None:
+            metrics.increment("llm_last_good_served")
+            logger.warning("LLM circuit open, serving last good analysis for '%s'", practice_area)
+            risks, confidence = last_good
+            return list(risks), self._build_references(public_sources), confidence
+        
+        metrics.increment("llm_fallbacks")
+        return self._fallback_risk_analysis()
+    
+    def _is_cacheable(self, risks: List[str]) -> bool:
+        """Degraded results (fallback, or served while the breaker is open) are not cached"""
+        return risks != FALLBACK_RISKS and self.llm_resilience.breaker.state == "closed"
+    
+    def _lookup_llm_cache(
+        self,
+        practice_area: str,
+        context_block: str,
+        public_sources: List[Dict[str, Any]],
+        use_cache: bool
+    ) -> Tuple[List[str], List[ReferenceItem], float]:
+        """Reuse a cached LLM result for identical or near-identical context"""
+        if not use_cache or context_block is None:
+            return None
+        cached = self.llm_cache.lookup(practice_area, context_block)
+        if cached is None:
+            return None
+        risks, confidence = cached
+        logger.info("Reusing cached LLM analysis for '%s' (%d risks)", practice_area, len(risks))
+        return list(risks), self._build_references(public_sources), confidence
+    
+    def _log_llm_call(self):
+        """Log the LLM step banner and model settings"""
+        logger.info(
+            "Step 3: LLM risk analysis (model=%s temperature=%s max_tokens=%s response_format=%s)",
+            settings.AZURE_OPENAI_DEPLOYMENT_NAME, settings.AZURE_OPENAI_TEMPERATURE,
+            settings.AZURE_OPENAI_MAX_TOKENS, settings.AZURE_OPENAI_RESPONSE_FORMAT
+        )
+    
+    @staticmethod
+    def _llm_request_options(repair: bool = False) -> Dict[str, Any]:
+        """Model, sampling and response format arguments for the risk call"""
+        options = {
+            "model": settings.AZURE_OPENAI_DEPLOYMENT_NAME,
+            "temperature": 0 if repair else settings.AZURE_OPENAI_TEMPERATURE,
+            "max_tokens": settings.AZURE_OPENAI_MAX_TOKENS
+        }
+        if settings.AZURE_OPENAI_RESPONSE_FORMAT == "json_schema":
+            options["response_format"] = {
+                "type": "json_schema",
+                "json_schema": LLM_RISK_ASSESSMENT_SCHEMA
+            }
+        elif settings.AZURE_OPENAI_RESPONSE_FORMAT == "json_object":
+            options["response_format"] = {"type": "json_object"}
+        return options
+    
+    @staticmethod
+    def _build_repair_messages(
+        messages: List[Dict[str, str]],
+        llm_response: str,
+        error: RiskResponseParseError
+    ) -> List[Dict[str, str]]:
+        """Original conversation plus the invalid reply and what was wrong with it"""
+        return messages + [
+            {"role": "assistant", "content": llm_response},
+            {
+                "role": "user",
+                "content": (
+                    f"Your reply could not be used: {error}. Reply with only the corrected JSON object "
+                    'with keys "risks" (non-empty list of strings), "confidence_score" (number 1-100) '
+                    'and "reasoning" (string). Do not add any other text.'
+                )
+            }
+        ]
+    
+    @staticmethod
+    def _build_llm_messages(prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages for the risk analysis call"""
+        return [
+            {
+                "role": "system", 
+                "content": "You are a legal risk analysis expert. Provide thorough, accurate risk assessments in JSON format."
+            },
+            {
+                "role": "user", 
+                "content": prompt
+            }
+        ]
+    
+    def _parse_llm_risk_response(
+        self,
+        llm_response: str,
+        public_sources: List[Dict[str, Any]]
+    ) -> Tuple[List[str], List[ReferenceItem], float]:
+        """
+        Parse the raw LLM output and attach references from public sources
+        
+        Raises:
+            RiskResponseParseError: if the output is not a valid assessment
+        """
+        log_payload(logger, "LLM raw response", llm_response)
+        
+        try:
+            result = parse_risk_assessment(llm_response)
+        except RiskResponseParseError:
+            metrics.increment("llm_parse_failures")
+            raise
+        
+        risks = result.risks
+        confidence = result.confidence_score
+        reasoning = result.reasoning
+        
+        references = self._build_references(public_sources)
+        logger.info(
+            "LLM analysis parsed: %d risks, confidence %s%%, %d reference links",
+            len(risks), confidence, len(references)
+        )
+        logger.debug("LLM reasoning: %s", reasoning)
+        
+        return risks, references, confidence
+    
+    @staticmethod
+    def _build_references(public_sources: List[Dict[str, Any]]) -> List[ReferenceItem]:
+        """Build references from public sources"""
+        return [
+            ReferenceItem(
+                label=f"{src.get('risk_area', 'Legal Update')} - {src['title'][:50]}...",
+                url=src['reference']['url']
+            )
+            for src in public_sources[:5]  # Top 5 references
+        ]
+    
+    @staticmethod
+    def _fallback_risk_analysis() -> Tuple[List[str], List[ReferenceItem], float]:
+        """Fallback risks used when the LLM call or parsing fails"""
+        return list(FALLBACK_RISKS), [], 50
+    
+    @metrics.timed("matching")
     def _find_matching_attorneys(
         self, 
         practice_area: str,
         rag_context: Dict[str, Any],
-        top_n: int = 3
+        top_n: int = 3,
+        candidates: List[Dict[str, Any]] = None
     ) -> List[RecommendedAttorney]:
         """
         Find the top N matching attorneys based on practice area and experience
@@ -353,23 +1001,32 @@ IMPORTANT: Return ONLY valid JSON, no additional text or markdown formatting."""
             practice_area: Target practice area
             rag_context: RAG context with historical data
             top_n: Number of top attorneys to return (default: 3)
+            candidates: Attorneys fetched by the retrieval stage, used when
+                the roster has not been loaded
         """
-        logger.info("\n" + "-"*80)
-        logger.info("STEP 5: ATTORNEY MATCHING")
-        logger.info("-"*80)
-        logger.info(f"Target Practice Area: {practice_area}")
-        logger.info(f"Returning top {top_n} attorneys")
+        logger.info("Step 4: attorney matching for '%s' (top %d)", practice_area, top_n)
         
-        # Get attorneys with matching practice area
-        attorneys = self.attorney_service.get_attorneys(practice_area=practice_area)
+        # Score with the roster's prebuilt matrix, or one built from the
+        # candidates when the roster has not been loaded yet
+        matrix = self.attorney_roster.scoring_matrix()
+        practice_area_only = matrix is not None
+        if matrix is None:
+            matrix = AttorneyScoringMatrix(candidates or [])
         
-        logger.info(f"\nFound {len(attorneys)} attorneys in '{practice_area}'")
+        # Indexed engagements are in the matrix; the historical documents
+        # retrieved for this request add one engagement per attorney named,
+        # counted only for attorneys the index has not covered yet
+        historical_hits = []
+        for doc in rag_context.get('historical', []):
+            historical_hits.extend(set(ATTORNEY_ID_PATTERN.findall(doc.get('content', ''))))
+        historical_attorney_ids = set(historical_hits)
+        logger.debug("Historical attorney IDs found: %s", historical_attorney_ids)
         
-        if not attorneys:
-            logger.warning("No attorneys found for practice area, searching all attorneys...")
-            attorneys = self.attorney_service.get_attorneys()
+        top_attorneys = matrix.top_k(
+            practice_area, historical_hits, top_n, practice_area_only=practice_area_only
+        )
         
-        if not attorneys:
+        if not top_attorneys:
             logger.warning("No attorneys found in database")
             return [RecommendedAttorney(
                 name="General Counsel",
@@ -378,84 +1035,25 @@ IMPORTANT: Return ONLY valid JSON, no additional text or markdown formatting."""
                 match_score=0
             )]
         
-        # Extract attorney IDs from historical engagements
-        historical_attorney_ids = set()
-        for doc in rag_context.get('historical', []):
-            content = doc.get('content', '')
-            import re
-            ids = re.findall(r'ATT-[A-Z0-9]{8}', content)
-            historical_attorney_ids.update(ids)
-        
-        logger.info(f"\nHistorical Attorney IDs found: {historical_attorney_ids}")
-        
-        # Score all attorneys
-        attorney_scores = []
-        
-        for attorney in attorneys:
-            score = 0
-            
-            # Base score for practice area match
-            for pa in attorney.get('practice_areas', []):
-                if pa['area'] == practice_area:
-                    score += 40
-                    # Proficiency bonus
-                    proficiency_bonus = {
-                        'Expert': 20,
-                        'Advanced': 15,
-                        'Intermediate': 10,
-                        'Beginner': 5
-                    }
-                    score += proficiency_bonus.get(pa['proficiency'], 0)
-            
-            # Seniority bonus
-            seniority_bonus = {
-                'Senior Partner': 20,
-                'Partner': 15,
-                'Senior Associate': 10,
-                'Associate': 5
-            }
-            score += seniority_bonus.get(attorney['seniority'], 0)
-            
-            # Experience bonus
-            score += min(attorney['years_of_experience'], 20)
-            
-            # Historical engagement bonus
-            if attorney['attorney_id'] in historical_attorney_ids:
-                score += 30
-                logger.info(f"  Historical match bonus for {attorney['name']}!")
-            
-            attorney_scores.append({
-                'attorney': attorney,
-                'score': score
-            })
-            
-            logger.info(f"\n  Attorney: {attorney['name']}")
-            logger.info(f"    ID: {attorney['attorney_id']}")
-            logger.info(f"    Seniority: {attorney['seniority']}")
-            logger.info(f"    Experience: {attorney['years_of_experience']} years")
-            logger.info(f"    Practice Areas: {[pa['area'] for pa in attorney.get('practice_areas', [])]}")
-            logger.info(f"    Score: {score}")
-        
-        # Sort by score (descending)
-        attorney_scores.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Get top N attorneys
-        top_attorneys = attorney_scores[:top_n]
-        
         # Build RecommendedAttorney objects
         recommended_list = []
+        practice_area_key = normalize_practice_area(practice_area)
 
-        for idx, item in enumerate(top_attorneys, 1):
-            attorney = item['attorney']
-            score = item['score']
-            
+        for idx, (attorney, score) in enumerate(top_attorneys, 1):
             practice_areas_str = ", ".join([pa['area'] for pa in attorney.get('practice_areas', [])])
             if not practice_areas_str:
                 practice_areas_str = "General Practice"
             
             reason = f"Specializes in {practice_areas_str} with {attorney['years_of_experience']} years of experience. "
             
-            if attorney['attorney_id'] in historical_attorney_ids:
+            engagements = sum(
+                len(pa.get('linked_legal_documents') or [])
+                for pa in attorney.get('practice_areas', [])
+                if normalize_practice_area(pa['area']) == practice_area_key
+            )
+            if engagements:
+                reason += f"Has handled {engagements} similar matter{'s' if engagements != 1 else ''} based on historical engagements."
+            elif attorney['attorney_id'] in historical_attorney_ids:
                 reason += "Has handled similar matters based on historical engagements."
             
             # Remove "Match score: {score}/100" from reason
@@ -469,17 +1067,11 @@ IMPORTANT: Return ONLY valid JSON, no additional text or markdown formatting."""
                 email=attorney['email']
             ))
             
-            if idx == 1:
-                logger.info(f"\nTOP MATCH:")
-            else:
-                logger.info(f"\nRANK #{idx}:")
-            logger.info(f"  Name: {attorney['name']}")
-            logger.info(f"  Role: {attorney['seniority']}")
-            logger.info(f"  Match Score: {score}")  # Updated logging
-            logger.info(f"  Reason: {reason}")
+            logger.info("Rank #%d: %s (%s), match score %d", idx, attorney['name'], attorney['seniority'], score)
         
         return recommended_list
     
+    @metrics.timed("email")
     def _generate_email_template(
         self,
         request: RiskAnalysisRequest,
@@ -489,9 +1081,6 @@ IMPORTANT: Return ONLY valid JSON, no additional text or markdown formatting."""
         """
         Generate a professional email template
         """
-        logger.info("\n" + "-"*80)
-        logger.info("STEP 6: EMAIL TEMPLATE GENERATION")
-        logger.info("-"*80)
         
         risks_formatted = "\n".join([f"• {risk}" for risk in risks])
         
@@ -523,7 +1112,6 @@ IMPORTANT: Return ONLY valid JSON, no additional text or markdown formatting."""
     Legal Services Team
     """
         
-        logger.info("Email template generated")
-        logger.info(f"  - Length: {len(template)} characters")
+        logger.info("Step 5: email template generated (%d characters)", len(template))
         
         return template
\ No newline at end of file
@@ -0,0 +1,215 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from config import settings
+from risk_analysis_model import RiskAnalysisRequest
+from services.job_store import create_job_store
+from services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(Exception):
+    """The job queue has reached RISK_JOB_QUEUE_MAX_SIZE"""
+
+
+class RiskJobService:
+    """
+    Background execution of risk analyses submitted as jobs.
+
+    Submitted jobs go into a bounded queue drained by a fixed number of
+    worker tasks. Each worker runs the streaming pipeline, so the job record
+    gains partial stage results (attorneys, references, risks, email) as
+    they become available, then the final RiskAnalysisResponse.
+
+    The job store may be shared by several worker processes. A job is run
+    only by the worker that claims it, which renews its lease every third
+    of RISK_JOB_LEASE_SECONDS while the job runs. On start, jobs whose lease
+    expired (their worker stopped or died) are taken over and queued again,
+    up to the queue size; any beyond it are marked failed.
+    """
+
+    def __init__(self, risk_analysis_service):
+        self.risk_analysis_service = risk_analysis_service
+        self.store = create_job_store()
+        self.worker_count = settings.RISK_JOB_WORKERS
+        self.lease_seconds = settings.RISK_JOB_LEASE_SECONDS
+        # Identifies this process in the shared store's job leases
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the workers and the expiry task on the running event loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.RISK_JOB_QUEUE_MAX_SIZE)
+
+        # Jobs whose worker is gone; the oldest are requeued and jobs beyond
+        # the queue size are failed
+        recovered = self.store.recover_expired(self.owner, self.lease_seconds)
+        requeued = recovered[:settings.RISK_JOB_QUEUE_MAX_SIZE]
+        for job in requeued:
+            self._queue.put_nowait(job['job_id'])
+        for job in recovered[len(requeued):]:
+            self._update(job['job_id'], status="failed", error="Job queue was full after a restart, resubmit the job")
+            metrics.increment("risk_jobs_failed")
+        if recovered:
+            logger.info(
+                "Requeued %d risk analysis jobs with expired leases, failed %d that did not fit the queue",
+                len(requeued), len(recovered) - len(requeued)
+            )
+
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker(idx)) for idx in range(self.worker_count)]
+        self._tasks.append(loop.create_task(self._purge_loop()))
+
+    async def stop(self):
+        """Cancel the workers; unfinished jobs stay in the store"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    async def submit(self, request: RiskAnalysisRequest, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Queue a risk analysis and return its job record
+
+        Raises:
+            JobQueueFullError: if the queue is full
+        """
+        if self._queue is None or self._queue.full():
+            metrics.increment("risk_jobs_rejected")
+            raise JobQueueFullError("Risk analysis job queue is full, retry later")
+
+        now = datetime.utcnow().isoformat()
+        job = {
+            "job_id": f"JOB-{uuid.uuid4().hex.upper()}",
+            "status": "queued",
+            "request": request.dict(),
+            "use_cache": use_cache,
+            "stages": {},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        await asyncio.to_thread(self.store.create, job, self.owner, self.lease_seconds)
+        if self._queue.full():
+            # Filled up while the record was being written
+            metrics.increment("risk_jobs_rejected")
+            await self._update_async(job['job_id'], status="failed", error="Risk analysis job queue is full")
+            raise JobQueueFullError("Risk analysis job queue is full, retry later")
+        self._queue.put_nowait(job['job_id'])
+        metrics.increment("risk_jobs_submitted")
+        logger.info("Queued risk analysis job %s for %s", job['job_id'], request.companyName)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record, or None if unknown or expired"""
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and worker count"""
+        return {
+            "workers": self.worker_count,
+            "queued": self._queue.qsize() if self._queue is not None else 0
+        }
+
+    async def _worker(self, idx: int):
+        """Run queued jobs one at a time"""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.error("Risk job worker %d failed on %s: %s", idx, job_id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        """Claim one job and execute it while holding its lease"""
+        job = await asyncio.to_thread(self.store.claim, job_id, self.owner, self.lease_seconds)
+        if job is None:
+            logger.info("Risk analysis job %s is finished, expired or held by another worker", job_id)
+            return
+
+        lease = asyncio.create_task(self._keep_lease(job_id))
+        try:
+            await self._execute_job(job_id, job)
+        finally:
+            lease.cancel()
+
+    async def _keep_lease(self, job_id: str):
+        """Renew the lease on a running job until cancelled"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await asyncio.to_thread(self.store.renew, job_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.error("Lease renewal for risk analysis job %s failed: %s", job_id, e)
+                continue
+            if not renewed:
+                logger.warning("Lost the lease on risk analysis job %s", job_id)
+                return
+
+    async def _execute_job(self, job_id: str, job: Dict[str, Any]):
+        """Execute one job, recording stage results as they arrive"""
+        request = RiskAnalysisRequest(**job['request'])
+        stages: Dict[str, Any] = {}
+        # Stage results are written at most every RISK_JOB_STAGE_FLUSH_SECONDS
+        last_flush = float("-inf")
+
+        try:
+            async for event, data in self.risk_analysis_service.stream_company_risks(
+                request, use_cache=job.get('use_cache', True)
+            ):
+                if event == "complete":
+                    await self._update_async(job_id, status="completed", stages=self._copy_stages(stages), result=data)
+                    metrics.increment("risk_jobs_completed")
+                    return
+                if event == "risk":
+                    stages.setdefault("risks", []).append(data['risk'])
+                elif event == "email_template":
+                    stages["email_template"] = data['email_template']
+                else:
+                    stages[event] = data
+                if time.monotonic() - last_flush >= settings.RISK_JOB_STAGE_FLUSH_SECONDS:
+                    await self._update_async(job_id, stages=self._copy_stages(stages))
+                    last_flush = time.monotonic()
+            raise RuntimeError("Analysis ended without a result")
+        except asyncio.CancelledError:
+            raise  # Shutdown; the job is recovered once its lease expires
+        except Exception as e:
+            logger.error("Risk analysis job %s failed: %s", job_id, e)
+            await self._update_async(job_id, status="failed", stages=self._copy_stages(stages), error=str(e))
+            metrics.increment("risk_jobs_failed")
+
+    def _update(self, job_id: str, **fields):
+        """Update a job record and its timestamp"""
+        self.store.update(job_id, updated_at=datetime.utcnow().isoformat(), **fields)
+
+    async def _update_async(self, job_id: str, **fields):
+        """_update off the event loop (the SQLite store commits on every write)"""
+        await asyncio.to_thread(self._update, job_id, **fields)
+
+    @staticmethod
+    def _copy_stages(stages: Dict[str, Any]) -> Dict[str, Any]:
+        """Stages as of now, safe to serialize while the stream keeps appending risks"""
+        return {**stages, "risks": list(stages["risks"])} if "risks" in stages else dict(stages)
+
+    async def _purge_loop(self):
+        """Delete expired jobs periodically"""
+        while True:
+            await asyncio.sleep(settings.RISK_JOB_PURGE_INTERVAL_SECONDS)
+            try:
+                removed = self.store.purge_expired()
+                if removed:
+                    logger.info("Purged %d expired risk analysis jobs", removed)
+            except Exception as e:
+                logger.error("Risk job purge failed: %s", e)
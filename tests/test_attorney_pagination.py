@@ -0,0 +1,108 @@
+import pytest
+
+from config import settings
+from services.attorney_service import AttorneyService
+from services.partition_key_map import PartitionKeyMap
+
+
+class FakeDatabase:
+    """Partitioned attorneys with Cosmos-like paging; pages are capped at max_page"""
+
+    def __init__(self, partitions, others, max_page=4, empty_pages=False):
+        self.partitions = partitions
+        self.others = others
+        self.max_page = max_page
+        self.empty_pages = empty_pages
+
+    def query_page(self, container_name, query, parameters, page_size, continuation, partition_key):
+        items = self.partitions.get(partition_key, [])
+        start = int(continuation or 0)
+        if self.empty_pages and continuation is None and items:
+            # Cosmos may return an empty page that still has a continuation
+            return [], "0"
+        page = items[start:start + min(page_size, self.max_page)]
+        end = start + len(page)
+        return page, (str(end) if end < len(items) else None)
+
+    def query_items(self, container_name, query, parameters):
+        values = {param["name"]: param["value"] for param in parameters}
+        assert "ORDER BY c.id OFFSET @offset LIMIT @limit" in query
+        items = sorted(
+            (item for item in self.others if item.get("seniority") not in values["@seniority_levels"]),
+            key=lambda item: item["id"]
+        )
+        return items[values["@offset"]:values["@offset"] + values["@limit"]]
+
+
+def attorney(attorney_id, seniority):
+    return {"id": attorney_id, "attorney_id": attorney_id, "seniority": seniority}
+
+
+def service(db):
+    svc = AttorneyService.__new__(AttorneyService)
+    svc.db = db
+    svc.partition_keys = PartitionKeyMap(settings.ATTORNEY_CONTAINER, path="")
+    return svc
+
+
+def roster():
+    sizes = [7, 0, 12, 3]
+    partitions = {
+        level: [attorney(f"{idx}-{n}", level) for n in range(size)]
+        for idx, (level, size) in enumerate(zip(settings.SENIORITY_LEVELS, sizes))
+    }
+    others = [attorney(f"x{n}", seniority) for n, seniority in enumerate(["Counsel", None, "Intern", "Of Counsel", None])]
+    return partitions, others
+
+
+def all_pages(svc, page_size, **filters):
+    pages, continuation = [], None
+    while True:
+        page = svc.get_attorneys_page(page_size=page_size, continuation=continuation, **filters)
+        pages.append(page["attorneys"])
+        continuation = page["continuation"]
+        if continuation is None:
+            return pages
+
+
+@pytest.mark.parametrize("page_size", [1, 5, 100])
+@pytest.mark.parametrize("empty_pages", [False, True])
+def test_pages_cover_every_attorney_once(page_size, empty_pages):
+    partitions, others = roster()
+    pages = all_pages(service(FakeDatabase(partitions, others, empty_pages=empty_pages)), page_size)
+    ids = [item["id"] for page in pages for item in page]
+    expected = [item["id"] for items in partitions.values() for item in items] + sorted(item["id"] for item in others)
+    assert ids == expected
+    assert all(0 < len(page) <= page_size for page in pages)
+
+
+def test_seniority_filter_stays_in_its_partition():
+    partitions, others = roster()
+    pages = all_pages(service(FakeDatabase(partitions, others)), 5, seniority=settings.SENIORITY_LEVELS[2])
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert all(item["seniority"] == settings.SENIORITY_LEVELS[2] for page in pages for item in page)
+
+
+def test_continuation_round_trip():
+    token = AttorneyService._encode_continuation(2, "abc")
+    assert AttorneyService._decode_continuation(token, 3) == (2, "abc")
+    assert AttorneyService._decode_continuation(None, 3) == (0, None)
+
+
+@pytest.mark.parametrize("token", [
+    "not base64 json",
+    "eyJ4IjoxfQ==",
+    AttorneyService._encode_continuation(9, None),
+    AttorneyService._encode_continuation(-1, None),
+])
+def test_invalid_continuation(token):
+    with pytest.raises(ValueError, match="Invalid continuation token"):
+        service(FakeDatabase(*roster())).get_attorneys_page(continuation=token)
+
+
+def test_invalid_catch_all_offset():
+    catch_all = len(settings.SENIORITY_LEVELS)
+    with pytest.raises(ValueError):
+        service(FakeDatabase(*roster())).get_attorneys_page(
+            continuation=AttorneyService._encode_continuation(catch_all, "-3")
+        )
@@ -0,0 +1,96 @@
+import pytest
+
+from scripts.benchmark_attorney_scoring import PRACTICE_AREAS, loop_top_k, make_roster
+from services.attorney_scoring import (
+    HISTORICAL_ENGAGEMENT_BONUS,
+    REPEAT_ENGAGEMENT_BONUS,
+    AttorneyScoringMatrix,
+    engagement_bonus,
+    engagement_recency,
+)
+
+
+def ids_and_scores(pairs):
+    return [(attorney["attorney_id"], score) for attorney, score in pairs]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_top_k_matches_the_scoring_loop(seed, k):
+    attorneys = make_roster(500, seed)
+    historical_ids = {attorneys[idx]["attorney_id"] for idx in (3, 50, 499)}
+    matrix = AttorneyScoringMatrix(attorneys)
+    for practice_area in PRACTICE_AREAS[:4]:
+        expected = loop_top_k(attorneys, practice_area, historical_ids, k)
+        actual = matrix.top_k(practice_area, historical_ids, k)
+        assert ids_and_scores(actual) == ids_and_scores(expected)
+
+
+def test_top_k_handles_empty_roster_and_large_k():
+    assert AttorneyScoringMatrix([]).top_k("Tax") == []
+    attorneys = make_roster(4, 7)
+    assert len(AttorneyScoringMatrix(attorneys).top_k(PRACTICE_AREAS[0], k=10)) == 4
+
+
+def test_practice_area_only_limits_to_the_area():
+    attorneys = make_roster(200, 5)
+    matrix = AttorneyScoringMatrix(attorneys)
+    for attorney, _ in matrix.top_k("Tax", k=50, practice_area_only=True):
+        assert "Tax" in [pa["area"] for pa in attorney["practice_areas"]]
+
+
+def test_engagement_bonus_grows_with_count_and_decays_with_age():
+    bonuses = [engagement_bonus(count) for count in range(8)]
+    assert bonuses[0] == 0
+    # A single engagement keeps the flat bonus the matcher always gave
+    assert bonuses[1] == HISTORICAL_ENGAGEMENT_BONUS
+    assert bonuses == sorted(bonuses)
+    assert max(bonuses) == HISTORICAL_ENGAGEMENT_BONUS + REPEAT_ENGAGEMENT_BONUS
+    assert engagement_bonus(5, recency=0.5) == (HISTORICAL_ENGAGEMENT_BONUS + REPEAT_ENGAGEMENT_BONUS) // 2
+    assert engagement_recency(None) == 1.0
+    assert engagement_recency("not a date") == 1.0
+    assert engagement_recency("2020-01-01T00:00:00Z") < engagement_recency("2025-01-01T00:00:00")
+
+
+def test_indexed_and_request_engagements_add_up():
+    attorneys = [
+        {
+            "attorney_id": "A",
+            "seniority": "Partner",
+            "years_of_experience": 5,
+            "practice_areas": [{"area": "Tax", "proficiency": "Expert", "linked_legal_documents": ["d1", "d2"]}],
+        },
+        {
+            "attorney_id": "B",
+            "seniority": "Partner",
+            "years_of_experience": 5,
+            "practice_areas": [{"area": "Tax", "proficiency": "Expert"}],
+        },
+    ]
+    matrix = AttorneyScoringMatrix(attorneys)
+    base = 40 + 20 + matrix._base[1]
+    assert list(matrix.scores("taxation")) == [base + engagement_bonus(2), base]
+    assert list(matrix.scores("Tax", ["A", "B", "B", "unknown"])) == [base + engagement_bonus(3), base + engagement_bonus(2)]
+
+
+def test_request_hits_are_ignored_for_indexed_attorneys():
+    attorneys = [
+        {
+            "attorney_id": "A",
+            "seniority": "Partner",
+            "years_of_experience": 5,
+            "practice_areas": [{"area": "Tax", "proficiency": "Expert", "linked_legal_documents": ["d1"]}],
+            "engagement": {"matter_count": 1, "last_engaged_at": None},
+        },
+        {
+            "attorney_id": "B",
+            "seniority": "Partner",
+            "years_of_experience": 5,
+            "practice_areas": [{"area": "Tax", "proficiency": "Expert", "linked_legal_documents": []}],
+            "engagement": {"matter_count": 0, "last_engaged_at": None},
+        },
+    ]
+    matrix = AttorneyScoringMatrix(attorneys)
+    base = 40 + 20 + matrix._base[1]
+    # d1 retrieved again for this request names A and B; the index already counted it
+    assert list(matrix.scores("Tax", ["A", "B"])) == [base + HISTORICAL_ENGAGEMENT_BONUS, base]
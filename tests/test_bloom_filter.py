@@ -0,0 +1,24 @@
+from utils.bloom_filter import BloomFilter
+
+
+def test_no_false_negatives():
+    items = ["attorney%d@example.com" % idx for idx in range(5000)]
+    bloom = BloomFilter.from_items(items, capacity=1000)
+    assert all(item in bloom for item in items)
+    assert len(bloom) == len(items)
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    for idx in range(10000):
+        bloom.add("member-%d" % idx)
+    false_positives = sum("other-%d" % idx in bloom for idx in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_from_items_sizes_for_growth():
+    bloom = BloomFilter.from_items(["a", "b", "c"], capacity=2)
+    assert bloom.capacity == 6
+    bloom.add("d")
+    assert "d" in bloom
+    assert "e" not in BloomFilter(capacity=10)
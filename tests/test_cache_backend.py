@@ -0,0 +1,76 @@
+import pytest
+
+from config import settings
+from services.cache_backend import LRUCache, SQLiteCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "test", max_entries=3, ttl_seconds=60)
+    yield cache
+    cache._conn.close()
+
+
+def test_set_get_delete_clear(cache):
+    cache.set("a", {"risks": ["x"]})
+    assert cache.get("a") == {"risks": ["x"]}
+    assert cache.get("missing") is None
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.set("b", 1)
+    cache.clear()
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_are_shared_between_connections(cache):
+    other = SQLiteCache(cache.path, "test", max_entries=3, ttl_seconds=60)
+    cache.set("a", [1, 2])
+    assert other.get("a") == [1, 2]
+    assert SQLiteCache(cache.path, "other", max_entries=3, ttl_seconds=60).get("a") is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "test", max_entries=3, ttl_seconds=-1)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_reads_do_not_write(cache):
+    cache.set("a", 1)
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    for _ in range(10):
+        cache.get("a")
+    assert not [statement for statement in statements if not statement.startswith("SELECT")]
+
+
+def test_eviction_keeps_recently_read_entries(cache):
+    for key in "abc":
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+
+
+def test_pending_reads_are_flushed_after_the_interval(cache, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_SQLITE_TOUCH_FLUSH_SECONDS", 0)
+    cache.set("a", 1)
+    cache.get("a")
+    assert cache._touched == {}
+
+
+def test_incr(cache):
+    assert [cache.incr("n") for _ in range(3)] == [1, 2, 3]
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.incr("n") == 1
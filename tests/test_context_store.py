@@ -0,0 +1,82 @@
+import asyncio
+
+from config import settings
+from services.context_store import PracticeAreaContextStore
+from services.data_version import data_version
+from services.risk_analysis_service import RiskAnalysisService
+
+
+class FailingSearch:
+    """AI Search whose indexes are unreachable"""
+
+    async def search_internal_documents_async(self, query, top):
+        raise ConnectionError("search unavailable")
+
+    async def search_historical_data_async(self, query, top):
+        raise ConnectionError("search unavailable")
+
+
+class FakePublicSources:
+    async def get_public_sources_async(self, risk_area, enrichment_status):
+        return [{"title": f"{risk_area} update", "risk_area": risk_area}]
+
+
+def pipeline(search):
+    """Risk service with only the retrieval stages wired up"""
+    service = RiskAnalysisService.__new__(RiskAnalysisService)
+    service.ai_search = search
+    service.public_source_service = FakePublicSources()
+    return service
+
+
+def snapshot(label):
+    return {
+        "rag_context": {"internal": [{"content": label}], "historical": []},
+        "public_sources": [],
+        "complete": True
+    }
+
+
+def test_search_outage_marks_retrieval_incomplete():
+    retrieval = asyncio.run(pipeline(FailingSearch())._load_practice_area_context("Employment Law"))
+
+    assert retrieval["complete"] is False
+    assert retrieval["public_sources"]
+
+
+def test_outage_during_refresh_keeps_previous_snapshot():
+    area = next(iter(settings.PRACTICE_AREA_RISK_AREAS))
+    store = PracticeAreaContextStore(pipeline(FailingSearch())._load_practice_area_context)
+    store.put(area, snapshot("before outage"))
+
+    asyncio.run(store.refresh_all())
+
+    assert store.get(area)["rag_context"]["internal"] == [{"content": "before outage"}]
+
+
+def test_refresh_replaces_snapshot_when_complete():
+    area = next(iter(settings.PRACTICE_AREA_RISK_AREAS))
+
+    async def loader(practice_area):
+        return snapshot("refreshed")
+
+    store = PracticeAreaContextStore(loader)
+    store.put(area, snapshot("old"))
+
+    asyncio.run(store.refresh_all())
+
+    assert store.get(area)["rag_context"]["internal"] == [{"content": "refreshed"}]
+
+
+def test_data_change_invalidates_discovered_practice_areas():
+    configured = next(iter(settings.PRACTICE_AREA_RISK_AREAS))
+    store = PracticeAreaContextStore(None)
+    store.put(configured, snapshot("configured"))
+    store.put("Space Law", snapshot("discovered"))
+    assert store.get("space law") is not None
+
+    data_version.bump(settings.PUBLIC_DATA_CONTAINER)
+
+    assert store.get("Space Law") is None
+    # Configured areas keep serving until the background refresh replaces them
+    assert store.get(configured) is not None
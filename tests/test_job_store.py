@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+
+from services.job_store import InMemoryJobStore, SQLiteJobStore
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"), ttl_seconds=60)
+    else:
+        store = InMemoryJobStore(ttl_seconds=60)
+    yield store
+    store.close()
+
+
+def job(job_id, status="queued", created_at=""):
+    return {"job_id": job_id, "status": status, "stages": {}, "result": None, "created_at": created_at}
+
+
+def test_create_get_update(store):
+    store.create(job("J1"), "worker-a", 60)
+    store.update("J1", status="running", stages={"attorneys": [1]})
+    assert store.get("J1") == {
+        "job_id": "J1", "status": "running", "stages": {"attorneys": [1]}, "result": None, "created_at": ""
+    }
+    assert store.get("missing") is None
+    store.update("missing", status="failed")
+
+
+def test_only_one_worker_claims_a_job(store):
+    store.create(job("J1"), "worker-a", 60)
+
+    claimed = store.claim("J1", "worker-a", 60)
+
+    assert claimed["status"] == "running"
+    assert store.get("J1")["status"] == "running"
+    assert store.claim("J1", "worker-b", 60) is None
+
+
+def test_expired_lease_can_be_claimed_again(store):
+    store.create(job("J1"), "worker-a", 60)
+    store.claim("J1", "worker-a", -1)
+
+    assert store.claim("J1", "worker-b", 60) is not None
+    assert not store.renew("J1", "worker-a", 60)
+    assert store.renew("J1", "worker-b", 60)
+
+
+def test_finished_jobs_are_not_claimed(store):
+    store.create(job("J1"), "worker-a", -1)
+    store.update("J1", status="completed")
+
+    assert store.claim("J1", "worker-b", 60) is None
+    assert store.recover_expired("worker-b", 60) == []
+
+
+def test_recover_takes_only_expired_leases(store):
+    store.create(job("J1", created_at="2"), "worker-a", -1)
+    store.create(job("J2", created_at="1"), "worker-a", -1)
+    store.claim("J2", "worker-a", -1)
+    store.create(job("J3"), "worker-a", 60)
+    store.create(job("J4"), "worker-a", 60)
+    store.claim("J4", "worker-a", 60)
+
+    recovered = store.recover_expired("worker-b", 60)
+
+    assert [record["job_id"] for record in recovered] == ["J2", "J1"]
+    assert all(record["status"] == "queued" for record in recovered)
+    # Now leased to worker-b, so a second recovery finds nothing
+    assert store.recover_expired("worker-c", 60) == []
+
+
+def test_expired_jobs_are_hidden_and_purged(store):
+    store.ttl_seconds = -1
+    store.create(job("J1"), "worker-a", -1)
+    assert store.get("J1") is None
+    assert store.claim("J1", "worker-a", 60) is None
+    assert store.recover_expired("worker-a", 60) == []
+    assert store.purge_expired() == 1
+
+
+def test_sqlite_records_survive_reopening(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = SQLiteJobStore(path, ttl_seconds=60)
+    first.create(job("J1"), "worker-a", 60)
+    first.close()
+    second = SQLiteJobStore(path, ttl_seconds=60)
+    assert second.get("J1")["status"] == "queued"
+    second.close()
+
+
+def test_sqlite_store_adds_lease_columns_to_existing_table(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE risk_jobs (job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+        "record TEXT NOT NULL, expires_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO risk_jobs VALUES ('J1', 'running', '{\"job_id\": \"J1\", \"status\": \"running\"}', 9e12)"
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteJobStore(path, ttl_seconds=60)
+    assert [record["job_id"] for record in store.recover_expired("worker-a", 60)] == ["J1"]
+    store.close()
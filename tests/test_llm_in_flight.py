@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from services.llm_response_cache import SemanticResponseCache
+from services.risk_analysis_service import RiskAnalysisService
+
+
+def service_with_llm(delay=0.05):
+    """Risk service whose LLM call is a counted stub"""
+    service = RiskAnalysisService.__new__(RiskAnalysisService)
+    service.llm_cache = SemanticResponseCache()
+    service._llm_in_flight = {}
+    service.llm_calls = 0
+
+    async def call_llm(prompt, public_sources, practice_area, context_block):
+        service.llm_calls += 1
+        await asyncio.sleep(delay)
+        return [f"risk {service.llm_calls}"], [], 80
+
+    service._call_llm_async = call_llm
+    return service
+
+
+def analyze(service, context_block="shared context"):
+    return service._get_llm_risk_analysis_async(
+        "prompt", [], practice_area="Employment Law", context_block=context_block, use_cache=True
+    )
+
+
+def test_concurrent_calls_share_one_llm_request():
+    service = service_with_llm()
+
+    async def run():
+        return await asyncio.gather(analyze(service), analyze(service), analyze(service))
+
+    results = asyncio.run(run())
+
+    assert service.llm_calls == 1
+    assert all(result == (["risk 1"], [], 80) for result in results)
+    assert service._llm_in_flight == {}
+
+
+def test_different_context_is_not_shared():
+    service = service_with_llm()
+
+    async def run():
+        return await asyncio.gather(analyze(service, "context a"), analyze(service, "context b"))
+
+    asyncio.run(run())
+
+    assert service.llm_calls == 2
+
+
+def test_cancelling_the_first_caller_does_not_fail_joiners():
+    service = service_with_llm()
+
+    async def run():
+        first = asyncio.ensure_future(analyze(service))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(analyze(service))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await joiner
+
+    assert asyncio.run(run()) == (["risk 1"], [], 80)
+    assert service.llm_calls == 1
+
+
+def test_shared_call_is_cancelled_when_every_caller_gives_up():
+    service = service_with_llm(delay=10)
+
+    async def run():
+        caller = asyncio.ensure_future(analyze(service))
+        await asyncio.sleep(0.01)
+        task = next(iter(service._llm_in_flight.values()))['task']
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        return task
+
+    task = asyncio.run(run())
+
+    assert task.cancelled()
+    assert service._llm_in_flight == {}
@@ -0,0 +1,224 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from config import settings
+from services.llm_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMDeadlineExceeded,
+    ResilientLLMClient
+)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncClient:
+    """chat.completions.create running one scripted attempt per call"""
+
+    def __init__(self, *attempts):
+        self.attempts = list(attempts)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        attempt = self.attempts[min(self.calls, len(self.attempts) - 1)]
+        self.calls += 1
+        return await attempt()
+
+
+def answer(value, delay=0.0):
+    async def attempt():
+        await asyncio.sleep(delay)
+        return value
+    return attempt
+
+
+def fail(error=ConnectionError("LLM unavailable")):
+    async def attempt():
+        raise error
+    return attempt
+
+
+def resilient(client, threshold=2, reset_seconds=0.0):
+    llm = ResilientLLMClient(client)
+    llm.breaker = CircuitBreaker(failure_threshold=threshold, reset_seconds=reset_seconds)
+    return llm
+
+
+def open_breaker(llm):
+    for _ in range(llm.breaker.failure_threshold):
+        llm.breaker.record_failure()
+    assert llm.breaker.state == "open"
+
+
+def test_breaker_opens_after_consecutive_failures_and_rejects_calls():
+    llm = resilient(FakeAsyncClient(fail()), reset_seconds=60)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            asyncio.run(llm.complete_async(messages=[]))
+
+    assert llm.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(llm.complete_async(messages=[]))
+    assert llm.async_client.calls == 2
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_breaker():
+    llm = resilient(FakeAsyncClient(fail()))
+    open_breaker(llm)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(llm.complete_async(messages=[]))
+
+    assert llm.breaker.state == "open"
+
+
+def test_successful_trial_closes_breaker():
+    llm = resilient(FakeAsyncClient(answer("ok")))
+    open_breaker(llm)
+
+    assert asyncio.run(llm.complete_async(messages=[])) == "ok"
+    assert llm.breaker.state == "closed"
+
+
+def test_cancelled_trial_releases_half_open_slot():
+    llm = resilient(FakeAsyncClient(answer("late", delay=10)))
+    open_breaker(llm)
+
+    async def cancel_trial():
+        call = asyncio.ensure_future(llm.complete_async(messages=[]))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(cancel_trial())
+
+    assert llm.breaker.state == "half_open"
+    assert llm.breaker.allow()
+
+
+def test_stream_closed_before_reading_releases_half_open_slot():
+    upstream = FakeStream(["a", "b"])
+    llm = resilient(FakeAsyncClient(answer(upstream)))
+    open_breaker(llm)
+
+    async def open_and_close():
+        stream = await llm.complete_async(messages=[], stream=True)
+        await stream.aclose()
+
+    asyncio.run(open_and_close())
+
+    assert upstream.closed
+    assert llm.breaker.allow()
+
+
+def test_stream_read_to_the_end_closes_breaker():
+    upstream = FakeStream(["a", "b"])
+    llm = resilient(FakeAsyncClient(answer(upstream)))
+    open_breaker(llm)
+
+    async def read_all():
+        stream = await llm.complete_async(messages=[], stream=True)
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(read_all()) == ["a", "b"]
+    assert llm.breaker.state == "closed"
+    assert upstream.closed
+
+
+def test_deadline_exceeded_counts_as_failure():
+    llm = resilient(FakeAsyncClient(answer("late", delay=10)), threshold=5)
+    llm.deadline_seconds = 0.05
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(llm.complete_async(messages=[]))
+
+    assert llm.breaker.consecutive_failures == 1
+
+
+def hedging(llm, monkeypatch, delay=0.05):
+    """Enable hedging with a warmed-up latency window"""
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.0)
+    llm.hedge_enabled = True
+    llm._latencies.extend([delay] * 3)
+    return llm
+
+
+def test_no_hedge_delay_until_enough_samples(monkeypatch):
+    llm = resilient(FakeAsyncClient(answer("ok")))
+    llm.hedge_enabled = True
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.0)
+
+    assert llm.hedge_delay() is None
+    llm._latencies.extend([0.2, 0.4, 0.6])
+    assert llm.hedge_delay() == 0.6
+
+
+def test_slow_first_attempt_is_hedged(monkeypatch):
+    client = FakeAsyncClient(answer("slow", delay=10), answer("hedge"))
+    llm = hedging(resilient(client), monkeypatch)
+
+    assert asyncio.run(llm.complete_async(messages=[])) == "hedge"
+    assert client.calls == 2
+
+
+def test_failed_first_attempt_is_hedged_immediately(monkeypatch):
+    client = FakeAsyncClient(fail(), answer("hedge"))
+    llm = hedging(resilient(client), monkeypatch, delay=10)
+
+    assert asyncio.run(llm.complete_async(messages=[])) == "hedge"
+    assert llm.breaker.consecutive_failures == 0
+
+
+def test_fast_first_attempt_is_not_hedged(monkeypatch):
+    client = FakeAsyncClient(answer("first"), answer("hedge"))
+    llm = hedging(resilient(client), monkeypatch, delay=10)
+
+    assert asyncio.run(llm.complete_async(messages=[])) == "first"
+    assert client.calls == 1
+
+
+def test_streams_are_not_hedged(monkeypatch):
+    client = FakeAsyncClient(answer(FakeStream(["a"]), delay=0.1), answer(FakeStream(["b"])))
+    llm = hedging(resilient(client), monkeypatch, delay=0.01)
+
+    async def read_all():
+        stream = await llm.complete_async(messages=[], stream=True)
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(read_all()) == ["a"]
+    assert client.calls == 1
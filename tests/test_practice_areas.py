@@ -0,0 +1,28 @@
+import pytest
+
+from utils.practice_areas import normalize_practice_area, practice_area_keys
+
+
+@pytest.mark.parametrize("variant, canonical", [
+    ("compliance", "Compliance"),
+    ("  Corporate   M&A ", "Corporate M and A"),
+    ("M&A", "Corporate M&A"),
+    ("IP", "Intellectual Property"),
+    ("Labor & Employment", "Employment"),
+    ("Data-Protection", "Data Privacy"),
+])
+def test_variants_share_a_key(variant, canonical):
+    assert normalize_practice_area(variant) == normalize_practice_area(canonical)
+
+
+def test_distinct_areas_stay_distinct():
+    assert normalize_practice_area("Tax") != normalize_practice_area("Litigation")
+
+
+def test_empty_area():
+    assert normalize_practice_area(None) == ""
+
+
+def test_practice_area_keys_are_distinct_and_ordered():
+    areas = [{"area": "Tax"}, {"area": "IP"}, {"area": "taxation"}, {"area": ""}]
+    assert practice_area_keys(areas) == ["tax", "intellectual property"]
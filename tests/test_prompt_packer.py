@@ -0,0 +1,76 @@
+import pytest
+
+from services.prompt_packer import PromptPacker
+
+
+@pytest.fixture
+def packer():
+    packer = PromptPacker()
+    # Deterministic word-based counts, independent of tiktoken downloads
+    packer.counter.encoding = None
+    packer.chunk_max_tokens = 12
+    return packer
+
+
+def test_split_keeps_short_paragraphs_whole(packer):
+    text = "First paragraph here.\n\n  Second   paragraph\nwraps.  \n\n\n"
+    assert packer.split(text) == ["First paragraph here.", "Second paragraph wraps."]
+
+
+def test_split_breaks_long_paragraphs_at_sentences(packer):
+    sentences = ["Sentence number %d has a few words." % idx for idx in range(6)]
+    chunks = packer.split(" ".join(sentences))
+    assert len(chunks) > 1
+    assert " ".join(chunks) == " ".join(sentences)
+    for chunk in chunks:
+        assert chunk.endswith(".")
+        assert packer.counter.count(chunk) <= packer.chunk_max_tokens
+
+
+def test_split_breaks_oversized_sentences_by_words(packer):
+    sentence = " ".join("word%d" % idx for idx in range(40))
+    chunks = packer.split(sentence)
+    assert " ".join(chunks) == sentence
+    assert all(packer.counter.count(chunk) <= packer.chunk_max_tokens for chunk in chunks)
+
+
+def rag_context():
+    return {
+        "internal": [
+            {"source": "low.docx", "score": 1.0, "content": "Low relevance text. " * 5},
+            {"source": "high.docx", "score": 4.0, "content": "High relevance text. " * 5},
+        ],
+        "historical": [
+            {"source": "empty.txt", "score": 9.0, "content": ""},
+        ],
+    }
+
+
+def public_sources():
+    return [
+        {"title": "Low impact", "impact_level": "Low"},
+        {"title": "High impact", "impact_level": "High"},
+    ]
+
+
+def test_pack_respects_the_budget_and_prefers_higher_scores(packer):
+    packed = packer.pack(rag_context(), public_sources(), token_budget=60)
+    assert packed["tokens"] <= 60
+    assert [doc["source"] for doc in packed["internal"]] == ["high.docx"]
+    # The second chunk did not fit but the smaller third one did
+    assert "\n[...]\n" in packed["internal"][0]["content"]
+    assert packed["historical"] == []
+    assert [src["title"] for src in packed["public_sources"]] == ["High impact"]
+
+
+def test_pack_keeps_everything_with_a_large_budget(packer):
+    packed = packer.pack(rag_context(), public_sources(), token_budget=10000)
+    # Retrieval order is kept in the output, empty documents are skipped
+    assert [doc["source"] for doc in packed["internal"]] == ["low.docx", "high.docx"]
+    assert [src["title"] for src in packed["public_sources"]] == ["Low impact", "High impact"]
+    assert packed["internal"][1]["content"].replace("\n", " ") == ("High relevance text. " * 5).strip()
+
+
+def test_pack_marks_skipped_chunks(packer):
+    chunks = [{"chunk_idx": 0, "text": "a"}, {"chunk_idx": 1, "text": "b"}, {"chunk_idx": 3, "text": "d"}]
+    assert packer._join_chunks(chunks) == "a\nb\n[...]\nd"
@@ -0,0 +1,50 @@
+import pytest
+
+from services.database_service import QueryBuilder
+
+
+def test_no_filters():
+    assert QueryBuilder().build() == ("SELECT * FROM c", [])
+
+
+def test_conditions_and_parameters():
+    query, parameters = (
+        QueryBuilder("VALUE c.email")
+        .where("c.seniority = @seniority", seniority="Partner")
+        .where("c.years_of_experience >= @min_experience", min_experience=5)
+        .build()
+    )
+    assert query == (
+        "SELECT VALUE c.email FROM c WHERE c.seniority = @seniority "
+        "AND c.years_of_experience >= @min_experience"
+    )
+    assert parameters == [
+        {"name": "@seniority", "value": "Partner"},
+        {"name": "@min_experience", "value": 5},
+    ]
+
+
+def test_values_are_never_interpolated():
+    query, parameters = QueryBuilder().where("c.name = @name", name="O'Brien\" OR 1=1").build()
+    assert "O'Brien" not in query
+    assert parameters[0]["value"] == "O'Brien\" OR 1=1"
+
+
+def test_where_in():
+    query, parameters = QueryBuilder().where_in("c.email", "email", ["a@x.com", "b@x.com"]).build()
+    assert query == "SELECT * FROM c WHERE c.email IN (@email0, @email1)"
+    assert [param["value"] for param in parameters] == ["a@x.com", "b@x.com"]
+
+
+def test_rebinding_a_parameter():
+    builder = QueryBuilder().where("c.a = @value", value=1).where("c.b = @value", value=1)
+    assert len(builder.build()[1]) == 1
+    with pytest.raises(ValueError):
+        builder.where("c.c = @value", value=2)
+
+
+def test_order_by_and_offset_limit():
+    query, parameters = QueryBuilder().where("c.x = @x", x=1).order_by("c.id").offset_limit(20, 10).build()
+    assert query == "SELECT * FROM c WHERE c.x = @x ORDER BY c.id OFFSET @offset LIMIT @limit"
+    assert {"name": "@offset", "value": 20} in parameters
+    assert {"name": "@limit", "value": 10} in parameters
@@ -0,0 +1,242 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from config import settings
+from risk_analysis_model import RiskAnalysisRequest
+from services.attorney_roster import AttorneyRosterIndex
+from services.context_store import PracticeAreaContextStore
+from services.llm_resilience import CircuitBreaker, ResilientLLMClient
+from services.llm_response_cache import SemanticResponseCache
+from services.prompt_packer import PromptPacker
+from services.risk_analysis_cache import RiskAnalysisCache
+from services.risk_analysis_service import FALLBACK_RISKS, RiskAnalysisService
+
+ASSESSMENT = {
+    "risks": ["Wage and hour claims", "Misclassified contractors", "Outdated handbook"],
+    "confidence_score": 80,
+    "reasoning": "Historical engagements"
+}
+
+
+class FakeLLM:
+    """Async chat client answering every call with ASSESSMENT, or failing"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, stream=False, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("LLM unavailable")
+        text = json.dumps(ASSESSMENT)
+        if stream:
+            return FakeStream([text[i:i + 16] for i in range(0, len(text), 16)])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class FakeStream:
+    def __init__(self, pieces):
+        self.pieces = list(pieces)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.pieces:
+            raise StopAsyncIteration
+        delta = SimpleNamespace(content=self.pieces.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        pass
+
+
+class FakeSearch:
+    def __init__(self):
+        self.calls = 0
+
+    async def search_internal_documents_async(self, query, top):
+        self.calls += 1
+        return [{"content": f"Internal guidance on {query}", "source": "guide.pdf"}]
+
+    async def search_historical_data_async(self, query, top):
+        return [{"content": "Matter handled by ATT-AAAA0001", "source": "matter.txt"}]
+
+
+class FakePublicSources:
+    async def get_public_sources_async(self, risk_area, enrichment_status):
+        return [{
+            "title": f"New {risk_area} rules",
+            "risk_area": risk_area,
+            "summary": "Summary",
+            "reference": {"url": "https://example.com/rules"}
+        }]
+
+
+class FakeAttorneys:
+    async def get_attorneys_async(self, practice_area=None):
+        return [{
+            "attorney_id": "ATT-AAAA0001",
+            "name": "Dana Reyes",
+            "email": "dana@example.com",
+            "seniority": "Partner",
+            "years_of_experience": 12,
+            "practice_areas": [{"area": "Employment Law", "proficiency": "Expert"}]
+        }]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Risk service wired to in-process fakes instead of Azure"""
+    monkeypatch.setattr(settings, "RISK_CACHE_ENABLED", True)
+    service = RiskAnalysisService.__new__(RiskAnalysisService)
+    service.ai_search = FakeSearch()
+    service.public_source_service = FakePublicSources()
+    service.attorney_service = FakeAttorneys()
+    service.async_llm_client = FakeLLM()
+    service.llm_resilience = ResilientLLMClient(service.async_llm_client)
+    service._last_good_analysis = {}
+    service.result_cache = RiskAnalysisCache()
+    service.context_store = PracticeAreaContextStore(service._load_practice_area_context)
+    service.attorney_roster = AttorneyRosterIndex(service.attorney_service.get_attorneys_async)
+    service.llm_cache = SemanticResponseCache()
+    service._llm_in_flight = {}
+    service.prompt_packer = PromptPacker()
+    return service
+
+
+def request(company="Acme Manufacturing", practice_area="Employment Law"):
+    return RiskAnalysisRequest(
+        companyName=company,
+        companyemail="contact@acme.com",
+        companyphonenumber="+1-555-0100",
+        practicearea=practice_area
+    )
+
+
+def test_repeated_request_is_served_from_the_result_cache(service):
+    first = asyncio.run(service.analyze_company_risks_async(request()))
+    second = asyncio.run(service.analyze_company_risks_async(request(company="  acme MANUFACTURING ")))
+
+    assert first.risks == ASSESSMENT["risks"]
+    assert second == first
+    assert service.async_llm_client.calls == 1
+    assert first.recommended_attorneys[0].attorney_id == "ATT-AAAA0001"
+
+
+def test_use_cache_false_runs_the_pipeline_again(service):
+    asyncio.run(service.analyze_company_risks_async(request()))
+    asyncio.run(service.analyze_company_risks_async(request(), use_cache=False))
+
+    assert service.async_llm_client.calls == 2
+
+
+def test_llm_result_is_reused_for_another_company_with_the_same_context(service):
+    asyncio.run(service.analyze_company_risks_async(request("Acme Manufacturing")))
+    other = asyncio.run(service.analyze_company_risks_async(request("Globex")))
+
+    assert other.company == "Globex"
+    assert other.risks == ASSESSMENT["risks"]
+    assert service.async_llm_client.calls == 1
+    # Retrieval came from the context store the first request filled
+    assert service.ai_search.calls == 1
+
+
+def test_fallback_results_are_not_cached(service):
+    service.llm_resilience.async_client.fail = True
+
+    result = asyncio.run(service.analyze_company_risks_async(request()))
+
+    assert result.risks == FALLBACK_RISKS
+    assert service.result_cache.get(request()) is None
+    assert service.llm_cache.lookup("Employment Law", "anything") is None
+
+
+def test_batch_shares_retrieval_per_practice_area_and_keeps_order(service):
+    requests = [
+        request("Acme", "Employment Law"),
+        request("Globex", "Intellectual Property"),
+        request("Initech", "Employment Law"),
+    ]
+
+    batch = asyncio.run(service.analyze_batch_async(requests))
+
+    assert [item.company for item in batch.results] == ["Acme", "Globex", "Initech"]
+    assert batch.succeeded == 3 and batch.failed == 0
+    assert service.ai_search.calls == 2
+
+
+def test_batch_reports_item_failures_without_failing_the_batch(service):
+    def broken_email(request, attorney, risks):
+        if request.companyName == "Globex":
+            raise ValueError("template error")
+        return "email"
+
+    service._generate_email_template = broken_email
+
+    batch = asyncio.run(service.analyze_batch_async([request("Acme"), request("Globex")]))
+
+    assert [item.status for item in batch.results] == ["completed", "failed"]
+    assert batch.results[1].error == "template error"
+
+
+def collect(stream):
+    async def run():
+        return [event async for event in stream]
+    return asyncio.run(run())
+
+
+def test_stream_emits_stages_in_order_then_the_complete_response(service):
+    events = collect(service.stream_company_risks(request()))
+    names = [name for name, _ in events]
+
+    assert names[:2] == ["attorneys", "references"]
+    assert names[-2:] == ["email_template", "complete"]
+    assert [data["risk"] for name, data in events if name == "risk"] == ASSESSMENT["risks"]
+    assert events[-1][1]["risks"] == ASSESSMENT["risks"]
+
+
+def test_stream_replays_a_cached_result(service):
+    collect(service.stream_company_risks(request()))
+    replay = collect(service.stream_company_risks(request()))
+
+    assert service.async_llm_client.calls == 1
+    assert [data["risk"] for name, data in replay if name == "risk"] == ASSESSMENT["risks"]
+    assert replay[-1][0] == "complete"
+
+
+def test_stream_llm_cache_hit_is_not_cached_while_breaker_is_open(service):
+    collect(service.stream_company_risks(request("Acme")))
+    service.llm_resilience.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    service.llm_resilience.breaker.record_failure()
+
+    events = collect(service.stream_company_risks(request("Globex")))
+
+    assert events[-1][1]["risks"] == ASSESSMENT["risks"]
+    assert service.result_cache.get(request("Globex")) is None
+
+
+def test_batch_groups_spellings_of_one_practice_area(service):
+    requests = [request("Acme", "Employment Law"), request("Globex", "  employment   LAW ")]
+
+    batch = asyncio.run(service.analyze_batch_async(requests))
+
+    assert batch.succeeded == 2
+    assert service.ai_search.calls == 1
+    assert service.async_llm_client.calls == 1
+
+
+def test_last_good_analysis_is_shared_across_spellings(service):
+    asyncio.run(service.analyze_company_risks_async(request("Acme", "Employment Law")))
+    service.llm_resilience.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    service.llm_resilience.breaker.record_failure()
+
+    risks, _, confidence = service._degraded_risk_analysis("EMPLOYMENT law", [], circuit_open=True)
+
+    assert risks == ASSESSMENT["risks"]
+    assert confidence == ASSESSMENT["confidence_score"]
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from utils.stream_parser import IncrementalRiskParser, RiskResponseParseError, parse_risk_assessment
+
+RESPONSE = json.dumps({
+    "risks": ["Sanctions exposure in \"Region\" A", "Data retention, backups", "Late filings"],
+    "confidence_score": 72,
+    "reasoning": "Based on the sources"
+})
+
+
+def feed_in_chunks(parser, text, size):
+    completed = []
+    for start in range(0, len(text), size):
+        completed.append(parser.feed(text[start:start + size]))
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, len(RESPONSE)])
+def test_incremental_parser_yields_each_risk_once_in_order(size):
+    parser = IncrementalRiskParser()
+    emitted = [risk for batch in feed_in_chunks(parser, RESPONSE, size) for risk in batch]
+    assert emitted == json.loads(RESPONSE)["risks"]
+    assert parser.risks == emitted
+    assert parser.text == RESPONSE
+
+
+def test_incremental_parser_waits_for_the_closing_quote():
+    parser = IncrementalRiskParser()
+    assert parser.feed('{"risks": ["First ri') == []
+    assert parser.feed('sk", "Sec') == ["First risk"]
+    assert parser.feed('ond"]') == ["Second"]
+
+
+def test_incremental_parser_ignores_text_after_the_array():
+    parser = IncrementalRiskParser()
+    parser.feed('{"risks": ["A"], "reasoning": "not a risk", "other": ["B"]}')
+    assert parser.risks == ["A"]
+    assert parser.result().risks == ["A"]
+
+
+def test_parse_risk_assessment_tolerates_fences_and_prose():
+    assessment = parse_risk_assessment(f"Here you go:\n```json\n{RESPONSE}\n```\nThanks")
+    assert assessment.risks[0] == 'Sanctions exposure in "Region" A'
+    assert assessment.confidence_score == 72
+
+
+@pytest.mark.parametrize("text, message", [
+    ("no json here", "No JSON object"),
+    ('{"risks": ["A", }', "Invalid JSON"),
+    ('{"risks": []}', "does not match the schema"),
+    ('{"risks": ["A"], "confidence_score": 500}', "confidence_score"),
+])
+def test_parse_risk_assessment_rejects_invalid_output(text, message):
+    with pytest.raises(RiskResponseParseError, match=message):
+        parse_risk_assessment(text)
@@ -0,0 +1,36 @@
+import json
+import logging
+import queue
+import sys
+
+from utils.structured_logging import JsonFormatter, TracebackQueueHandler
+
+
+def record_with_exception():
+    try:
+        raise ValueError("search index missing")
+    except ValueError:
+        logger = logging.getLogger("tests.structured_logging")
+        return logger.makeRecord(
+            logger.name, logging.ERROR, __file__, 1, "Stage %s failed", ("search",),
+            exc_info=sys.exc_info()
+        )
+
+
+def test_json_formatter_serializes_the_traceback():
+    entry = json.loads(JsonFormatter().format(record_with_exception()))
+
+    assert entry["message"] == "Stage search failed"
+    assert "ValueError: search index missing" in entry["exc_info"]
+
+
+def test_queued_records_keep_the_traceback_out_of_the_message():
+    log_queue = queue.SimpleQueue()
+    TracebackQueueHandler(log_queue).handle(record_with_exception())
+
+    queued = log_queue.get_nowait()
+    entry = json.loads(JsonFormatter().format(queued))
+
+    assert queued.exc_info is None
+    assert entry["message"] == "Stage search failed"
+    assert "ValueError: search index missing" in entry["exc_info"]
@@ -1,3 +1,14 @@
 from utils.excel_validator import ExcelValidator
+from utils.stream_parser import IncrementalRiskParser, RiskResponseParseError, parse_risk_assessment
+from utils.practice_areas import normalize_practice_area, practice_area_keys
+from utils.bloom_filter import BloomFilter
 
-__all__ = ['ExcelValidator']
+__all__ = [
+    'ExcelValidator',
+    'IncrementalRiskParser',
+    'RiskResponseParseError',
+    'parse_risk_assessment',
+    'normalize_practice_area',
+    'practice_area_keys',
+    'BloomFilter'
+]
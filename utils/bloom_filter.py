@@ -0,0 +1,48 @@
+from typing import Iterable, Iterator
+import hashlib
+import math
+
+# Fixed-size Bloom filter: membership tests never give false negatives and
+# give false positives at about error_rate once `capacity` items are added.
+# Used to reject duplicates without a database round trip; a positive answer
+# must still be confirmed against the source of truth.
+
+
+class BloomFilter:
+    """Bloom filter over strings using double hashing of one BLAKE2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        """Filter holding items, sized for at least twice as many"""
+        items = list(items)
+        bloom = cls(max(capacity, 2 * len(items)), error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
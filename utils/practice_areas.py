@@ -0,0 +1,34 @@
+from typing import Any, Dict, Iterable, List
+import re
+from config import settings
+
+# Attorney documents carry practice_area_keys next to practice_areas so that
+# filters can use a scalar ARRAY_CONTAINS lookup that ignores case,
+# punctuation and known synonyms ("compliance" and "Compliance", "IP" and
+# "Intellectual Property" resolve to the same key)
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+def _fold(area: str) -> str:
+    """Case-fold, spell out '&' and collapse punctuation and whitespace"""
+    folded = (area or "").casefold().replace("&", " and ")
+    return _NON_ALPHANUMERIC.sub(" ", folded).strip()
+
+
+_SYNONYMS = {_fold(variant): _fold(canonical) for variant, canonical in settings.PRACTICE_AREA_SYNONYMS.items()}
+
+
+def normalize_practice_area(area: str) -> str:
+    """Lookup key for a practice area name"""
+    key = _fold(area)
+    return _SYNONYMS.get(key, key)
+
+
+def practice_area_keys(practice_areas: Iterable[Dict[str, Any]]) -> List[str]:
+    """Distinct keys of a practice_areas array, in order"""
+    keys = []
+    for pa in practice_areas:
+        key = normalize_practice_area(pa.get('area', ''))
+        if key and key not in keys:
+            keys.append(key)
+    return keys
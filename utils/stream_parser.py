@@ -0,0 +1,109 @@
+from typing import List
+import json
+import re
+from pydantic import ValidationError
+from risk_analysis_model import LLMRiskAssessment
+
+class RiskResponseParseError(ValueError):
+    """The LLM output is not a valid risk assessment JSON object"""
+
+
+def parse_risk_assessment(text: str) -> LLMRiskAssessment:
+    """
+    Parse and validate the LLM risk assessment.
+
+    Tolerates markdown code fences and prose around the JSON object, which
+    models sometimes add when not constrained by a response format.
+
+    Raises:
+        RiskResponseParseError: with a message suitable for a repair prompt
+    """
+    start = (text or "").find("{")
+    if start < 0:
+        raise RiskResponseParseError("No JSON object found in the response")
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise RiskResponseParseError(f"Invalid JSON: {e.msg} at position {e.pos}")
+
+    if not isinstance(value, dict):
+        raise RiskResponseParseError("Top-level JSON value is not an object")
+
+    try:
+        return LLMRiskAssessment(**value)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(p) for p in error['loc']) or 'root'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise RiskResponseParseError(f"JSON does not match the schema: {problems}")
+
+
+class IncrementalRiskParser:
+    """
+    Extracts risk strings from a streamed LLM JSON response as soon as each
+    one is complete.
+
+    The model is asked for {"risks": ["...", ...], ...}; feed() receives the
+    raw text deltas and returns the risks whose closing quote has arrived,
+    without waiting for the rest of the document.
+    """
+
+    _RISKS_ARRAY = re.compile(r'"risks"\s*:\s*\[')
+
+    def __init__(self):
+        self.buffer = ""
+        self.risks: List[str] = []
+        self._decoder = json.JSONDecoder()
+        self._position = None  # Index just inside the risks array once found
+        self._finished = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a text delta and return the risks completed by it"""
+        self.buffer += chunk or ""
+        if self._finished:
+            return []
+
+        if self._position is None:
+            match = self._RISKS_ARRAY.search(self.buffer)
+            if not match:
+                return []
+            self._position = match.end()
+
+        completed = []
+        while True:
+            position = self._skip_separators(self._position)
+            if position >= len(self.buffer):
+                break
+
+            if self.buffer[position] == "]":
+                self._finished = True
+                break
+
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, position)
+            except json.JSONDecodeError:
+                break  # Element not complete yet
+
+            self._position = end
+            if isinstance(value, str):
+                completed.append(value)
+
+        self.risks.extend(completed)
+        return completed
+
+    @property
+    def text(self) -> str:
+        """Full text received so far"""
+        return self.buffer
+
+    def result(self) -> LLMRiskAssessment:
+        """Parse and validate the complete response once the stream ends"""
+        return parse_risk_assessment(self.buffer)
+
+    def _skip_separators(self, position: int) -> int:
+        """Skip whitespace and commas between array elements"""
+        while position < len(self.buffer) and self.buffer[position] in " \t\r\n,":
+            position += 1
+        return position
@@ -0,0 +1,127 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+import copy
+import json
+import logging
+import queue
+import random
+import uuid
+from config import settings
+
+# Loggers on the risk analysis hot path
+PIPELINE_LOGGERS = [
+    "services.risk_analysis_service",
+    "services.ai_search_service",
+    "services.prompt_packer",
+    "services.llm_response_cache",
+    "services.context_store",
+]
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_log_payloads: ContextVar[bool] = ContextVar("log_payloads", default=False)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with request id and optional payload"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        payload = getattr(record, "payload", None)
+        if payload is not None:
+            entry["payload"] = payload
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class TracebackQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps tracebacks out of the message text.
+
+    The stdlib prepare() folds the formatted traceback into the message;
+    here it is carried in exc_text for JsonFormatter instead. The exception
+    itself is dropped so queued records do not keep its frames alive.
+    """
+
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the id of the request being handled"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+def configure_structured_logging(logger_names: List[str] = None) -> Optional[QueueListener]:
+    """
+    Route the given loggers through a queue to a JSON sink.
+
+    Request handlers only enqueue records; formatting and I/O happen on the
+    listener thread. Returns the started listener (stop it on shutdown), or
+    None when structured logging is disabled.
+    """
+    if not settings.LOG_STRUCTURED_ENABLED:
+        return None
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = TracebackQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    sink = logging.FileHandler(settings.LOG_FILE) if settings.LOG_FILE else logging.StreamHandler()
+    sink.setFormatter(JsonFormatter())
+
+    for name in logger_names or PIPELINE_LOGGERS:
+        pipeline_logger = logging.getLogger(name)
+        pipeline_logger.handlers = [queue_handler]
+        pipeline_logger.setLevel(settings.LOG_LEVEL)
+        pipeline_logger.propagate = False
+
+    listener = QueueListener(log_queue, sink)
+    listener.start()
+    return listener
+
+
+def begin_request_logging(debug: bool = False) -> str:
+    """
+    Start the logging context of a request.
+
+    Full prompt/response payloads are logged when debug is set or for a
+    random LOG_PAYLOAD_SAMPLE_RATE fraction of requests.
+    """
+    request_id = uuid.uuid4().hex[:16]
+    _request_id.set(request_id)
+    _log_payloads.set(debug or random.random() < settings.LOG_PAYLOAD_SAMPLE_RATE)
+    return request_id
+
+
+def log_payload(target: logging.Logger, label: str, payload: str):
+    """Log a large payload, only for sampled or debug requests"""
+    if _log_payloads.get():
+        target.info(label, extra={"payload": payload})